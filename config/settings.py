@@ -31,12 +31,14 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'tracker.middleware.QueryInstrumentationMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'tracker.middleware.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -59,17 +61,61 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+# Соединения с PostgreSQL:
+# DB_POOL - пул psycopg3 (постоянные соединения Django тогда выключены),
+# иначе соединение живет DB_CONN_MAX_AGE секунд (локально - 0, на каждый
+# запрос новое) и проверяется перед повторным использованием.
+# Постоянные соединения - только для WSGI: под ASGI они не закрываются
+# надежно и утекают, там нужен DB_POOL=True (профиль prod в compose);
+# DB_PGBOUNCER - работа через pgbouncer в режиме transaction:
+# без серверных курсоров и подготовленных запросов.
+DB_POOL = os.getenv('DB_POOL') == 'True'
+DB_PGBOUNCER = os.getenv('DB_PGBOUNCER') == 'True'
+DB_OPTIONS = {}
+if DB_POOL:
+    DB_OPTIONS['pool'] = {
+        'min_size': int(os.getenv('DB_POOL_MIN_SIZE') or 2),
+        'max_size': int(os.getenv('DB_POOL_MAX_SIZE') or 10),
+        'timeout': float(os.getenv('DB_POOL_TIMEOUT') or 10),
+    }
+if DB_PGBOUNCER:
+    DB_OPTIONS['prepare_threshold'] = None
+
 DATABASES = {
     'default': {
-        "ENGINE": "django.db.backends.postgresql_psycopg2",
+        "ENGINE": "django.db.backends.postgresql",
         "NAME": os.getenv("POSTGRES_DB"),
         "USER": os.getenv("POSTGRES_USER"),
         "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
         "HOST": os.getenv("POSTGRES_HOST"),
         "PORT": os.getenv("POSTGRES_PORT"),
+        "CONN_MAX_AGE": 0 if DB_POOL else int(
+            os.getenv('DB_CONN_MAX_AGE') or (0 if ENVTYPE == 'local' else 60)
+        ),
+        "CONN_HEALTH_CHECKS": (
+            os.getenv('DB_CONN_HEALTH_CHECKS') or 'True'
+        ) == 'True',
+        "DISABLE_SERVER_SIDE_CURSORS": DB_PGBOUNCER,
+        "OPTIONS": DB_OPTIONS,
     }
 }
 
+# Реплика для чтения (DB_REPLICA_HOST): безопасные запросы трекера
+# и пользователей читают с нее; после записи клиент DB_REPLICA_STICKY_SECONDS
+# секунд читает с основной БД (tracker.middleware.ReplicaRoutingMiddleware).
+DB_REPLICA_HOST = os.getenv('DB_REPLICA_HOST')
+if DB_REPLICA_HOST:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        "HOST": DB_REPLICA_HOST,
+        "PORT": os.getenv('DB_REPLICA_PORT') or DATABASES['default']['PORT'],
+        "OPTIONS": dict(DB_OPTIONS),
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ['tracker.routers.ReplicaRouter']
+REPLICA_STICKY_COOKIE = 'db_primary'
+REPLICA_STICKY_SECONDS = int(os.getenv('DB_REPLICA_STICKY_SECONDS') or 5)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -104,9 +150,65 @@ AUTH_USER_MODEL = 'users.User'
 
 REST_FRAMEWORK = {
     'DATETIME_INPUT_FORMAT': "%d.%m.%Y %H:%M",
+    'DEFAULT_RENDERER_CLASSES': (
+        'tracker.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
     'DEFAULT_FILTER_BACKENDS': (
         'django_filters.rest_framework.DjangoFilterBackend',
     ),
 }
 
 DATE_INPUT_FORMATS = '%d.%m.%Y %H:%M'
+
+CACHES = {
+    'default': {
+        'BACKEND': (
+            os.getenv('CACHE_BACKEND')
+            or 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION') or '',
+    }
+}
+
+# Кэш ответов списков трекера: алиас кэша и время жизни (0 - выключен)
+TRACKER_CACHE_ALIAS = 'default'
+TRACKER_CACHE_TIMEOUT = int(os.getenv('TRACKER_CACHE_TIMEOUT') or 60)
+
+# Максимальный размер страницы курсорной пагинации (?pagination=cursor)
+CURSOR_PAGINATION_MAX_PAGE_SIZE = int(
+    os.getenv('CURSOR_PAGINATION_MAX_PAGE_SIZE') or 500
+)
+
+# Ограничения графа зависимостей задач: глубина цепочки и число узлов
+TASK_DEPENDENCY_MAX_DEPTH = int(os.getenv('TASK_DEPENDENCY_MAX_DEPTH') or 50)
+TASK_DEPENDENCY_MAX_NODES = int(os.getenv('TASK_DEPENDENCY_MAX_NODES') or 500)
+
+# Лента изменений changes/: задержка от текущего момента (секунды), чтобы
+# не пропустить строки еще не закоммиченных транзакций, размер страницы
+# и срок хранения записей об удалении (дни).
+CHANGES_SAFETY_LAG = int(os.getenv('CHANGES_SAFETY_LAG') or 2)
+CHANGES_MAX_LIMIT = int(os.getenv('CHANGES_MAX_LIMIT') or 1000)
+CHANGES_TOMBSTONE_RETENTION_DAYS = int(
+    os.getenv('CHANGES_TOMBSTONE_RETENTION_DAYS') or 30
+)
+
+# Метрики запросов (число запросов к БД, время SQL, Server-Timing)
+QUERY_INSTRUMENTATION = os.getenv('QUERY_INSTRUMENTATION') == 'True'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'tracker.performance': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
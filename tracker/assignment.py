@@ -0,0 +1,87 @@
+import heapq
+from tracker.models import Employee, Task
+from tracker.services import get_important_tasks, save_task_batch
+
+# Скидка к загрузке сотрудника, который ведет задачу, зависящую
+# от важной задачи (как правило "разница задач не более 2").
+OWNER_BONUS = 2
+
+
+def load_assignment_inputs():
+    """
+    Входные данные распределения - два запроса:
+    важные задачи без исполнителя (с владельцем зависящей задачи)
+    и текущая загрузка сотрудников.
+    """
+    tasks = list(
+        get_important_tasks().filter(
+            status=Task.STATUS_CREATED
+        ).values(
+            "id", "title", "deadline", "related_task__employee_id"
+        )
+    )
+    employees = {
+        employee["id"]: employee
+        for employee in Employee.objects.values(
+            "id", "name", "active_tasks"
+        )
+    }
+    return tasks, employees
+
+
+def solve_assignment(tasks, employees, owner_bonus=OWNER_BONUS):
+    """
+    Жадное распределение задач по сотрудникам.
+    Задачи берутся по срочности (дедлайн, id), каждая достается
+    сотруднику с наименьшей стоимостью: текущая загрузка (задачи
+    в работе плюс уже назначенные здесь) минус owner_bonus для владельца
+    зависящей задачи. Наименее загруженный сотрудник берется из кучи,
+    поэтому распределение занимает O((T + E) log E).
+    """
+    load = {pk: employee["active_tasks"] for pk, employee in employees.items()}
+    heap = [(value, pk) for pk, value in load.items()]
+    heapq.heapify(heap)
+    assignments = []
+    for task in sorted(tasks, key=lambda task: (task["deadline"], task["id"])):
+        if not heap:
+            break
+        # Записи кучи с устаревшей загрузкой пропускаются.
+        while heap[0][0] != load[heap[0][1]]:
+            heapq.heappop(heap)
+        cost, employee_id = heap[0]
+        reason = "least_loaded"
+        owner_id = task["related_task__employee_id"]
+        if owner_id in load and load[owner_id] - owner_bonus <= cost:
+            employee_id = owner_id
+            reason = "owner"
+        assignments.append({
+            "task_id": task["id"],
+            "title": task["title"],
+            "deadline": task["deadline"],
+            "employee_id": employee_id,
+            "employee_name": employees[employee_id]["name"],
+            "employee_load": load[employee_id],
+            "reason": reason,
+        })
+        load[employee_id] += 1
+        heapq.heappush(heap, (load[employee_id], employee_id))
+    return assignments
+
+
+def get_assignment_plan():
+    """Распределение важных задач без записи в БД."""
+    return solve_assignment(*load_assignment_inputs())
+
+
+def apply_assignment_plan(assignments):
+    """
+    Назначение сотрудников по плану пакетной записью
+    (save_task_batch: проверки, счетчики и кэш - как у task/bulk/).
+    Возвращает (задачи, ошибки по строкам).
+    """
+    if not assignments:
+        return [], []
+    return save_task_batch([
+        {"id": item["task_id"], "employee": item["employee_id"]}
+        for item in assignments
+    ])
@@ -0,0 +1,170 @@
+import asyncio
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.views import View
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.request import Request
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from tracker.conditional import (
+    aget_queryset_validators,
+    get_validator_headers,
+    set_validator_headers,
+)
+from tracker.models import Employee, Task
+from tracker.renderers import FastJSONRenderer
+from tracker.serializers import TaskSerializer
+from tracker.services import get_important_tasks
+from tracker.views import (
+    EmployeeTaskListAPIView,
+    ImportantTaskList,
+    TaskListAPIView,
+)
+
+
+async def afetch(queryset, chunk_size=2000):
+    """Загрузка queryset'а через aiterator (с prefetch_related)."""
+    return [obj async for obj in queryset.aiterator(chunk_size=chunk_size)]
+
+
+class AsyncAPIView(View):
+    """
+    Async-вариант read-эндпоинта для ASGI.
+    Данные читаются async ORM (acount, aaggregate, aiterator), независимые
+    запросы идут через asyncio.gather. Ответ рендерится FastJSONRenderer,
+    как у sync-версии, с ETag/Last-Modified и 304 по ETag (If-Modified-Since
+    для списков не учитывается, см. ConditionalGetMixin).
+    Кэш ответов не используется.
+    Фильтры берутся у sync-представления sync_view_class и применяются
+    в потоке: django-filter может читать БД при валидации параметров.
+    """
+
+    sync_view_class = None
+    renderer_class = FastJSONRenderer
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            request = Request(request)
+            queryset = await self.get_queryset(request)
+            last_modified, parts = await aget_queryset_validators(
+                self.get_validator_querysets(queryset)
+            )
+            etag, timestamp = get_validator_headers(
+                request, last_modified, parts
+            )
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = self.render(await self.get_data(request, queryset))
+            return set_validator_headers(response, etag, timestamp)
+        except APIException as exc:
+            return self.render(exc.detail, status=exc.status_code)
+
+    async def get_queryset(self, request):
+        view = self.sync_view_class(
+            request=request, args=(), kwargs={}, format_kwarg=None
+        )
+        return await sync_to_async(view.filter_queryset)(view.get_queryset())
+
+    def get_validator_querysets(self, queryset):
+        return [queryset]
+
+    async def get_data(self, request, queryset):
+        """
+        Весь queryset через сериализатор sync-представления. Списки
+        с пагинацией или несколькими запросами переопределяют метод.
+        """
+        serializer_class = self.sync_view_class.serializer_class
+        return serializer_class(
+            await afetch(queryset), many=True, context={"request": request}
+        ).data
+
+    def render(self, data, status=200):
+        renderer = self.renderer_class()
+        return HttpResponse(
+            renderer.render(data),
+            content_type=renderer.media_type,
+            status=status,
+        )
+
+
+class AsyncTaskListView(AsyncAPIView):
+    """
+    Async-вариант task/list/: те же фильтры, сортировка и постраничная
+    пагинация (без курсорного режима). Число задач и страница (values())
+    запрашиваются параллельно.
+    """
+
+    sync_view_class = TaskListAPIView
+
+    async def get_data(self, request, queryset):
+        paginator = self.sync_view_class.pagination_class()
+        page_size = paginator.get_page_size(request)
+        page_number = request.query_params.get(
+            paginator.page_query_param, "1"
+        )
+        invalid_page = NotFound(paginator.invalid_page_message.format(
+            page_number=page_number, message=""
+        ))
+        if not str(page_number).isdigit() or int(page_number) < 1:
+            raise invalid_page
+        page_number = int(page_number)
+        offset = (page_number - 1) * page_size
+        serializer = TaskSerializer(many=True, context={"request": request})
+        rows = queryset.values(*serializer.get_value_fields())
+        count, tasks = await asyncio.gather(
+            queryset.acount(),
+            afetch(rows[offset:offset + page_size]),
+        )
+        if page_number > 1 and offset >= count:
+            raise invalid_page
+        url = request.build_absolute_uri()
+        next_url = previous_url = None
+        if offset + page_size < count:
+            next_url = replace_query_param(
+                url, paginator.page_query_param, page_number + 1
+            )
+        if page_number == 2:
+            previous_url = remove_query_param(
+                url, paginator.page_query_param
+            )
+        elif page_number > 2:
+            previous_url = replace_query_param(
+                url, paginator.page_query_param, page_number - 1
+            )
+        return {
+            "count": count,
+            "next": next_url,
+            "previous": previous_url,
+            "results": serializer.to_representation(tasks),
+        }
+
+
+class AsyncEmployeeTaskListView(AsyncAPIView):
+    """Async-вариант employee/busy/."""
+
+    sync_view_class = EmployeeTaskListAPIView
+
+    def get_validator_querysets(self, queryset):
+        return [queryset, Task.objects.all()]
+
+
+class AsyncImportantTaskList(AsyncAPIView):
+    """
+    Async-вариант employee/available/ (и ?mode=compact):
+    важные задачи и кандидаты запрашиваются параллельно.
+    """
+
+    async def get_queryset(self, request):
+        return None
+
+    def get_validator_querysets(self, queryset):
+        return [Task.objects.all(), Employee.objects.all()]
+
+    async def get_data(self, request, queryset):
+        tasks, employees = await asyncio.gather(
+            afetch(get_important_tasks()),
+            afetch(ImportantTaskList.get_employees(request)),
+        )
+        if request.query_params.get("mode") == "compact":
+            return ImportantTaskList.get_compact_data(tasks, employees)
+        return ImportantTaskList.get_data(tasks, employees, request)
@@ -0,0 +1,403 @@
+import json
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.error import URLError
+from urllib.request import urlopen
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import ListSerializer
+from tracker.cache import bump_generation
+from tracker.dependencies import refresh_task_closure
+from tracker.models import Employee, Task
+from tracker.renderers import FastJSONRenderer
+from tracker.serializers import EmployeeShortSerializer, TaskSerializer
+from tracker.services import refresh_workload_counters
+
+DEPARTMENTS = (
+    "IT", "HR", "Бухгалтерия", "Планово-экономический отдел",
+    "Отдел продаж", "Юридический отдел", None,
+)
+POSITIONS = (
+    "Разработчик", "Аналитик", "Тестировщик", "Менеджер",
+    "Начальник отдела", "Специалист",
+)
+# Доли статусов и приоритетов синтетических задач.
+STATUS_WEIGHTS = {
+    Task.STATUS_CREATED: 30,
+    Task.STATUS_IN_PROGRESS: 40,
+    Task.STATUS_FINISHED: 20,
+    Task.STATUS_OVERDUE: 10,
+}
+PRIORITY_WEIGHTS = {"low": 50, "medium": 30, "high": 20}
+# Сколько последних задач может стать родительской для новой.
+CHAIN_WINDOW = 10000
+
+
+def generate_dataset(employees, tasks, seed=None, batch_size=5000,
+                     chain_ratio=0.3):
+    """
+    Синтетические сотрудники и задачи, вставка через bulk_create.
+    Доля chain_ratio задач ссылается на одну из недавних задач,
+    поэтому образуются цепочки related_task разной глубины.
+    Возвращает (число сотрудников, число задач).
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    Employee.objects.bulk_create(
+        (
+            Employee(
+                name=f"Сотрудник {number}",
+                position=rng.choice(POSITIONS),
+                department=rng.choice(DEPARTMENTS),
+            )
+            for number in range(employees)
+        ),
+        batch_size=batch_size,
+    )
+    employee_ids = list(Employee.objects.values_list("pk", flat=True))
+    statuses, status_weights = zip(*STATUS_WEIGHTS.items())
+    priorities, priority_weights = zip(*PRIORITY_WEIGHTS.items())
+    recent_ids = []
+    for start in range(0, tasks, batch_size):
+        batch = []
+        for number in range(start, min(start + batch_size, tasks)):
+            status = rng.choices(statuses, status_weights)[0]
+            if status == Task.STATUS_OVERDUE:
+                deadline = now - timedelta(hours=rng.randint(1, 60 * 24))
+            else:
+                deadline = now + timedelta(hours=rng.randint(1, 60 * 24))
+            has_employee = employee_ids and (
+                status != Task.STATUS_CREATED or rng.random() < 0.1
+            )
+            related_id = (
+                rng.choice(recent_ids)
+                if recent_ids and rng.random() < chain_ratio else None
+            )
+            task = Task(
+                title=f"Задача {number}",
+                description=f"Описание синтетической задачи {number}",
+                deadline=deadline,
+                status=status,
+                priority=rng.choices(priorities, priority_weights)[0],
+                employee_id=(
+                    rng.choice(employee_ids) if has_employee else None
+                ),
+                related_task_id=related_id,
+            )
+            task.apply_status_rules()
+            batch.append(task)
+        Task.objects.bulk_create(batch)
+        recent_ids = (
+            recent_ids + [task.pk for task in batch]
+        )[-CHAIN_WINDOW:]
+    refresh_workload_counters()
+    refresh_task_closure()
+    bump_generation("task", "employee")
+    return employees, tasks
+
+
+# Аргументы маршрутов для замера: параметры URL, обязательная строка
+# запроса, дополнительные варианты строки запроса и тела POST-запросов.
+BENCHMARK_URL_KWARGS = {
+    "task_export": {"export_format": "ndjson"},
+    "employee_export": {"export_format": "csv"},
+}
+BENCHMARK_QUERY = {"task_search": "?q=Задача"}
+BENCHMARK_VARIANTS = {
+    "task-list": ("?pagination=cursor&page_size=100",),
+    "employees_available_list": ("?mode=compact",),
+    "async_employees_available_list": ("?mode=compact",),
+}
+
+
+def get_benchmark_bodies():
+    """Тела POST-запросов: {имя маршрута: (имя замера, тело)}."""
+    deadline = (timezone.now() + timedelta(days=1)).strftime("%d.%m.%Y %H:%M")
+    task = {
+        "title": "Benchmark task",
+        "description": "Benchmark task",
+        "deadline": deadline,
+        "priority": "high",
+    }
+    return {
+        "task-list": ("task-create", task),
+        "task-bulk": ("task-bulk", [dict(task) for _ in range(10)]),
+    }
+
+
+def get_benchmark_routes():
+    """
+    Маршруты tracker/urls.py: (имя, метод, url, тело запроса).
+    Список строится по URLconf, поэтому новый маршрут попадает в замер
+    без правок. Маршруты с GET замеряются GET-запросом, маршруты
+    из get_benchmark_bodies - еще и POST. Детальные маршруты берут
+    первую задачу и первого сотрудника и пропускаются без данных.
+    """
+    from tracker.urls import urlpatterns
+
+    objects = {
+        "task": Task.objects.order_by("id").first(),
+        "employee": Employee.objects.order_by("id").first(),
+    }
+    bodies = get_benchmark_bodies()
+    routes, seen = [], set()
+    for pattern in urlpatterns:
+        name = pattern.name
+        if name in seen or name == "api-root":
+            continue
+        seen.add(name)
+        kwargs = dict(BENCHMARK_URL_KWARGS.get(name, {}))
+        if "pk" in pattern.pattern.regex.groupindex:
+            instance = objects[name.split("-")[0]]
+            if instance is None:
+                continue
+            kwargs["pk"] = instance.pk
+        url = reverse(f"tracker:{name}", kwargs=kwargs)
+        actions = getattr(pattern.callback, "actions", None)
+        if actions is None or "get" in actions:
+            url += BENCHMARK_QUERY.get(name, "")
+            routes.append((name, "get", url, None))
+            routes.extend(
+                (f"{name}{query}", "get", url + query, None)
+                for query in BENCHMARK_VARIANTS.get(name, ())
+            )
+        if name in bodies:
+            label, data = bodies[name]
+            routes.append((label, "post", url, data))
+    return routes
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    index = min(len(values) - 1, round(percent / 100 * (len(values) - 1)))
+    return values[index]
+
+
+def measure_route(client, method, url, data, repeat):
+    """Задержки (мс), число запросов к БД и размер ответа маршрута."""
+    latencies, queries, size = [], 0, 0
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            if method == "get":
+                response = client.get(url)
+            else:
+                response = client.post(
+                    url, data=json.dumps(data), content_type="application/json"
+                )
+            content = (
+                b"".join(response.streaming_content)
+                if response.streaming else response.content
+            )
+            latencies.append((time.perf_counter() - started) * 1000)
+        queries = max(queries, len(captured))
+        size = max(size, len(content))
+    return {
+        "p50": round(percentile(latencies, 50), 2),
+        "p95": round(percentile(latencies, 95), 2),
+        "p99": round(percentile(latencies, 99), 2),
+        "mean": round(statistics.fmean(latencies), 2),
+        "queries": queries,
+        "bytes": size,
+    }
+
+
+def run_benchmark(sizes, repeat=20, seed=0, use_cache=False):
+    """
+    Замер всех маршрутов на наборах данных sizes [(сотрудники, задачи)].
+    Каждый набор генерируется в транзакции, которая затем откатывается,
+    поэтому база остается в исходном состоянии.
+    """
+    results = {}
+    client = Client()
+    cache_settings = {} if use_cache else {"TRACKER_CACHE_TIMEOUT": 0}
+    with override_settings(**cache_settings):
+        for employees, tasks in sizes:
+            with transaction.atomic():
+                generate_dataset(employees, tasks, seed=seed)
+                results[f"{employees}x{tasks}"] = {
+                    name: measure_route(client, method, url, data, repeat)
+                    for name, method, url, data in get_benchmark_routes()
+                }
+                transaction.set_rollback(True)
+    return results
+
+
+# Пары sync/async маршрутов для замера под конкурентной нагрузкой.
+CONCURRENCY_ROUTES = (
+    ("tasks_list", "async_tasks_list"),
+    ("employees_task_busy", "async_employees_task_busy"),
+    ("employees_available_list", "async_employees_available_list"),
+)
+
+
+def fetch_url(url, timeout):
+    """Один GET: (длительность в мс, успех)."""
+    started = time.perf_counter()
+    try:
+        with urlopen(url, timeout=timeout) as response:
+            response.read()
+            ok = response.status == 200
+    except (URLError, OSError):
+        ok = False
+    return (time.perf_counter() - started) * 1000, ok
+
+
+def measure_concurrency(url, clients, requests, timeout=30):
+    """
+    Пропускная способность маршрута запущенного сервера:
+    requests GET-запросов от clients параллельных клиентов.
+    """
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        results = list(executor.map(
+            lambda _: fetch_url(url, timeout), range(requests)
+        ))
+    elapsed = time.perf_counter() - started
+    timings = [duration for duration, ok in results if ok]
+    return {
+        "clients": clients,
+        "requests": requests,
+        "errors": requests - len(timings),
+        "rps": round(len(timings) / elapsed, 1) if elapsed else 0,
+        "p50_ms": round(percentile(timings, 50), 2) if timings else None,
+        "p95_ms": round(percentile(timings, 95), 2) if timings else None,
+    }
+
+
+def run_concurrency_benchmark(base_url, clients, requests, timeout=30):
+    """
+    Сравнение sync и async вариантов маршрутов (CONCURRENCY_ROUTES)
+    при разном числе параллельных клиентов.
+    Сервер запускается отдельно (runserver, gunicorn, uvicorn).
+    """
+    base_url = base_url.rstrip("/")
+    results = {}
+    for sync_name, async_name in CONCURRENCY_ROUTES:
+        for name in (sync_name, async_name):
+            url = base_url + reverse(f"tracker:{name}")
+            results[name] = [
+                measure_concurrency(url, count, requests, timeout)
+                for count in clients
+            ]
+    return results
+
+
+def make_serialization_rows(rows, seed=0):
+    """
+    Страница синтетических задач и сотрудников в памяти, без БД:
+    {имя: (сериализатор, экземпляры, словари values())}.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    tasks = [
+        Task(
+            id=number,
+            title=f"Задача {number}",
+            description=f"Описание синтетической задачи {number}",
+            deadline=now + timedelta(hours=rng.randint(1, 60 * 24)),
+            priority=rng.choice(tuple(PRIORITY_WEIGHTS)),
+            status=rng.choice(tuple(STATUS_WEIGHTS)),
+            employee_id=rng.choice((None, rng.randint(1, 100))),
+            related_task_id=rng.choice((None, rng.randint(1, rows))),
+        )
+        for number in range(1, rows + 1)
+    ]
+    employees = [
+        Employee(
+            id=number,
+            name=f"Сотрудник {number}",
+            position=rng.choice(POSITIONS),
+            department=rng.choice(DEPARTMENTS),
+        )
+        for number in range(1, rows + 1)
+    ]
+    cases = {}
+    for name, serializer_class, instances in (
+        ("tasks", TaskSerializer, tasks),
+        ("employees", EmployeeShortSerializer, employees),
+    ):
+        columns = serializer_class(many=True).get_columns()
+        values = [
+            {key: getattr(obj, attribute) for _, key, attribute, _ in columns}
+            for obj in instances
+        ]
+        cases[name] = (serializer_class, instances, values)
+    return cases
+
+
+def measure_serialization(rows=10000, repeat=5, seed=0):
+    """
+    Микробенчмарк вывода страницы из rows строк: обычный путь DRF
+    (ListSerializer по экземплярам и JSONRenderer) против быстрого
+    (словари values(), FastListSerializer и FastJSONRenderer).
+    Медианы в мс и побайтное совпадение ответов.
+    """
+    results = {}
+    for name, (serializer_class, instances, values) in (
+        make_serialization_rows(rows, seed).items()
+    ):
+        timings = {"drf": [], "fast": []}
+        for _ in range(repeat):
+            started = time.perf_counter()
+            expected = JSONRenderer().render(ListSerializer(
+                instances, child=serializer_class()
+            ).data)
+            timings["drf"].append(time.perf_counter() - started)
+            started = time.perf_counter()
+            content = FastJSONRenderer().render(
+                serializer_class(values, many=True).data
+            )
+            timings["fast"].append(time.perf_counter() - started)
+        drf, fast = (
+            statistics.median(timings[key]) * 1000 for key in ("drf", "fast")
+        )
+        results[name] = {
+            "rows": rows,
+            "drf_ms": round(drf, 2),
+            "fast_ms": round(fast, 2),
+            "speedup": round(drf / fast, 2) if fast else None,
+            "identical": content == expected,
+        }
+    return results
+
+
+def compare_with_baseline(results, baseline, tolerance=0.2):
+    """
+    Регрессии относительно сохраненного замера: рост p95 больше чем на
+    tolerance или рост числа запросов к БД.
+    """
+    regressions = []
+    for size, routes in results.items():
+        for name, current in routes.items():
+            previous = baseline.get(size, {}).get(name)
+            if not previous:
+                continue
+            if current["queries"] > previous["queries"]:
+                regressions.append(
+                    f"{size} {name}: запросов {previous['queries']} -> "
+                    f"{current['queries']}"
+                )
+            if current["p95"] > previous["p95"] * (1 + tolerance):
+                regressions.append(
+                    f"{size} {name}: p95 {previous['p95']} -> "
+                    f"{current['p95']} мс"
+                )
+    return regressions
+
+
+def load_baseline(path):
+    with open(path, encoding="utf-8") as stream:
+        return json.load(stream)
+
+
+def save_baseline(path, results):
+    with open(path, "w", encoding="utf-8") as stream:
+        json.dump(results, stream, ensure_ascii=False, indent=2)
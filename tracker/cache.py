@@ -0,0 +1,135 @@
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.http import urlencode
+from rest_framework.response import Response
+from tracker.routers import REPLICA_DB_ALIAS, read_alias
+
+GENERATION_KEY = "tracker:generation:{}"
+STATS_KEY = "tracker:cache:{}"
+RESPONSE_KEY = "tracker:response:{}"
+
+
+def get_cache():
+    return caches[settings.TRACKER_CACHE_ALIAS]
+
+
+def get_generations(names):
+    """
+    Текущие поколения данных. Поколение начинается со случайного значения,
+    чтобы после вытеснения ключа не совпасть со старыми записями.
+    """
+    cache = get_cache()
+    keys = [GENERATION_KEY.format(name) for name in names]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            generations[key] = cache.get_or_set(
+                key, time.time_ns(), timeout=None
+            )
+    return [generations[key] for key in keys]
+
+
+def bump_generation(*names):
+    """
+    Сброс закэшированных ответов, зависящих от данных names.
+    Поколение увеличивается сразу и еще раз после коммита транзакции,
+    чтобы ответ, собранный до коммита, не остался в кэше.
+    """
+    def bump():
+        cache = get_cache()
+        for name in names:
+            key = GENERATION_KEY.format(name)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, time.time_ns(), timeout=None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def incr_counter(key, delta=1):
+    """
+    Счетчик в кэше: add для нового ключа, иначе атомарный incr.
+    Если ключ вытеснен между add и incr, счет начинается заново.
+    Возвращает новое значение.
+    """
+    cache = get_cache()
+    if cache.add(key, delta, timeout=None):
+        return delta
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        cache.set(key, delta, timeout=None)
+        return delta
+
+
+def record_cache_access(hit):
+    incr_counter(STATS_KEY.format("hits" if hit else "misses"))
+
+
+def get_cache_stats():
+    cache = get_cache()
+    stats = cache.get_many([STATS_KEY.format("hits"),
+                            STATS_KEY.format("misses")])
+    return {
+        "hits": stats.get(STATS_KEY.format("hits"), 0),
+        "misses": stats.get(STATS_KEY.format("misses"), 0),
+    }
+
+
+class CachedResponseMixin:
+    """
+    Кэширование ответа списка по параметрам запроса: метод list
+    или явный вызов cached_response() для APIView.
+    Ключ включает поколения данных cache_generations, которые
+    увеличиваются сигналами post_save/post_delete (tracker.signals).
+    Заголовок X-Cache показывает попадание (HIT) или промах (MISS).
+    Ответ, прочитанный с реплики, в кэш не пишется: реплика может
+    отставать от уже увеличенного поколения, и устаревшие данные
+    продержались бы весь TRACKER_CACHE_TIMEOUT.
+    """
+
+    cache_generations = ("task", "employee")
+
+    def get_cache_key(self, request):
+        params = urlencode(sorted(request.query_params.lists()), doseq=True)
+        raw = ":".join(map(str, (
+            self.__class__.__name__,
+            *get_generations(self.cache_generations),
+            request.get_host(),
+            request.path,
+            params,
+        )))
+        return RESPONSE_KEY.format(hashlib.md5(raw.encode()).hexdigest())
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, lambda: super(CachedResponseMixin, self).list(
+                request, *args, **kwargs
+            )
+        )
+
+    def cached_response(self, request, build_response):
+        """Ответ из кэша или build_response() с сохранением в кэш."""
+        timeout = settings.TRACKER_CACHE_TIMEOUT
+        if not timeout:
+            return build_response()
+        cache = get_cache()
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            record_cache_access(hit=True)
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+        record_cache_access(hit=False)
+        response = build_response()
+        if (response.status_code == 200
+                and read_alias.get() != REPLICA_DB_ALIAS):
+            cache.set(key, response.data, timeout)
+        response["X-Cache"] = "MISS"
+        return response
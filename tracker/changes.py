@@ -0,0 +1,98 @@
+import base64
+import json
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from tracker.models import Employee, Task, Tombstone
+from tracker.serializers import (
+    EmployeeShortSerializer,
+    TaskSerializer,
+    TombstoneSerializer,
+)
+
+# Потоки ленты: (модель, сериализатор, поле времени). Каждый поток
+# читается по индексу (поле времени, id) после своей позиции курсора.
+CHANGE_STREAMS = {
+    "tasks": (Task, TaskSerializer, "updated_at"),
+    "employees": (Employee, EmployeeShortSerializer, "updated_at"),
+    "deleted": (Tombstone, TombstoneSerializer, "deleted_at"),
+}
+INVALID_CURSOR_MESSAGE = "Неверный курсор."
+
+
+class CursorExpired(Exception):
+    """Записи об удалении после позиции курсора уже удалены."""
+
+
+def encode_cursor(positions):
+    """{поток: (время, id)} -> строка курсора."""
+    data = {
+        stream: [value.isoformat(), pk]
+        for stream, (value, pk) in positions.items()
+    }
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+
+
+def decode_cursor(encoded):
+    """Строка курсора -> {поток: (время, id)}; пустой курсор - с начала."""
+    if not encoded:
+        return {}
+    try:
+        data = json.loads(base64.urlsafe_b64decode(encoded))
+        positions = {}
+        for stream, (value, pk) in data.items():
+            value = parse_datetime(value)
+            if stream not in CHANGE_STREAMS or value is None:
+                raise ValueError(stream)
+            positions[stream] = (value, int(pk))
+        return positions
+    except (TypeError, ValueError, AttributeError):
+        raise NotFound(INVALID_CURSOR_MESSAGE)
+
+
+def get_changes(positions, limit):
+    """
+    Изменения после позиций курсора: до limit строк каждого потока
+    в порядке (время, id), не новее текущего момента минус
+    CHANGES_SAFETY_LAG. Возвращает (данные потоков, новые позиции,
+    остались ли еще строки).
+    Поток, прочитанный до конца, сдвигается к верхней границе окна,
+    поэтому позиция не отстает при отсутствии изменений.
+    """
+    now = timezone.now()
+    retention = timedelta(days=settings.CHANGES_TOMBSTONE_RETENTION_DAYS)
+    deleted = positions.get("deleted")
+    if deleted is not None and deleted[0] < now - retention:
+        raise CursorExpired
+    upper = now - timedelta(seconds=settings.CHANGES_SAFETY_LAG)
+    data, next_positions, has_more = {}, {}, False
+    for stream, (model, serializer_class, field) in CHANGE_STREAMS.items():
+        serializer = serializer_class(many=True)
+        fields = serializer.get_value_fields()
+        queryset = model.objects.filter(**{f"{field}__lte": upper})
+        position = positions.get(stream)
+        if position is not None:
+            value, pk = position
+            queryset = queryset.filter(
+                Q(**{f"{field}__gt": value})
+                | Q(**{field: value, "id__gt": pk})
+            )
+        rows = list(queryset.order_by(field, "id").values(
+            *fields, *(name for name in (field, "id") if name not in fields)
+        )[:limit + 1])
+        if len(rows) > limit:
+            rows = rows[:limit]
+            has_more = True
+            position = (rows[-1][field], rows[-1]["id"])
+        elif rows and rows[-1][field] == upper:
+            position = (upper, rows[-1]["id"])
+        else:
+            position = (upper, 0)
+        if stream in positions and positions[stream] > position:
+            position = positions[stream]
+        next_positions[stream] = position
+        data[stream] = serializer.to_representation(rows)
+    return data, next_positions, has_more
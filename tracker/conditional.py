@@ -0,0 +1,115 @@
+import asyncio
+import hashlib
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+
+VALIDATOR_AGGREGATES = {
+    "last_modified": Max("updated_at"),
+    "count": Count("pk"),
+}
+
+
+def get_queryset_validators(querysets):
+    """
+    Валидаторы по Max(updated_at) и числу строк каждого queryset'а.
+    Считаются агрегатом без загрузки и сериализации строк.
+    Число строк меняется при удалении, поэтому удаление тоже меняет ETag.
+    """
+    return combine_validators(
+        queryset.order_by().aggregate(**VALIDATOR_AGGREGATES)
+        for queryset in querysets
+    )
+
+
+async def aget_queryset_validators(querysets):
+    """То же для async-представлений: агрегаты считаются параллельно."""
+    return combine_validators(await asyncio.gather(*(
+        queryset.order_by().aaggregate(**VALIDATOR_AGGREGATES)
+        for queryset in querysets
+    )))
+
+
+def combine_validators(states):
+    """(последнее изменение, части ETag) по агрегатам queryset'ов."""
+    last_modified, parts = None, []
+    for state in states:
+        parts.append(f"{state['count']}:{state['last_modified']}")
+        if state["last_modified"] and (
+                last_modified is None
+                or state["last_modified"] > last_modified):
+            last_modified = state["last_modified"]
+    return last_modified, parts
+
+
+def get_validator_headers(request, last_modified, parts):
+    """ETag и Last-Modified (timestamp) ответа."""
+    raw = ":".join(map(str, (
+        request.get_full_path(),
+        getattr(request, "accepted_media_type", ""),
+        *parts,
+    )))
+    etag = quote_etag(hashlib.md5(raw.encode()).hexdigest())
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return etag, timestamp
+
+
+def set_validator_headers(response, etag, timestamp):
+    response["ETag"] = etag
+    if timestamp is not None:
+        response["Last-Modified"] = http_date(timestamp)
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    Поддержка If-None-Match для list и retrieve, If-Modified-Since -
+    только для retrieve. Для неизмененных данных отдается 304 Not Modified
+    без сериализации.
+    Last-Modified списка - Max(updated_at) по отфильтрованным строкам
+    с точностью до секунды: он не меняется, когда строка выпадает
+    из фильтра или две правки попадают в одну секунду. Поэтому список
+    отдает Last-Modified только вместе с ETag и сравнивается по ETag.
+    """
+
+    def get_validator_querysets(self):
+        """Данные, от которых зависит ответ списка."""
+        return [self.filter_queryset(self.get_queryset())]
+
+    def list(self, request, *args, **kwargs):
+        last_modified, parts = get_queryset_validators(
+            self.get_validator_querysets()
+        )
+        return self.conditional_response(
+            request, last_modified, parts,
+            lambda: super(ConditionalGetMixin, self).list(
+                request, *args, **kwargs
+            )
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        return self.conditional_response(
+            request, instance.updated_at, [instance.pk, instance.updated_at],
+            lambda: Response(self.get_serializer(instance).data),
+            modified_since=True,
+        )
+
+    def conditional_response(self, request, last_modified, parts,
+                             build_response, modified_since=False):
+        """
+        304 по валидаторам или build_response() с ETag/Last-Modified.
+        If-Modified-Since учитывается только при modified_since.
+        """
+        etag, timestamp = get_validator_headers(request, last_modified, parts)
+        response = get_conditional_response(
+            request, etag=etag,
+            last_modified=timestamp if modified_since else None,
+        )
+        if response is None:
+            response = build_response()
+            if response.status_code != 200:
+                return response
+        return set_validator_headers(response, etag, timestamp)
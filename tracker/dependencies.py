@@ -0,0 +1,257 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from tracker.models import Task, TaskClosure
+
+# Связь задачи: task.related_task - задача, которая зависит от task.
+# Вверх по related_task идут зависимые задачи (dependents),
+# вниз - задачи, от которых зависит текущая (dependencies).
+TASK_TABLE = connection.ops.quote_name(Task._meta.db_table)
+CLOSURE_TABLE = connection.ops.quote_name(TaskClosure._meta.db_table)
+
+# Число узлов ограничено внутри рекурсии: первый уровень и дети каждого
+# узла берутся не больше %s (ORDER BY id LIMIT), каждая ветка графа
+# отдает не больше %s строк. Общей сортировки перед LIMIT нет, поэтому
+# рекурсия (обход в ширину) останавливается после нужного числа строк,
+# а не разворачивает все дерево до max_depth.
+GRAPH_SQL = f"""
+WITH RECURSIVE
+    dependents (id, depth) AS (
+        SELECT related_task_id, 1 FROM {TASK_TABLE}
+        WHERE id = %s AND related_task_id IS NOT NULL
+        UNION ALL
+        SELECT t.related_task_id, d.depth + 1
+        FROM {TASK_TABLE} t JOIN dependents d ON t.id = d.id
+        WHERE t.related_task_id IS NOT NULL AND d.depth < %s
+    ),
+    dependencies (id, depth) AS (
+        SELECT * FROM (
+            SELECT id, 1 FROM {TASK_TABLE} WHERE related_task_id = %s
+            ORDER BY id LIMIT %s
+        ) first_level
+        UNION ALL
+        SELECT t.id, d.depth + 1
+        FROM {TASK_TABLE} t JOIN dependencies d ON t.related_task_id = d.id
+        WHERE d.depth < %s AND t.id IN (
+            SELECT c.id FROM {TASK_TABLE} c WHERE c.related_task_id = d.id
+            ORDER BY c.id LIMIT %s
+        )
+    ),
+    nodes (id, depth, direction) AS (
+        SELECT id, 0, 'task' FROM {TASK_TABLE} WHERE id = %s
+        UNION ALL
+        SELECT * FROM (
+            SELECT id, depth, 'dependent' FROM dependents LIMIT %s
+        ) dependents_page
+        UNION ALL
+        SELECT * FROM (
+            SELECT id, depth, 'dependency' FROM dependencies LIMIT %s
+        ) dependencies_page
+    )
+SELECT t.*, n.depth, n.direction
+FROM nodes n JOIN {TASK_TABLE} t ON t.id = n.id
+"""
+
+BLOCKED_SQL = f"""
+WITH RECURSIVE blockers (root_id, id, status, depth) AS (
+    SELECT c.related_task_id, c.id, c.status, 1
+    FROM {TASK_TABLE} c JOIN {TASK_TABLE} r ON r.id = c.related_task_id
+    WHERE r.status <> %s
+    UNION ALL
+    SELECT b.root_id, t.id, t.status, b.depth + 1
+    FROM {TASK_TABLE} t JOIN blockers b ON t.related_task_id = b.id
+    WHERE b.depth < %s
+)
+SELECT t.*, COUNT(b.id) AS blockers_count, MAX(b.depth) AS chain_depth
+FROM {TASK_TABLE} t JOIN blockers b ON b.root_id = t.id
+WHERE b.status <> %s
+GROUP BY t.id
+ORDER BY chain_depth DESC, t.deadline, t.id
+LIMIT %s
+"""
+
+ANCESTORS_SQL = f"""
+WITH RECURSIVE chain (id, related_task_id, depth) AS (
+    SELECT id, related_task_id, 1 FROM {TASK_TABLE} WHERE id IN ({{}})
+    UNION ALL
+    SELECT t.id, t.related_task_id, c.depth + 1
+    FROM {TASK_TABLE} t JOIN chain c ON t.id = c.related_task_id
+    WHERE c.depth < %s
+)
+SELECT DISTINCT id, related_task_id FROM chain
+"""
+
+# Строки замыкания для задач: подъем по related_task от каждой задачи.
+# {} - условие на id задач (пусто при полном пересчете).
+CLOSURE_SQL = f"""
+WITH RECURSIVE chain (descendant_id, ancestor_id, depth) AS (
+    SELECT id, related_task_id, 1 FROM {TASK_TABLE}
+    WHERE related_task_id IS NOT NULL {{}}
+    UNION ALL
+    SELECT c.descendant_id, t.related_task_id, c.depth + 1
+    FROM {TASK_TABLE} t JOIN chain c ON t.id = c.ancestor_id
+    WHERE t.related_task_id IS NOT NULL AND c.depth < %s
+)
+INSERT INTO {CLOSURE_TABLE} (ancestor_id, descendant_id, depth)
+SELECT ancestor_id, descendant_id, MIN(depth) FROM chain
+WHERE ancestor_id <> descendant_id
+GROUP BY ancestor_id, descendant_id
+"""
+
+
+def get_limit(value, maximum):
+    """Ограничение из параметра запроса, не больше maximum."""
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return maximum
+    return min(max(value, 1), maximum)
+
+
+def get_ancestor_edges(task_ids, max_depth=None):
+    """
+    Связи {задача: related_task} по цепочкам вверх от task_ids
+    не глубже max_depth - один рекурсивный запрос.
+    """
+    task_ids = list(task_ids)
+    if not task_ids:
+        return {}
+    max_depth = max_depth or settings.TASK_DEPENDENCY_MAX_DEPTH
+    sql = ANCESTORS_SQL.format(", ".join(["%s"] * len(task_ids)))
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*task_ids, max_depth])
+        return dict(cursor.fetchall())
+
+
+def check_dependency_chain(edges, task_id, related_id, max_depth=None):
+    """
+    Проверка новой связи task_id -> related_id по связям edges:
+    цепочка не должна возвращаться к task_id и быть длиннее max_depth.
+    Возвращает текст ошибки или None.
+    """
+    max_depth = max_depth or settings.TASK_DEPENDENCY_MAX_DEPTH
+    node, depth = related_id, 1
+    while node is not None:
+        if task_id is not None and node == task_id:
+            return "Связь образует цикл зависимостей задач."
+        if depth > max_depth:
+            return f"Цепочка зависимостей длиннее {max_depth} задач."
+        node = edges.get(node)
+        depth += 1
+    return None
+
+
+def get_dependency_graph(task_id, max_depth=None, max_nodes=None):
+    """
+    Граф зависимостей задачи одним рекурсивным запросом:
+    зависимые задачи (вверх по related_task) и задачи, от которых
+    зависит текущая (вниз), не глубже max_depth и не больше max_nodes.
+    Запрос выбирает не больше max_nodes + 1 строк на ветку (см. GRAPH_SQL),
+    узлы упорядочиваются по глубине уже здесь.
+    Возвращает None, если задачи нет.
+    """
+    max_depth = max_depth or settings.TASK_DEPENDENCY_MAX_DEPTH
+    max_nodes = max_nodes or settings.TASK_DEPENDENCY_MAX_NODES
+    cap = max_nodes + 1
+    nodes = sorted(
+        Task.objects.raw(GRAPH_SQL, [
+            task_id, max_depth,
+            task_id, cap, max_depth, cap,
+            task_id, cap, cap,
+        ]),
+        key=lambda node: (node.depth, node.direction, node.id),
+    )
+    task = next((node for node in nodes if node.direction == "task"), None)
+    if task is None:
+        return None
+    truncated = len(nodes) > max_nodes
+    nodes = nodes[:max_nodes]
+    dependencies = [node for node in nodes if node.direction == "dependency"]
+    critical_path = get_critical_path(task, dependencies)
+    return {
+        "task": task,
+        "dependents": [
+            node for node in nodes if node.direction == "dependent"
+        ],
+        "dependencies": dependencies,
+        "critical_path": critical_path,
+        "blocked": bool(critical_path),
+        "truncated": truncated,
+    }
+
+
+def get_critical_path(task, dependencies):
+    """
+    Самая длинная цепочка незавершенных задач, от которых зависит task.
+    Считается по уже выбранным узлам графа, без запросов к БД.
+    """
+    children = {}
+    for node in dependencies:
+        if node.status != Task.STATUS_FINISHED:
+            children.setdefault(node.related_task_id, []).append(node)
+    chains = {}
+    for node in sorted(dependencies, key=lambda node: -node.depth):
+        if node.status == Task.STATUS_FINISHED:
+            continue
+        chains[node.id] = [node] + max(
+            (chains.get(child.id, []) for child in children.get(node.id, [])),
+            key=len,
+            default=[],
+        )
+    return max(
+        (chains.get(child.id, []) for child in children.get(task.id, [])),
+        key=len,
+        default=[],
+    )
+
+
+def get_blocked_tasks(limit=None, max_depth=None):
+    """
+    Незавершенные задачи, которые ждут незавершенные задачи,
+    с числом блокирующих задач и длиной критического пути.
+    Один рекурсивный запрос, сначала самые длинные цепочки.
+    """
+    limit = limit or settings.TASK_DEPENDENCY_MAX_NODES
+    max_depth = max_depth or settings.TASK_DEPENDENCY_MAX_DEPTH
+    return Task.objects.raw(
+        BLOCKED_SQL,
+        [
+            Task.STATUS_FINISHED,
+            max_depth,
+            Task.STATUS_FINISHED,
+            limit,
+        ],
+    )
+
+
+def refresh_task_closure(task_ids=None, include_descendants=True,
+                         using=None):
+    """
+    Пересчет таблицы замыкания для задач task_ids: их строки удаляются
+    и строятся заново одним рекурсивным запросом.
+    С include_descendants пересчитываются и задачи, от которых зависят
+    task_ids: при смене related_task их цепочки вверх тоже меняются.
+    Без task_ids таблица пересобирается целиком.
+    Возвращает число записанных строк.
+    """
+    using = using or DEFAULT_DB_ALIAS
+    closure = TaskClosure.objects.using(using)
+    params = []
+    condition = ""
+    if task_ids is not None:
+        task_ids = {pk for pk in task_ids if pk is not None}
+        if include_descendants and task_ids:
+            task_ids.update(closure.filter(
+                ancestor_id__in=task_ids
+            ).values_list("descendant_id", flat=True))
+        if not task_ids:
+            return 0
+        closure = closure.filter(descendant_id__in=task_ids)
+        params = list(task_ids)
+        condition = "AND id IN ({})".format(", ".join(["%s"] * len(params)))
+    closure.delete()
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            CLOSURE_SQL.format(condition),
+            [*params, settings.TASK_DEPENDENCY_MAX_DEPTH],
+        )
+        return cursor.rowcount
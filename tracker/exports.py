@@ -0,0 +1,84 @@
+import csv
+import json
+from datetime import datetime
+from django.utils import timezone
+
+# Колонка выгрузки -> поле для values_list (связи через join).
+TASK_EXPORT_COLUMNS = {
+    "id": "id",
+    "title": "title",
+    "description": "description",
+    "deadline": "deadline",
+    "priority": "priority",
+    "status": "status",
+    "employee": "employee_id",
+    "employee_name": "employee__name",
+    "related_task": "related_task_id",
+    "related_task_title": "related_task__title",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+}
+
+EMPLOYEE_EXPORT_COLUMNS = {
+    "id": "id",
+    "name": "name",
+    "position": "position",
+    "department": "department",
+    "total_tasks": "total_tasks",
+    "active_tasks": "active_tasks",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+}
+
+
+def iter_export_rows(queryset, columns, chunk_size=2000):
+    """
+    Строки выгрузки словарями. Читаются серверным курсором пачками
+    по chunk_size, поэтому память не растет с размером таблицы.
+    Даты выводятся в ISO 8601 в текущем часовом поясе.
+    """
+    names = list(columns)
+    rows = queryset.values_list(*columns.values()).iterator(
+        chunk_size=chunk_size
+    )
+    for values in rows:
+        yield {
+            name: (
+                timezone.localtime(value).isoformat()
+                if isinstance(value, datetime) else value
+            )
+            for name, value in zip(names, values)
+        }
+
+
+def iter_ndjson(rows, columns):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+class Echo:
+    """Буфер для csv.writer, который сразу возвращает записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows, columns):
+    writer = csv.DictWriter(Echo(), fieldnames=list(columns))
+    yield writer.writerow(dict(zip(columns, columns)))
+    for row in rows:
+        yield writer.writerow(row)
+
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson; charset=utf-8", iter_ndjson),
+    "csv": ("text/csv; charset=utf-8", iter_csv),
+}
+
+
+def iter_export(queryset, columns, export_format, chunk_size=2000):
+    """Выгрузка queryset'а в формате export_format по частям."""
+    _, writer = EXPORT_FORMATS[export_format]
+    return writer(
+        iter_export_rows(queryset, columns, chunk_size), columns
+    )
@@ -0,0 +1,134 @@
+from datetime import timedelta
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import validate_integer
+from django.utils import timezone
+from django_filters import rest_framework as filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from tracker.models import Task
+
+# Дата и время в фильтрах: формат API ("31.12.2024 18:00") или ISO 8601.
+DATETIME_INPUT_FORMATS = ["%d.%m.%Y %H:%M"]
+PRIORITY_CHOICES = Task._meta.get_field("priority").choices
+
+
+class ChoiceInFilter(filters.BaseInFilter, filters.ChoiceFilter):
+    """Несколько значений через запятую: ?status__in=created,overdue."""
+
+
+class PresetFilterBackend(filters.DjangoFilterBackend):
+    """
+    DjangoFilterBackend с фильтрами представления preset_filters
+    (задаются в as_view), которые нельзя переопределить в запросе.
+    """
+
+    def get_filterset_kwargs(self, request, queryset, view):
+        kwargs = super().get_filterset_kwargs(request, queryset, view)
+        preset = getattr(view, "preset_filters", None)
+        if preset:
+            kwargs["data"] = kwargs["data"].copy()
+            for name, value in preset.items():
+                kwargs["data"][name] = value
+        return kwargs
+
+
+class TaskFilterSet(filters.FilterSet):
+    """
+    Фильтры списков задач. Каждый фильтр идет по индексу:
+    дедлайн - task_deadline_id_idx, статус - task_status_deadline_idx,
+    приоритет - task_priority_deadline_idx, без сотрудника -
+    task_unassigned_idx, отдел - индекс внешнего ключа employee и
+    employee_dept_position_idx, создание и изменение -
+    task_created_idx и task_updated_idx.
+    """
+
+    deadline_after = filters.DateTimeFilter(
+        field_name="deadline", lookup_expr="gte",
+        input_formats=DATETIME_INPUT_FORMATS,
+    )
+    deadline_before = filters.DateTimeFilter(
+        field_name="deadline", lookup_expr="lt",
+        input_formats=DATETIME_INPUT_FORMATS,
+    )
+    due_in_days = filters.NumberFilter(
+        method="filter_due_in_days", min_value=0,
+        label="Дедлайн в ближайшие N дней",
+    )
+    status__in = ChoiceInFilter(
+        field_name="status", choices=Task.STATUS_CHOICES
+    )
+    priority = filters.ChoiceFilter(choices=PRIORITY_CHOICES)
+    priority__in = ChoiceInFilter(
+        field_name="priority", choices=PRIORITY_CHOICES
+    )
+    employee__isnull = filters.BooleanFilter(
+        field_name="employee", lookup_expr="isnull"
+    )
+    department = filters.CharFilter(field_name="employee__department")
+    created_after = filters.DateTimeFilter(
+        field_name="created_at", lookup_expr="gte",
+        input_formats=DATETIME_INPUT_FORMATS,
+    )
+    created_before = filters.DateTimeFilter(
+        field_name="created_at", lookup_expr="lt",
+        input_formats=DATETIME_INPUT_FORMATS,
+    )
+    updated_after = filters.DateTimeFilter(
+        field_name="updated_at", lookup_expr="gte",
+        input_formats=DATETIME_INPUT_FORMATS,
+    )
+    updated_before = filters.DateTimeFilter(
+        field_name="updated_at", lookup_expr="lt",
+        input_formats=DATETIME_INPUT_FORMATS,
+    )
+
+    class Meta:
+        model = Task
+        fields = ("status", "deadline", "employee")
+
+    def filter_due_in_days(self, queryset, name, value):
+        """Дедлайн от текущего момента до N дней вперед."""
+        now = timezone.now()
+        return queryset.filter(
+            deadline__gte=now,
+            deadline__lt=now + timedelta(days=int(value)),
+        )
+
+
+class TaskDependencyFilterBackend(BaseFilterBackend):
+    """
+    Фильтры по таблице зависимостей (TaskClosure), один индексный JOIN:
+    ?depends_on=<id> - задачи, которые зависят от задачи <id>
+    (напрямую или через цепочку related_task);
+    ?blocked_by=<id> - незавершенные задачи, которые ждут
+    незавершенную задачу <id>.
+    """
+
+    def get_task_id(self, request, param):
+        value = request.query_params.get(param)
+        if value in (None, ""):
+            return None
+        try:
+            validate_integer(value)
+        except DjangoValidationError:
+            raise ValidationError({param: ["Ожидается id задачи."]})
+        return int(value)
+
+    def filter_queryset(self, request, queryset, view):
+        depends_on = self.get_task_id(request, "depends_on")
+        if depends_on is not None:
+            queryset = queryset.filter(
+                descendant_links__descendant_id=depends_on
+            )
+        blocked_by = self.get_task_id(request, "blocked_by")
+        if blocked_by is not None:
+            unfinished = [
+                value for value, _ in Task.STATUS_CHOICES
+                if value != Task.STATUS_FINISHED
+            ]
+            queryset = queryset.filter(
+                descendant_links__descendant_id=blocked_by,
+                descendant_links__descendant__status__in=unfinished,
+                status__in=unfinished,
+            )
+        return queryset
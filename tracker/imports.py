@@ -0,0 +1,251 @@
+import io
+import json
+import time
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from tracker.cache import bump_generation
+from tracker.dependencies import refresh_task_closure
+from tracker.models import Employee, Task
+from tracker.services import mark_overdue_tasks, refresh_workload_counters
+
+READ_SIZE = 64 * 1024
+
+# Поля моделей в порядке колонок COPY / bulk_create.
+TASK_FIELDS = (
+    "id", "created_at", "updated_at", "title", "related_task_id",
+    "description", "employee_id", "deadline", "status", "priority",
+)
+EMPLOYEE_FIELDS = (
+    "id", "created_at", "updated_at", "name", "position", "department",
+)
+
+
+def iter_json_objects(stream):
+    """
+    Потоковый разбор JSON-массива объектов или NDJSON.
+    Читает файл кусками и разбирает объекты по одному,
+    поэтому в памяти держится только текущий кусок.
+    """
+    decoder = json.JSONDecoder()
+    buffer, position, eof = "", 0, False
+    while True:
+        while position < len(buffer) and buffer[position] in " \t\r\n,[]":
+            position += 1
+        if position == len(buffer):
+            if eof:
+                return
+            buffer, position = stream.read(READ_SIZE), 0
+            eof = not buffer
+            continue
+        try:
+            obj, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            chunk = stream.read(READ_SIZE)
+            if not chunk:
+                raise
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        yield obj
+        position = end
+
+
+def parse_record(obj, default_model=None):
+    """
+    Запись фикстуры {"model", "pk", "fields"} или плоский объект с id.
+    Возвращает (метка модели, словарь полей с id).
+    """
+    if "fields" in obj:
+        return obj.get("model", default_model), {"id": obj.get("pk"),
+                                                 **obj["fields"]}
+    return default_model, dict(obj)
+
+
+def copy_quote(value):
+    """Значение для COPY ... WITH (FORMAT csv): NULL - пустое поле."""
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        value = value.isoformat()
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+class FixtureImporter:
+    """
+    Пакетный импорт задач и сотрудников из потока записей.
+    Внешние ключи проверяются одним запросом на пакет, правила статусов
+    применяются в Python, вставка идет через COPY (PostgreSQL)
+    или bulk_create. Связанные задачи, которых еще нет в базе,
+    проставляются после загрузки всех строк.
+    """
+
+    def __init__(self, batch_size=5000, use_copy=True, progress=None):
+        self.batch_size = batch_size
+        self.use_copy = use_copy and connection.vendor == "postgresql"
+        self.progress = progress or (lambda message: None)
+        self.buffers = {Employee: [], Task: []}
+        self.created = {Employee: 0, Task: 0}
+        self.skipped = 0
+        self.missing_employees = 0
+        self.deferred_related = []
+        self.employee_ids = set()
+        self.started = time.monotonic()
+
+    def add(self, label, fields):
+        model = {"tracker.task": Task, "tracker.employee": Employee}.get(
+            (label or "").lower()
+        )
+        if model is None:
+            self.skipped += 1
+            return
+        self.buffers[model].append(fields)
+        if len(self.buffers[model]) >= self.batch_size:
+            self.flush(model)
+
+    def flush(self, model):
+        if model is Task and self.buffers[Employee]:
+            # Сотрудники из того же потока должны попасть в базу раньше.
+            self.flush(Employee)
+        rows, self.buffers[model] = self.buffers[model], []
+        if not rows:
+            return
+        existing = set(model.objects.filter(
+            pk__in=[row["id"] for row in rows if row.get("id") is not None]
+        ).values_list("pk", flat=True))
+        rows = [row for row in rows if row.get("id") not in existing]
+        self.skipped += len(existing)
+        if model is Task:
+            objects = self.build_tasks(rows)
+            fields = TASK_FIELDS
+        else:
+            objects = [self.build_employee(row) for row in rows]
+            fields = EMPLOYEE_FIELDS
+        with transaction.atomic():
+            self.insert(model, fields, objects)
+        self.created[model] += len(objects)
+        self.report(model)
+
+    def build_tasks(self, rows):
+        employee_ids = {row.get("employee") for row in rows} - {None}
+        known_employees = set(Employee.objects.filter(
+            pk__in=employee_ids
+        ).values_list("pk", flat=True))
+        related_ids = {row.get("related_task") for row in rows} - {None}
+        known_tasks = set(Task.objects.filter(
+            pk__in=related_ids
+        ).values_list("pk", flat=True))
+        now = timezone.now()
+        tasks = []
+        for row in rows:
+            employee_id = row.get("employee")
+            if employee_id is not None and employee_id not in known_employees:
+                self.missing_employees += 1
+                employee_id = None
+            related_id = row.get("related_task")
+            if related_id is not None and related_id not in known_tasks:
+                if row.get("id") is not None:
+                    self.deferred_related.append((row["id"], related_id))
+                related_id = None
+            task = Task(
+                id=row.get("id"),
+                created_at=parse_datetime(row.get("created_at") or "") or now,
+                updated_at=now,
+                title=row["title"],
+                related_task_id=related_id,
+                description=row.get("description", ""),
+                employee_id=employee_id,
+                deadline=parse_datetime(row["deadline"]),
+                status=row.get("status") or Task.STATUS_CREATED,
+                priority=(row.get("priority") or "low").lower(),
+            )
+            task.apply_status_rules()
+            self.employee_ids.add(employee_id)
+            tasks.append(task)
+        return tasks
+
+    @staticmethod
+    def build_employee(row):
+        now = timezone.now()
+        return Employee(
+            id=row.get("id"),
+            created_at=parse_datetime(row.get("created_at") or "") or now,
+            updated_at=now,
+            name=row["name"],
+            position=row["position"],
+            department=row.get("department"),
+        )
+
+    def insert(self, model, fields, objects):
+        if not self.use_copy or any(obj.id is None for obj in objects):
+            # bulk_create заполняет created_at/updated_at текущим временем
+            # (auto_now), исходный created_at сохраняет только COPY.
+            # updated_at в обоих случаях - момент импорта, иначе строки
+            # окажутся позади курсоров ленты changes/.
+            model.objects.bulk_create(objects)
+            return
+        buffer = io.StringIO()
+        for obj in objects:
+            buffer.write(",".join(
+                copy_quote(getattr(obj, field)) for field in fields
+            ) + "\n")
+        buffer.seek(0)
+        sql = (
+            f"COPY {model._meta.db_table} ({', '.join(fields)}) "
+            f"FROM STDIN WITH (FORMAT csv)"
+        )
+        with connection.cursor() as cursor:
+            raw_cursor = cursor.cursor
+            if hasattr(raw_cursor, "copy_expert"):
+                raw_cursor.copy_expert(sql, buffer)
+            else:
+                with raw_cursor.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+
+    def resolve_deferred_related(self):
+        """Связанные задачи, загруженные позже зависимых."""
+        pending, self.deferred_related = self.deferred_related, []
+        for start in range(0, len(pending), self.batch_size):
+            chunk = dict(pending[start:start + self.batch_size])
+            known = set(Task.objects.filter(
+                pk__in=set(chunk.values())
+            ).values_list("pk", flat=True))
+            now = timezone.now()
+            tasks = [
+                Task(id=task_id, related_task_id=related_id, updated_at=now)
+                for task_id, related_id in chunk.items()
+                if related_id in known
+            ]
+            Task.objects.bulk_update(tasks, ["related_task", "updated_at"])
+
+    def finish(self):
+        """
+        Завершение импорта: связи, последовательности id, счетчики,
+        таблица зависимостей (пересобирается целиком).
+        """
+        self.flush(Employee)
+        self.flush(Task)
+        self.resolve_deferred_related()
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sequence_reset_sql(
+                        no_style(), [Employee, Task]):
+                    cursor.execute(sql)
+        employee_ids = list(self.employee_ids - {None})
+        for start in range(0, len(employee_ids), self.batch_size):
+            refresh_workload_counters(
+                employee_ids[start:start + self.batch_size]
+            )
+        if self.created[Task]:
+            refresh_task_closure()
+        overdue = mark_overdue_tasks(chunk_size=self.batch_size)
+        bump_generation("task", "employee")
+        return overdue
+
+    def report(self, model):
+        elapsed = time.monotonic() - self.started
+        count = self.created[model]
+        self.progress(
+            f"{model._meta.verbose_name_plural}: {count} "
+            f"({count / elapsed if elapsed else 0:.0f} строк/с)"
+        )
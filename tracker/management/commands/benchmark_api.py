@@ -0,0 +1,79 @@
+import json
+from django.core.management import BaseCommand, CommandError
+from tracker.benchmarks import (
+    compare_with_baseline,
+    load_baseline,
+    run_benchmark,
+    save_baseline,
+)
+
+
+def parse_sizes(value):
+    """'100x1000,1000x10000' -> [(100, 1000), (1000, 10000)]."""
+    try:
+        return [
+            tuple(int(part) for part in size.split("x", 1))
+            for size in value.split(",")
+        ]
+    except ValueError:
+        raise CommandError(
+            f"Размеры {value} должны иметь вид СОТРУДНИКИxЗАДАЧИ,..."
+        )
+
+
+class Command(BaseCommand):
+    """
+    Замер задержек (p50/p95/p99), числа запросов к БД и размера ответа
+    для маршрутов трекера на синтетических данных разного размера.
+    Данные создаются в транзакции и откатываются после замера.
+    """
+
+    help = "Нагрузочный замер API трекера со сравнением с baseline."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=parse_sizes,
+            default=[(10, 100), (100, 1000)],
+            help="Наборы данных СОТРУДНИКИxЗАДАЧИ через запятую.",
+        )
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--with-cache",
+            action="store_true",
+            help="Не отключать кэш ответов.",
+        )
+        parser.add_argument("--baseline", help="Файл baseline для сравнения.")
+        parser.add_argument(
+            "--save-baseline",
+            help="Сохранить результаты как baseline в файл.",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Допустимый рост p95 относительно baseline.",
+        )
+
+    def handle(self, *args, **options):
+        results = run_benchmark(
+            options["sizes"],
+            repeat=options["repeat"],
+            seed=options["seed"],
+            use_cache=options["with_cache"],
+        )
+        self.stdout.write(json.dumps(results, ensure_ascii=False, indent=2))
+        if options["save_baseline"]:
+            save_baseline(options["save_baseline"], results)
+        if options["baseline"]:
+            regressions = compare_with_baseline(
+                results, load_baseline(options["baseline"]),
+                options["tolerance"]
+            )
+            if regressions:
+                raise CommandError(
+                    "Регрессии относительно baseline:\n"
+                    + "\n".join(regressions)
+                )
+            self.stdout.write(self.style.SUCCESS("Регрессий нет."))
@@ -0,0 +1,53 @@
+import json
+from django.core.management import BaseCommand, CommandError
+from tracker.benchmarks import run_concurrency_benchmark
+
+
+def parse_clients(value):
+    """'1,10,50' -> [1, 10, 50]."""
+    try:
+        return [int(part) for part in value.split(",")]
+    except ValueError:
+        raise CommandError(
+            f"Число клиентов {value} должно иметь вид 1,10,50."
+        )
+
+
+class Command(BaseCommand):
+    """
+    Пропускная способность sync и async вариантов тяжелых списков
+    (task/list/, employee/busy/, employee/available/) под конкурентной
+    нагрузкой. Замер идет по HTTP против запущенного сервера, например
+    docker compose --profile prod up (gunicorn + uvicorn).
+    """
+
+    help = "Сравнение sync/async эндпоинтов под конкурентной нагрузкой."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--base-url",
+            default="http://localhost:8000",
+            help="Адрес запущенного сервера.",
+        )
+        parser.add_argument(
+            "--clients",
+            type=parse_clients,
+            default=[1, 10, 50],
+            help="Число параллельных клиентов через запятую.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Число запросов на каждый замер.",
+        )
+        parser.add_argument("--timeout", type=float, default=30)
+
+    def handle(self, *args, **options):
+        results = run_concurrency_benchmark(
+            options["base_url"],
+            options["clients"],
+            options["requests"],
+            options["timeout"],
+        )
+        self.stdout.write(json.dumps(results, ensure_ascii=False, indent=2))
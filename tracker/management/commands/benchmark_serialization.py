@@ -0,0 +1,24 @@
+import json
+from django.core.management import BaseCommand
+from tracker.benchmarks import measure_serialization
+
+
+class Command(BaseCommand):
+    """
+    Микробенчмарк сериализации списков без БД: обычный путь DRF
+    против values()-строк, FastListSerializer и FastJSONRenderer
+    (orjson, если установлен) на страницах задач и сотрудников.
+    """
+
+    help = "Сравнение обычной и быстрой сериализации списков."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        results = measure_serialization(
+            options["rows"], options["repeat"], options["seed"]
+        )
+        self.stdout.write(json.dumps(results, ensure_ascii=False, indent=2))
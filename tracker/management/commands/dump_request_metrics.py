@@ -0,0 +1,25 @@
+import json
+from django.core.management import BaseCommand
+from tracker.middleware import get_route_metrics
+
+
+class Command(BaseCommand):
+    """
+    Гистограммы длительности и числа запросов к БД по маршрутам,
+    собранные QueryInstrumentationMiddleware.
+    Метрики хранятся в кэше, поэтому для нескольких процессов
+    нужен общий бэкенд кэша (CACHE_BACKEND).
+    """
+
+    help = "Выводит гистограммы метрик запросов по маршрутам."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Очистить метрики после вывода.",
+        )
+
+    def handle(self, *args, **options):
+        report = get_route_metrics(reset=options["reset"])
+        self.stdout.write(json.dumps(report, ensure_ascii=False, indent=2))
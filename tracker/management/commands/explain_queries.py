@@ -0,0 +1,64 @@
+from datetime import timedelta
+from django.core.management import BaseCommand
+from django.utils import timezone
+from tracker.models import Employee, Task
+from tracker.services import get_candidate_employees, get_important_tasks
+from tracker.views import EmployeeTaskListAPIView
+
+
+class Command(BaseCommand):
+    """
+    Планы запросов основных эндпоинтов трекера.
+    Для сравнения до/после индексов на заполненной базе:
+    python manage.py migrate tracker 0011 && python manage.py explain_queries
+    python manage.py migrate tracker && python manage.py explain_queries
+    """
+
+    help = "Выводит EXPLAIN для запросов списков задач и сотрудников."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Выполнить запросы (EXPLAIN ANALYZE, только PostgreSQL).",
+        )
+
+    def get_querysets(self):
+        tasks = Task.objects.order_by("deadline", "id")
+        now = timezone.now()
+        return {
+            "task/list/": tasks[:10],
+            "task/list/?status=": tasks.filter(
+                status=Task.STATUS_IN_PROGRESS
+            )[:10],
+            "task/list/empty/": tasks.filter(employee=None)[:10],
+            "task/list/?deadline_after=&deadline_before=": tasks.filter(
+                deadline__gte=now, deadline__lt=now + timedelta(days=7)
+            )[:10],
+            "task/list/?priority__in=": tasks.filter(
+                priority__in=["medium", "high"]
+            )[:10],
+            "task/list/?department=": tasks.filter(
+                employee__department="IT"
+            )[:10],
+            "task/list/?updated_after=": tasks.filter(
+                updated_at__gte=now - timedelta(days=1)
+            )[:10],
+            "employee/ (department)": Employee.objects.order_by(
+                "department", "id"
+            )[:10],
+            "employee/busy/?position=&department=": (
+                EmployeeTaskListAPIView().get_queryset().filter(
+                    position="Разработчик", department="IT"
+                )
+            ),
+            "employee/available/ (tasks)": get_important_tasks(),
+            "employee/available/ (employees)": get_candidate_employees(),
+        }
+
+    def handle(self, *args, **options):
+        explain_options = {"analyze": True} if options["analyze"] else {}
+        for name, queryset in self.get_querysets().items():
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(queryset.explain(**explain_options))
+            self.stdout.write("")
@@ -0,0 +1,76 @@
+from django.core.management import BaseCommand, CommandError
+from django.http import QueryDict
+from django_filters.rest_framework import DjangoFilterBackend
+from tracker.exports import EXPORT_FORMATS, iter_export
+from tracker.views import EmployeeExportAPIView, TaskExportAPIView
+
+EXPORT_VIEWS = {
+    "tasks": TaskExportAPIView,
+    "employees": EmployeeExportAPIView,
+}
+
+
+class Command(BaseCommand):
+    """
+    Потоковая выгрузка задач или сотрудников в файл.
+    Фильтры те же, что у эндпоинтов выгрузки, например:
+    python manage.py export_data tasks --format csv --filter status=created
+    """
+
+    help = "Выгружает задачи или сотрудников в NDJSON или CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", choices=sorted(EXPORT_VIEWS))
+        parser.add_argument(
+            "--format",
+            dest="export_format",
+            choices=sorted(EXPORT_FORMATS),
+            default="ndjson",
+        )
+        parser.add_argument(
+            "--output",
+            help="Файл выгрузки (по умолчанию stdout).",
+        )
+        parser.add_argument(
+            "--filter",
+            action="append",
+            default=[],
+            metavar="ПОЛЕ=ЗНАЧЕНИЕ",
+            help="Фильтр как параметр запроса, можно указать несколько раз.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def get_queryset(self, view_class, filters):
+        view = view_class()
+        queryset = view.get_queryset()
+        data = QueryDict(mutable=True)
+        for item in filters:
+            name, separator, value = item.partition("=")
+            if not separator:
+                raise CommandError(
+                    f"Фильтр {item} должен иметь вид поле=значение."
+                )
+            data.appendlist(name, value)
+        filterset_class = DjangoFilterBackend().get_filterset_class(
+            view, queryset
+        )
+        filterset = filterset_class(data=data, queryset=queryset)
+        if not filterset.is_valid():
+            raise CommandError(filterset.errors.as_text())
+        return filterset.qs
+
+    def handle(self, *args, **options):
+        view_class = EXPORT_VIEWS[options["model"]]
+        chunks = iter_export(
+            self.get_queryset(view_class, options["filter"]),
+            view_class.export_columns,
+            options["export_format"],
+            options["chunk_size"],
+        )
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+        with open(options["output"], "w", encoding="utf-8",
+                  newline="") as output:
+            output.writelines(chunks)
@@ -0,0 +1,35 @@
+import time
+from django.core.management import BaseCommand
+from tracker.benchmarks import generate_dataset
+
+
+class Command(BaseCommand):
+    """ Генерация синтетических сотрудников и задач. """
+
+    help = "Создает N сотрудников и M задач с цепочками related_task."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--employees", type=int, default=100)
+        parser.add_argument("--tasks", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--chain-ratio",
+            type=float,
+            default=0.3,
+            help="Доля задач со связанной задачей.",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        employees, tasks = generate_dataset(
+            options["employees"],
+            options["tasks"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            chain_ratio=options["chain_ratio"],
+        )
+        self.stdout.write(
+            f"Создано сотрудников: {employees}, задач: {tasks} "
+            f"({time.monotonic() - started:.1f} с)"
+        )
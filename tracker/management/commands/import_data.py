@@ -0,0 +1,48 @@
+import time
+from django.core.management import BaseCommand
+from tracker.imports import FixtureImporter, iter_json_objects, parse_record
+from tracker.models import Employee, Task
+
+
+class Command(BaseCommand):
+    """
+    Потоковый импорт задач и сотрудников из JSON-фикстур или NDJSON.
+    Например: python manage.py import_data employee.json tasks.json
+    """
+
+    help = "Импортирует задачи и сотрудников пакетами с ограниченной памятью."
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+")
+        parser.add_argument(
+            "--model",
+            choices=("tracker.task", "tracker.employee"),
+            help="Модель для плоских записей без ключа model.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Не использовать COPY даже на PostgreSQL.",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        importer = FixtureImporter(
+            batch_size=options["batch_size"],
+            use_copy=not options["no_copy"],
+            progress=self.stdout.write,
+        )
+        for path in options["paths"]:
+            with open(path, encoding="utf-8") as stream:
+                for obj in iter_json_objects(stream):
+                    importer.add(*parse_record(obj, options["model"]))
+        overdue = importer.finish()
+        self.stdout.write(self.style.SUCCESS(
+            f"Сотрудников: {importer.created[Employee]}, "
+            f"задач: {importer.created[Task]}, "
+            f"пропущено: {importer.skipped}, "
+            f"без сотрудника: {importer.missing_employees}, "
+            f"просрочено: {overdue} "
+            f"({time.monotonic() - started:.1f} с)"
+        ))
@@ -0,0 +1,38 @@
+import time
+from django.core.management import BaseCommand
+from tracker.services import mark_overdue_tasks
+
+
+class Command(BaseCommand):
+    """
+    Перевод просроченных задач в статус 'overdue'.
+    С --interval команда работает как периодический планировщик.
+    """
+
+    help = "Переводит просроченные незавершенные задачи в статус 'overdue'."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Число задач в одном UPDATE.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Повторять каждые N секунд (0 - выполнить один раз).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            count = mark_overdue_tasks(chunk_size=options["chunk_size"])
+            self.stdout.write(
+                f"Просрочено задач: {count} "
+                f"({time.monotonic() - started:.2f} с)"
+            )
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,28 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.utils import timezone
+from tracker.models import Tombstone
+
+
+class Command(BaseCommand):
+    """
+    Удаление записей об удаленных объектах старше срока хранения.
+    Клиенты ленты changes/ с курсором старше этого срока получают 410
+    и выполняют полную синхронизацию.
+    """
+
+    help = "Удаляет старые записи об удалении для ленты изменений."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.CHANGES_TOMBSTONE_RETENTION_DAYS,
+            help="Срок хранения в днях.",
+        )
+
+    def handle(self, *args, **options):
+        border = timezone.now() - timedelta(days=options["days"])
+        count, _ = Tombstone.objects.filter(deleted_at__lt=border).delete()
+        self.stdout.write(f"Удалено записей: {count}")
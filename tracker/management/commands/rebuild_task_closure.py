@@ -0,0 +1,17 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+from tracker.dependencies import refresh_task_closure
+
+
+class Command(BaseCommand):
+    """
+    Полная пересборка таблицы зависимостей задач (TaskClosure)
+    по related_task - после ручных правок БД или сбоя.
+    """
+
+    help = "Пересобирает таблицу транзитивных зависимостей задач."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rows = refresh_task_closure()
+        self.stdout.write(f"Записано зависимостей: {rows}")
@@ -0,0 +1,38 @@
+from django.core.management import BaseCommand
+from django.db.models import F
+from tracker.cache import bump_generation
+from tracker.models import Employee, Task
+from tracker.services import refresh_workload_counters, task_count_subquery
+
+
+class Command(BaseCommand):
+    """ Сверка счетчиков задач сотрудников с таблицей задач. """
+
+    help = "Исправляет расхождения счетчиков total_tasks/active_tasks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Число сотрудников в одном UPDATE.",
+        )
+
+    def handle(self, *args, **options):
+        drifted = list(
+            Employee.objects.annotate(
+                real_total=task_count_subquery(),
+                real_active=task_count_subquery(
+                    status=Task.STATUS_IN_PROGRESS
+                ),
+            ).exclude(
+                total_tasks=F("real_total"),
+                active_tasks=F("real_active"),
+            ).values_list("pk", flat=True)
+        )
+        chunk_size = options["chunk_size"]
+        for start in range(0, len(drifted), chunk_size):
+            refresh_workload_counters(drifted[start:start + chunk_size])
+        if drifted:
+            bump_generation("employee")
+        self.stdout.write(f"Исправлено сотрудников: {len(drifted)}")
@@ -0,0 +1,262 @@
+import json
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+from tracker.cache import get_cache, incr_counter
+from tracker.routers import REPLICA_DB_ALIAS, read_alias
+
+logger = logging.getLogger("tracker.performance")
+
+METRICS_KEY = "tracker:metrics:{}"
+# Список маршрутов - нумерованные ключи routes:<n> (счетчик routes:count),
+# маршрут регистрируется один раз по ключу <маршрут>:registered.
+ROUTES_COUNT_KEY = METRICS_KEY.format("routes:count")
+ROUTE_SLOT_KEY = METRICS_KEY.format("routes:{}")
+# Границы корзин гистограмм: длительность в мс, число запросов к БД
+# и время получения соединения (подключение или ожидание пула) в мс.
+HISTOGRAMS = {
+    "duration_ms": (5, 10, 25, 50, 100, 250, 500, 1000, 2500),
+    "queries": (1, 2, 5, 10, 25, 50, 100),
+    "db_connect_ms": (1, 5, 10, 25, 50, 100, 250, 1000),
+}
+CONNECTION_STATES = ("new", "reused")
+
+
+class QueryCollector:
+    """
+    Обертка execute_wrapper: число запросов, суммарное время SQL
+    и повторяющиеся запросы (SQL с плейсхолдерами - отпечаток запроса).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.fingerprints[sql] += 1
+
+    def duplicates(self, limit=5):
+        return [
+            {"sql": sql, "count": count}
+            for sql, count in self.fingerprints.most_common(limit)
+            if count > 1
+        ]
+
+
+def get_bucket(name, value):
+    for bound in HISTOGRAMS[name]:
+        if value <= bound:
+            return f"le_{bound}"
+    return "inf"
+
+
+def record_route_metrics(route, metrics):
+    """
+    Гистограммы маршрута в кэше (для нескольких процессов нужен общий
+    бэкенд кэша). Все ключи меняются только через add/incr, поэтому
+    параллельные запросы не теряют обновления. Сумма длительностей
+    хранится в целых микросекундах.
+    """
+    cache = get_cache()
+    registered_key = METRICS_KEY.format(f"{route}:registered")
+    if cache.add(registered_key, 1, timeout=None):
+        # Слот уже занят, если счетчик маршрутов был вытеснен.
+        while not cache.add(
+            ROUTE_SLOT_KEY.format(incr_counter(ROUTES_COUNT_KEY)),
+            route, timeout=None
+        ):
+            continue
+    keys = [
+        METRICS_KEY.format(f"{route}:count"),
+        METRICS_KEY.format(f"{route}:connection:{metrics['db_connection']}"),
+    ]
+    for name in HISTOGRAMS:
+        keys.append(METRICS_KEY.format(
+            f"{route}:{name}:{get_bucket(name, metrics[name])}"
+        ))
+    for key in keys:
+        incr_counter(key)
+    incr_counter(
+        METRICS_KEY.format(f"{route}:duration_us:sum"),
+        round(metrics["duration_ms"] * 1000),
+    )
+
+
+def get_route_metrics(reset=False):
+    """Гистограммы по маршрутам: {маршрут: {count, mean_ms, гистограммы}}."""
+    cache = get_cache()
+    slot_keys = [
+        ROUTE_SLOT_KEY.format(index)
+        for index in range(1, cache.get(ROUTES_COUNT_KEY, 0) + 1)
+    ]
+    routes = sorted(set(cache.get_many(slot_keys).values()))
+    report = {}
+    for route in routes:
+        keys = {
+            "count": METRICS_KEY.format(f"{route}:count"),
+            "sum": METRICS_KEY.format(f"{route}:duration_us:sum"),
+            "registered": METRICS_KEY.format(f"{route}:registered"),
+        }
+        for state in CONNECTION_STATES:
+            keys[f"connection:{state}"] = METRICS_KEY.format(
+                f"{route}:connection:{state}"
+            )
+        for name, bounds in HISTOGRAMS.items():
+            for bucket in [f"le_{bound}" for bound in bounds] + ["inf"]:
+                keys[f"{name}:{bucket}"] = METRICS_KEY.format(
+                    f"{route}:{name}:{bucket}"
+                )
+        values = cache.get_many(keys.values())
+        count = values.get(keys["count"], 0)
+        report[route] = {
+            "count": count,
+            "mean_ms": round(values.get(keys["sum"], 0) / count / 1000, 2)
+            if count else 0,
+            "connections": {
+                state: values.get(keys[f"connection:{state}"], 0)
+                for state in CONNECTION_STATES
+            },
+        }
+        for name in HISTOGRAMS:
+            report[route][name] = {
+                key.split(":", 1)[1]: values[cache_key]
+                for key, cache_key in keys.items()
+                if key.startswith(f"{name}:") and cache_key in values
+            }
+        if reset:
+            cache.delete_many(keys.values())
+    if reset:
+        cache.delete_many(slot_keys + [ROUTES_COUNT_KEY])
+    return report
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Метрики запроса: число запросов к БД, время SQL, повторяющиеся
+    запросы, время сериализации и рендеринга.
+    Включается настройкой QUERY_INSTRUMENTATION. Метрики отдаются
+    в заголовке Server-Timing, пишутся в лог tracker.performance
+    и копятся в гистограммах по маршрутам (команда dump_request_metrics).
+    Время сериализации - время работы view за вычетом SQL.
+    Соединение default открывается до view, чтобы замерить подключение
+    (с CONN_HEALTH_CHECKS - и проверку) или ожидание пула: new - соединение
+    получено в этом запросе (с пулом - каждый запрос), reused - постоянное
+    соединение (CONN_MAX_AGE) осталось от прошлого запроса.
+    """
+
+    def __init__(self, get_response):
+        if not settings.QUERY_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        collector = QueryCollector()
+        request._instrumentation = {"render": 0.0}
+        started = time.perf_counter()
+        database = connections[DEFAULT_DB_ALIAS]
+        reused = database.connection is not None
+        database.ensure_connection()
+        connect_time = time.perf_counter() - started
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(collector))
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+        timings = request._instrumentation
+        view_time = timings.get("view", total - timings["render"])
+        metrics = {
+            "route": (
+                request.resolver_match.view_name
+                if request.resolver_match else "unresolved"
+            ),
+            "method": request.method,
+            "status": response.status_code,
+            "queries": collector.count,
+            "db_connection": "reused" if reused else "new",
+            "db_connect_ms": round(connect_time * 1000, 2),
+            "db_ms": round(collector.duration * 1000, 2),
+            "serialize_ms": round(
+                max(view_time - collector.duration, 0) * 1000, 2
+            ),
+            "render_ms": round(timings["render"] * 1000, 2),
+            "duration_ms": round(total * 1000, 2),
+            "duplicates": collector.duplicates(),
+        }
+        response["Server-Timing"] = ", ".join((
+            f'conn;dur={metrics["db_connect_ms"]};'
+            f'desc="{metrics["db_connection"]}"',
+            f'db;dur={metrics["db_ms"]};desc="{collector.count} queries"',
+            f'serialize;dur={metrics["serialize_ms"]}',
+            f'render;dur={metrics["render_ms"]}',
+            f'total;dur={metrics["duration_ms"]}',
+        ))
+        logger.info(json.dumps(metrics, ensure_ascii=False))
+        record_route_metrics(metrics["route"], metrics)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._instrumentation["view_started"] = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        """Ответ DRF рендерится здесь, чтобы замерить рендеринг отдельно."""
+        timings = request._instrumentation
+        started = time.perf_counter()
+        if "view_started" in timings:
+            timings["view"] = started - timings["view_started"]
+        response.render()
+        timings["render"] = time.perf_counter() - started
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Безопасные запросы (GET, HEAD, OPTIONS) к представлениям tracker
+    и users читают с реплики, запись и остальные маршруты - основная БД.
+    После изменяющего запроса клиент получает cookie
+    REPLICA_STICKY_COOKIE на REPLICA_STICKY_SECONDS секунд: пока она
+    есть, его чтения идут в основную БД и отставание реплики не прячет
+    только что записанные данные.
+    Без алиаса replica в DATABASES не подключается.
+    """
+
+    apps = ("tracker", "users")
+
+    def __init__(self, get_response):
+        if REPLICA_DB_ALIAS not in settings.DATABASES:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            read_alias.set(None)
+        if request.method not in SAFE_METHODS:
+            response.set_cookie(
+                settings.REPLICA_STICKY_COOKIE,
+                "1",
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method in SAFE_METHODS
+            and request.resolver_match.app_name in self.apps
+            and settings.REPLICA_STICKY_COOKIE not in request.COOKIES
+        ):
+            read_alias.set(REPLICA_DB_ALIAS)
@@ -0,0 +1,47 @@
+# Generated by Django 5.1.1 on 2026-10-18 17:20
+
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+def normalize_priority(apps, schema_editor):
+    """ Приоритет хранится в нижнем регистре: поиск идет точным совпадением. """
+    Task = apps.get_model('tracker', 'Task')
+    Task.objects.exclude(priority=Lower('priority')).update(
+        priority=Lower('priority')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0011_task_priority'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_priority, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['department', 'position'], name='employee_dept_position_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['position'], name='employee_position_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['deadline', 'id'], name='task_deadline_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'deadline'], name='task_status_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('employee__isnull', True)), fields=['deadline', 'id'], name='task_unassigned_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('employee__isnull', True), ('priority', 'high')), fields=['related_task'], name='task_important_idx'),
+        ),
+    ]
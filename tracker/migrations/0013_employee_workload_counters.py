@@ -0,0 +1,55 @@
+# Generated by Django 5.1.1 on 2026-10-18 17:22
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_workload_counters(apps, schema_editor):
+    """ Начальное заполнение счетчиков задач сотрудников. """
+    Employee = apps.get_model('tracker', 'Employee')
+    Task = apps.get_model('tracker', 'Task')
+
+    def task_count(**filters):
+        tasks = Task.objects.filter(
+            employee=OuterRef('pk'), **filters
+        ).order_by().values('employee').annotate(
+            count=Count('pk')
+        ).values('count')
+        return Coalesce(Subquery(tasks), 0)
+
+    Employee.objects.update(
+        total_tasks=task_count(),
+        active_tasks=task_count(status='in_progress'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0012_task_employee_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='active_tasks',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Задач в работе'),
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='total_tasks',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Всего задач'),
+        ),
+        migrations.RunPython(
+            fill_workload_counters, migrations.RunPython.noop
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['active_tasks', 'id'], name='employee_active_tasks_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['total_tasks', 'id'], name='employee_total_tasks_idx'),
+        ),
+    ]
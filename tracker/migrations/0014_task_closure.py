@@ -0,0 +1,50 @@
+# Generated by Django 5.1.1 on 2026-10-18 17:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+FILL_CLOSURE_SQL = """
+WITH RECURSIVE chain (descendant_id, ancestor_id, depth) AS (
+    SELECT id, related_task_id, 1 FROM tracker_task
+    WHERE related_task_id IS NOT NULL
+    UNION ALL
+    SELECT c.descendant_id, t.related_task_id, c.depth + 1
+    FROM tracker_task t JOIN chain c ON t.id = c.ancestor_id
+    WHERE t.related_task_id IS NOT NULL AND c.depth < 50
+)
+INSERT INTO tracker_taskclosure (ancestor_id, descendant_id, depth)
+SELECT ancestor_id, descendant_id, MIN(depth) FROM chain
+WHERE ancestor_id <> descendant_id
+GROUP BY ancestor_id, descendant_id
+"""
+
+
+def fill_task_closure(apps, schema_editor):
+    """ Начальное заполнение таблицы зависимостей по related_task. """
+    schema_editor.execute(FILL_CLOSURE_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0013_employee_workload_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField(verbose_name='Глубина')),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='tracker.task', verbose_name='Зависимая задача')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='tracker.task', verbose_name='Задача, от которой зависят')),
+            ],
+            options={
+                'verbose_name': 'Зависимость задачи',
+                'verbose_name_plural': 'Зависимости задач',
+                'indexes': [models.Index(fields=['descendant', 'ancestor'], name='task_closure_descendant_idx')],
+                'constraints': [models.UniqueConstraint(fields=('ancestor', 'descendant'), name='task_closure_unique')],
+            },
+        ),
+        migrations.RunPython(fill_task_closure, migrations.RunPython.noop),
+    ]
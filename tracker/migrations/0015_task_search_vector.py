@@ -0,0 +1,76 @@
+# Generated by Django 5.1.1 on 2026-10-18 17:49
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+SEARCH_VECTOR_SQL = """
+setweight(to_tsvector('russian', coalesce({0}title, '')), 'A')
+|| setweight(to_tsvector('english', coalesce({0}title, '')), 'A')
+|| setweight(to_tsvector('russian', coalesce({0}description, '')), 'B')
+|| setweight(to_tsvector('english', coalesce({0}description, '')), 'B')
+"""
+
+CREATE_SEARCH_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION tracker_task_search_vector_update()
+    RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """.format(SEARCH_VECTOR_SQL.format("NEW.")),
+    """
+    CREATE TRIGGER tracker_task_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description ON tracker_task
+    FOR EACH ROW EXECUTE FUNCTION tracker_task_search_vector_update()
+    """,
+    "UPDATE tracker_task SET search_vector = {}".format(
+        SEARCH_VECTOR_SQL.format("")
+    ),
+    """
+    CREATE INDEX task_search_vector_idx ON tracker_task
+    USING gin (search_vector)
+    """,
+]
+
+DROP_SEARCH_SQL = [
+    "DROP INDEX IF EXISTS task_search_vector_idx",
+    "DROP TRIGGER IF EXISTS tracker_task_search_vector_trigger"
+    " ON tracker_task",
+    "DROP FUNCTION IF EXISTS tracker_task_search_vector_update()",
+]
+
+
+def create_search_objects(apps, schema_editor):
+    """
+    Триггер, заполнение и GIN-индекс search_vector - только в PostgreSQL
+    (в других БД поиск идет по icontains, см. tracker.search).
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for sql in CREATE_SEARCH_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_search_objects(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for sql in DROP_SEARCH_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0014_task_closure'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True, verbose_name='Поисковый вектор'),
+        ),
+        migrations.RunPython(create_search_objects, drop_search_objects),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0017_changes_feed'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['department', 'id'], name='employee_dept_id_idx'),
+        ),
+    ]
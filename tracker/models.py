@@ -1,5 +1,5 @@
-from django.db import models
-from django.utils import timezone
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
 
 NULLABLE = {"blank": True, "null": True}
 
@@ -17,6 +17,16 @@ class BaseModel(models.Model):
         abstract = True
 
 
+class TaskManager(models.Manager):
+    """
+    Столбец search_vector нужен только поиску (tracker.search),
+    поэтому по умолчанию не читается.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().defer("search_vector")
+
+
 class Task(BaseModel):
     STATUS_CREATED = "created"
     STATUS_IN_PROGRESS = "in_progress"
@@ -69,6 +79,14 @@ class Task(BaseModel):
         ],
         default="low",
     )
+    # Полнотекстовый индекс названия и описания (русский и английский).
+    # В PostgreSQL заполняется триггером при записи, GIN-индекс и триггер
+    # создает миграция 0015.
+    search_vector = SearchVectorField(
+        editable=False, verbose_name="Поисковый вектор", **NULLABLE
+    )
+
+    objects = TaskManager()
 
     def __str__(self):
         return self.title, self.description
@@ -76,20 +94,96 @@ class Task(BaseModel):
     class Meta:
         verbose_name = "Задача"
         verbose_name_plural = "Задачи"
+        indexes = [
+            # Списки задач: сортировка по дедлайну, фильтр по статусу.
+            models.Index(
+                fields=["deadline", "id"],
+                name="task_deadline_id_idx",
+            ),
+            models.Index(
+                fields=["status", "deadline"],
+                name="task_status_deadline_idx",
+            ),
+            # Задачи без сотрудника (task/list/empty/).
+            models.Index(
+                fields=["deadline", "id"],
+                condition=models.Q(employee__isnull=True),
+                name="task_unassigned_idx",
+            ),
+            # Важные задачи (employee/available/).
+            models.Index(
+                fields=["related_task"],
+                condition=models.Q(employee__isnull=True, priority="high"),
+                name="task_important_idx",
+            ),
+            # Фильтры TaskFilterSet: приоритет, даты создания и изменения.
+            models.Index(
+                fields=["priority", "deadline"],
+                name="task_priority_deadline_idx",
+            ),
+            models.Index(
+                fields=["created_at", "id"],
+                name="task_created_idx",
+            ),
+            models.Index(
+                fields=["updated_at", "id"],
+                name="task_updated_idx",
+            ),
+        ]
 
-    def save(self, *args, **kwargs):
+    def apply_status_rules(self):
         """
-        1. При сохранении экземпляра, если указан сотрудник и статус 'created',
+        Если указан сотрудник и статус 'created',
         то изменяем статус на 'in_progress'.
-        2. Если дедлайн просрочен и статус заявки не 'finished',
-        то при обновлении задачи меняется статус на 'overdue'.
+        Используется при сохранении и в пакетных операциях без save().
+        Статус 'overdue' проставляет команда mark_overdue
+        (tracker.services.mark_overdue_tasks), а не запись задачи.
         """
-        if self.employee and self.status == self.STATUS_CREATED:
+        if self.employee_id and self.status == self.STATUS_CREATED:
             self.status = self.STATUS_IN_PROGRESS
-        elif (self.deadline < timezone.now()
-              and self.status != self.STATUS_FINISHED):
-            self.status = self.STATUS_OVERDUE
-        super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Запоминаем сотрудника, статус и связанную задачу
+        для пересчета счетчиков и таблицы зависимостей.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance.remember_workload_state()
+        return instance
+
+    def remember_workload_state(self):
+        self._loaded_employee_id = self.__dict__.get("employee_id")
+        self._loaded_status = self.__dict__.get("status")
+        self._loaded_related_task_id = self.__dict__.get("related_task_id")
+        # (сотрудник, статус) для счетчиков; None - поля были отложены.
+        self._loaded_workload = (
+            (self._loaded_employee_id, self._loaded_status)
+            if {"employee_id", "status"} <= self.__dict__.keys() else None
+        )
+
+    def save(self, *args, **kwargs):
+        """
+        При сохранении экземпляра применяются правила статусов.
+        Счетчики задач сотрудников обновляются в той же транзакции
+        (tracker.signals).
+        """
+        self.apply_status_rules()
+        with transaction.atomic(using=kwargs.get("using")):
+            self.load_workload_state(kwargs.get("using"))
+            super().save(*args, **kwargs)
+
+    def load_workload_state(self, using=None):
+        """
+        Сотрудник и статус задачи в БД (с блокировкой строки), если они
+        не были загружены вместе с задачей (only(), defer(), Task(pk=...)).
+        """
+        if getattr(self, "_loaded_workload", None) is None and self.pk:
+            self._loaded_workload = Task._base_manager.using(
+                using or self._state.db
+            ).select_for_update().filter(pk=self.pk).values_list(
+                "employee_id", "status"
+            ).first()
 
 
 class Employee(BaseModel):
@@ -102,10 +196,126 @@ class Employee(BaseModel):
     department = models.CharField(
         max_length=100, verbose_name="Отдел сотрудника", **NULLABLE
     )
+    total_tasks = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Всего задач"
+    )
+    active_tasks = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Задач в работе"
+    )
+
+    WORKLOAD_FIELDS = ("total_tasks", "active_tasks")
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        """
+        Счетчики задач пишут только функции tracker.services
+        (apply_workload_deltas, refresh_workload_counters): при обновлении
+        сотрудника они не перезаписываются значениями, прочитанными
+        до изменения задач.
+        """
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.WORKLOAD_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = "Сотрудник"
         verbose_name_plural = "Сотрудники"
+        indexes = [
+            models.Index(
+                fields=["department", "position"],
+                name="employee_dept_position_idx",
+            ),
+            models.Index(fields=["position"], name="employee_position_idx"),
+            # Курсорная пагинация сотрудников: сортировка (department, id).
+            models.Index(
+                fields=["department", "id"],
+                name="employee_dept_id_idx",
+            ),
+            # Счетчики загрузки (employee/busy/, employee/available/).
+            models.Index(
+                fields=["active_tasks", "id"],
+                name="employee_active_tasks_idx",
+            ),
+            models.Index(
+                fields=["total_tasks", "id"],
+                name="employee_total_tasks_idx",
+            ),
+            # Лента изменений changes/.
+            models.Index(
+                fields=["updated_at", "id"],
+                name="employee_updated_idx",
+            ),
+        ]
+
+
+class TaskClosure(models.Model):
+    """
+    Транзитивные зависимости задач (таблица замыкания related_task):
+    ancestor зависит от descendant через depth связей.
+    Ведется tracker.dependencies.refresh_task_closure.
+    """
+
+    ancestor = models.ForeignKey(
+        Task,
+        on_delete=models.CASCADE,
+        related_name="descendant_links",
+        verbose_name="Зависимая задача",
+    )
+    descendant = models.ForeignKey(
+        Task,
+        on_delete=models.CASCADE,
+        related_name="ancestor_links",
+        verbose_name="Задача, от которой зависят",
+    )
+    depth = models.PositiveIntegerField(verbose_name="Глубина")
+
+    class Meta:
+        verbose_name = "Зависимость задачи"
+        verbose_name_plural = "Зависимости задач"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["ancestor", "descendant"],
+                name="task_closure_unique",
+            ),
+        ]
+        indexes = [
+            # ?blocked_by= и ?depends_on=: задачи, зависящие от descendant.
+            models.Index(
+                fields=["descendant", "ancestor"],
+                name="task_closure_descendant_idx",
+            ),
+        ]
+
+
+class Tombstone(models.Model):
+    """
+    Запись об удаленной задаче или сотруднике для ленты изменений
+    changes/. Создается сигналом post_delete, старые записи удаляет
+    команда prune_tombstones.
+    """
+
+    model_name = models.CharField(
+        max_length=20,
+        choices=[("task", "Задача"), ("employee", "Сотрудник")],
+        verbose_name="Модель",
+    )
+    object_id = models.PositiveBigIntegerField(verbose_name="id объекта")
+    deleted_at = models.DateTimeField(
+        auto_now_add=True, verbose_name="время удаления"
+    )
+
+    class Meta:
+        verbose_name = "Удаленный объект"
+        verbose_name_plural = "Удаленные объекты"
+        indexes = [
+            models.Index(
+                fields=["deleted_at", "id"],
+                name="tombstone_deleted_idx",
+            ),
+        ]
@@ -1,13 +1,178 @@
+import base64
+import json
+from datetime import datetime
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
 from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
-class EmployeePaginator(pagination.PageNumberPagination):
+class KeysetPagination(pagination.BasePagination):
+    """
+    Курсорная (keyset) пагинация по паре (ordering_field, id).
+    Следующая страница выбирается условием по последней строке,
+    без COUNT(*) и OFFSET. Строки с NULL в ordering_field идут в конце.
+    """
+
+    ordering_field = None
+    page_size = 10
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Неверный курсор."
+
+    @property
+    def max_page_size(self):
+        return settings.CURSOR_PAGINATION_MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.next_position = None
+        queryset = queryset.order_by(
+            F(self.ordering_field).asc(nulls_last=True), "id"
+        )
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(
+                self.get_after_filter(*position, queryset.model)
+            )
+        page = list(queryset[:self.page_size + 1])
+        if len(page) > self.page_size:
+            page = page[:self.page_size]
+            self.next_position = (
+                self.get_row_value(page[-1], self.ordering_field),
+                self.get_row_value(page[-1], "id"),
+            )
+        return page
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_after_filter(self, value, pk, model):
+        """
+        Условие "строго после (value, pk)" в виде
+        field >= value AND (field > value OR id > pk): первая часть -
+        начало диапазона по индексу (field, id), поэтому глубокие страницы
+        не сканируют индекс с начала. Ветка IS NULL (NULL идут в конце) -
+        только для nullable-поля.
+        """
+        field = self.ordering_field
+        if value is None:
+            return Q(**{f"{field}__isnull": True, "id__gt": pk})
+        condition = Q(**{f"{field}__gte": value}) & (
+            Q(**{f"{field}__gt": value}) | Q(id__gt=pk)
+        )
+        if model._meta.get_field(field).null:
+            condition |= Q(**{f"{field}__isnull": True})
+        return condition
+
+    @staticmethod
+    def get_row_value(row, name):
+        """Строка страницы может быть экземпляром модели или словарем."""
+        if isinstance(row, dict):
+            return row[name]
+        return getattr(row, name)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        value, pk = self.next_position
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        cursor = base64.urlsafe_b64encode(
+            json.dumps([value, pk]).encode()
+        ).decode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            value, pk = json.loads(base64.urlsafe_b64decode(encoded))
+            field = model._meta.get_field(self.ordering_field)
+            return field.to_python(value), int(pk)
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class TaskCursorPaginator(KeysetPagination):
+    ordering_field = "deadline"
+    page_size = 5
+
+
+class EmployeeCursorPaginator(KeysetPagination):
+    ordering_field = "department"
+    page_size = 10
+
+
+class CursorOptInMixin:
+    """
+    Постраничная пагинация с переходом на курсорную по ?pagination=cursor
+    (или при наличии ?cursor=). Сортировка ?ordering= в курсорном режиме
+    не применяется.
+    """
+
+    cursor_class = None
+    mode_query_param = "pagination"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if (request.query_params.get(self.mode_query_param) == "cursor"
+                or self.cursor_class.cursor_query_param
+                in request.query_params):
+            self.cursor_paginator = self.cursor_class()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class EmployeePaginator(CursorOptInMixin, pagination.PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 10
+    cursor_class = EmployeeCursorPaginator
+
+
+class TaskPaginator(CursorOptInMixin, pagination.PageNumberPagination):
+    page_size = 5
+    page_size_query_param = "page_size"
+    max_page_size = 10
+    cursor_class = TaskCursorPaginator
+
 
+class TaskSearchPaginator(pagination.PageNumberPagination):
+    """Результаты поиска - постранично, в порядке релевантности."""
 
-class TaskPaginator(pagination.PageNumberPagination):
     page_size = 5
     page_size_query_param = "page_size"
     max_page_size = 10
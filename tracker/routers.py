@@ -0,0 +1,26 @@
+from contextvars import ContextVar
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_DB_ALIAS = "replica"
+
+# Алиас БД для чтения в текущем запросе (ставит ReplicaRoutingMiddleware).
+read_alias = ContextVar("read_alias", default=None)
+
+
+class ReplicaRouter:
+    """
+    Чтение - с алиаса из read_alias (реплика для безопасных запросов),
+    иначе с основной БД. Запись и миграции - только основная БД.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
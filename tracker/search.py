@@ -0,0 +1,46 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import Case, F, FloatField, Q, Value, When
+
+# Словари полнотекстового поиска: столбец search_vector задач строится
+# по обоим (триггер из миграции 0015), запрос ищет по любому из них.
+SEARCH_CONFIGS = ("russian", "english")
+
+
+def get_search_query(text):
+    """Запрос в синтаксисе websearch ("фраза", -слово, or) по всем словарям."""
+    query = None
+    for config in SEARCH_CONFIGS:
+        part = SearchQuery(text, config=config, search_type="websearch")
+        query = part if query is None else query | part
+    return query
+
+
+def search_tasks(queryset, text):
+    """
+    Задачи, подходящие под строку поиска, по убыванию релевантности
+    (rank), затем по дедлайну.
+    В PostgreSQL - поиск по search_vector через GIN-индекс и ts_rank
+    (название весит больше описания). В других БД (SQLite в тестах) -
+    все слова в названии или описании через icontains, выше задачи
+    со всей строкой в названии.
+    """
+    if connections[queryset.db].vendor == "postgresql":
+        query = get_search_query(text)
+        queryset = queryset.filter(search_vector=query).annotate(
+            rank=SearchRank(F("search_vector"), query)
+        )
+    else:
+        condition = Q()
+        for word in text.split():
+            condition &= (
+                Q(title__icontains=word) | Q(description__icontains=word)
+            )
+        queryset = queryset.filter(condition).annotate(
+            rank=Case(
+                When(title__icontains=text, then=Value(1.0)),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+        )
+    return queryset.order_by("-rank", "deadline", "id")
@@ -1,5 +1,9 @@
-from tracker.models import Employee, Task
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import models
+from tracker.dependencies import check_dependency_chain, get_ancestor_edges
+from tracker.models import Employee, Task, Tombstone
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 from tracker.validators import (
     validate_deadline,
     StatusValidator,
@@ -7,7 +11,146 @@ from tracker.validators import (
 )
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class FastListSerializer(serializers.ListSerializer):
+    """
+    Вывод списка без обработки каждого поля каждой строки.
+    Строки - словари values() (ключи - get_value_fields()) или экземпляры
+    модели (связи читаются по *_id без запроса). Значения берутся как
+    есть, даты форматируются полем сериализатора один раз на каждое
+    уникальное значение страницы. Вывод совпадает с обычным ListSerializer;
+    только для чтения и для полей без вложенного source.
+    """
+
+    # Поля, чей to_representation возвращает значение модели без изменений.
+    plain_field_types = (
+        serializers.BooleanField,
+        serializers.CharField,
+        serializers.ChoiceField,
+        serializers.EmailField,
+        serializers.FloatField,
+        serializers.IntegerField,
+        serializers.SlugField,
+        serializers.URLField,
+        serializers.PrimaryKeyRelatedField,
+        serializers.DateTimeField,
+    )
+
+    def get_columns(self):
+        """
+        (имя в выводе, ключ строки, атрибут экземпляра, поле даты).
+        Поле с source не из конкретного поля модели или с
+        преобразованием значения - ImproperlyConfigured.
+        """
+        opts = self.child.Meta.model._meta
+        columns = []
+        for field in self.child._readable_fields:
+            attribute = field.source
+            try:
+                model_field = opts.get_field(field.source)
+            except FieldDoesNotExist:
+                model_field = None
+            if (
+                model_field is None
+                or not model_field.concrete
+                or model_field.many_to_many
+                or type(field) not in self.plain_field_types
+                or getattr(field, "pk_field", None) is not None
+            ):
+                raise ImproperlyConfigured(
+                    f"FastListSerializer не поддерживает поле "
+                    f"{type(self.child).__name__}.{field.field_name} "
+                    f"({type(field).__name__}, source={field.source!r})."
+                )
+            if model_field.is_relation:
+                attribute = model_field.attname
+            columns.append((
+                field.field_name,
+                field.source,
+                attribute,
+                field if isinstance(field, serializers.DateTimeField)
+                else None,
+            ))
+        return columns
+
+    def get_value_fields(self):
+        """Поля для queryset.values()."""
+        return [key for _, key, _, _ in self.get_columns()]
+
+    def to_representation(self, data):
+        rows = data.all() if isinstance(
+            data, models.manager.BaseManager
+        ) else data
+        columns = self.get_columns()
+        formatted = {}
+        result = []
+        for row in rows:
+            item = {}
+            for name, key, attribute, date_field in columns:
+                value = (
+                    row[key] if isinstance(row, dict)
+                    else getattr(row, attribute)
+                )
+                if date_field is not None and value is not None:
+                    if value not in formatted:
+                        formatted[value] = date_field.to_representation(value)
+                    value = formatted[value]
+                item[name] = value
+            result.append(item)
+        return result
+
+
+class SparseFieldsMixin:
+    """
+    Выбор полей ответа на чтение: ?fields=id,title и ?exclude=description
+    (request из context). Неизвестное поле - ошибка 400.
+    Невыбранные поля убираются из сериализатора, поэтому вложенные списки
+    не сериализуются; get_model_fields() отдает поля модели для .only().
+    """
+
+    @classmethod
+    def get_selected_fields(cls, request):
+        """Выбранные поля в порядке Meta.fields."""
+        available = cls.Meta.fields
+        selected = set(available)
+        if request is None or request.method not in SAFE_METHODS:
+            return list(available)
+        for param in ("fields", "exclude"):
+            value = request.query_params.get(param)
+            if value is None:
+                continue
+            names = {name.strip() for name in value.split(",") if name.strip()}
+            unknown = names - set(available)
+            if unknown:
+                raise serializers.ValidationError({param: [
+                    f"Неизвестные поля: {', '.join(sorted(unknown))}."
+                ]})
+            if param == "fields":
+                selected &= names
+            else:
+                selected -= names
+        return [name for name in available if name in selected]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = self.get_selected_fields(self.context.get("request"))
+        for name in set(self.fields) - set(selected):
+            self.fields.pop(name)
+
+    def get_model_fields(self):
+        """Столбцы модели, из которых читаются выбранные поля."""
+        opts = self.Meta.model._meta
+        names = []
+        for field in self.fields.values():
+            try:
+                model_field = opts.get_field(field.source)
+            except FieldDoesNotExist:
+                continue
+            if model_field.concrete:
+                names.append(model_field.name)
+        return names
+
+
+class TaskSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Список всех задач"""
 
     deadline = serializers.DateTimeField(
@@ -31,6 +174,22 @@ class TaskSerializer(serializers.ModelSerializer):
         validators = [
             StatusValidator(field_status="status"),
         ]
+        list_serializer_class = FastListSerializer
+
+    def validate_related_task(self, value):
+        """
+        Связь не должна образовывать цикл зависимостей
+        и удлинять цепочку сверх TASK_DEPENDENCY_MAX_DEPTH.
+        """
+        if value is None:
+            return value
+        task_id = self.instance.pk if self.instance else None
+        error = check_dependency_chain(
+            get_ancestor_edges([value.pk]), task_id, value.pk
+        )
+        if error:
+            raise serializers.ValidationError(error)
+        return value
 
     def update(self, obj, validated_data):
         """При назначении сотрудника на созданную задачу-изменяется статус."""
@@ -52,6 +211,24 @@ class TaskSerializer(serializers.ModelSerializer):
         return super().update(obj, validated_data)
 
 
+class TaskBulkItemSerializer(TaskSerializer):
+    """
+    Строка пакетной загрузки задач.
+    Связи передаются числом и проверяются сразу для всего пакета.
+    """
+
+    id = serializers.IntegerField(required=False)
+    related_task = serializers.IntegerField(required=False, allow_null=True)
+    employee = serializers.IntegerField(required=False, allow_null=True)
+
+    class Meta(TaskSerializer.Meta):
+        pass
+
+    def validate_related_task(self, value):
+        """Цепочки зависимостей проверяются сразу для всего пакета."""
+        return value
+
+
 class TaskShortListSerializer(serializers.ModelSerializer):
     """Краткая информация о задачах."""
 
@@ -75,6 +252,7 @@ class TaskShortListSerializer(serializers.ModelSerializer):
         validators = [
             StatusValidator(field_status="status"),
         ]
+        list_serializer_class = FastListSerializer
 
 
 class EmployeeShortSerializer(serializers.ModelSerializer):
@@ -83,14 +261,19 @@ class EmployeeShortSerializer(serializers.ModelSerializer):
     class Meta:
         model = Employee
         fields = ("id", "name", "position", "department")
+        list_serializer_class = FastListSerializer
 
 
-class EmployeeSerializer(serializers.ModelSerializer):
+class EmployeeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Список всех сотрудников."""
 
     list_tasks = TaskShortListSerializer(source="task", many=True)
-    total_tasks_count = serializers.SerializerMethodField()
-    active_tasks_count = serializers.SerializerMethodField()
+    total_tasks_count = serializers.IntegerField(
+        source="total_tasks", read_only=True
+    )
+    active_tasks_count = serializers.IntegerField(
+        source="active_tasks", read_only=True
+    )
 
     class Meta:
         model = Employee
@@ -104,21 +287,108 @@ class EmployeeSerializer(serializers.ModelSerializer):
             "list_tasks",
         )
 
-    def get_total_tasks_count(self, obj):
-        """Общие число задач."""
-        return obj.task.count()
 
-    def get_active_tasks_count(self, obj):
-        """Задачи в работе."""
-        return obj.task.filter(status=Task.STATUS_IN_PROGRESS).count()
+class TaskSummarySerializer(serializers.ModelSerializer):
+    """Сводка задачи без описания."""
+
+    deadline = serializers.DateTimeField(format="%d.%m.%Y %H:%M")
+
+    class Meta:
+        model = Task
+        fields = ("id", "title", "deadline", "priority", "status")
+
+
+class TaskDependencySerializer(TaskSummarySerializer):
+    """Узел графа зависимостей: глубина от исходной задачи."""
+
+    depth = serializers.IntegerField(read_only=True)
+
+    class Meta(TaskSummarySerializer.Meta):
+        fields = TaskSummarySerializer.Meta.fields + (
+            "related_task", "employee", "depth"
+        )
+
 
+class BlockedTaskSerializer(TaskSummarySerializer):
+    """
+    Заблокированная задача: число незавершенных задач, которые она ждет,
+    и длина самой длинной цепочки до них.
+    """
 
-class EmployeeActiveTaskSerializer(serializers.ModelSerializer):
-    # working
-    """Список сотрудников с активными задачами."""
-    active_tasks_count = serializers.SerializerMethodField()
-    active_tasks_list = serializers.SerializerMethodField()
-    total_tasks_count = serializers.SerializerMethodField()
+    blockers_count = serializers.IntegerField(read_only=True)
+    chain_depth = serializers.IntegerField(read_only=True)
+
+    class Meta(TaskSummarySerializer.Meta):
+        fields = TaskSummarySerializer.Meta.fields + (
+            "employee", "blockers_count", "chain_depth"
+        )
+
+
+class TaskAssignmentSerializer(serializers.Serializer):
+    """
+    Строка плана распределения важных задач.
+    reason: owner - сотрудник ведет зависящую задачу,
+    least_loaded - наименее загруженный сотрудник.
+    """
+
+    task_id = serializers.IntegerField()
+    title = serializers.CharField()
+    deadline = serializers.DateTimeField(format="%d.%m.%Y %H:%M")
+    employee_id = serializers.IntegerField()
+    employee_name = serializers.CharField()
+    employee_load = serializers.IntegerField()
+    reason = serializers.CharField()
+
+
+class EmployeeCandidateSerializer(serializers.ModelSerializer):
+    """
+    Сотрудник-кандидат для важных задач.
+    Ожидает предзагруженные task_summaries.
+    """
+
+    total_tasks_count = serializers.IntegerField(
+        source="total_tasks", read_only=True
+    )
+    active_tasks_count = serializers.IntegerField(
+        source="active_tasks", read_only=True
+    )
+    list_tasks = TaskSummarySerializer(
+        source="task_summaries",
+        many=True,
+        read_only=True
+    )
+
+    class Meta:
+        model = Employee
+        fields = (
+            "id",
+            "name",
+            "position",
+            "department",
+            "active_tasks_count",
+            "total_tasks_count",
+            "list_tasks",
+        )
+
+
+class EmployeeActiveTaskSerializer(SparseFieldsMixin,
+                                   serializers.ModelSerializer):
+    """
+    Список сотрудников с активными задачами.
+    Ожидает queryset из EmployeeTaskListAPIView:
+    задачи в работе предзагружены в active_tasks_prefetched.
+    """
+    active_tasks_count = serializers.IntegerField(
+        source="active_tasks", read_only=True
+    )
+    total_tasks_count = serializers.IntegerField(
+        source="total_tasks", read_only=True
+    )
+    active_tasks_list = TaskShortListSerializer(
+        source="active_tasks_prefetched",
+        many=True,
+        read_only=True
+    )
 
     class Meta:
         model = Employee
@@ -132,17 +402,14 @@ class EmployeeActiveTaskSerializer(serializers.ModelSerializer):
             "active_tasks_list",
         )
 
-    def get_active_tasks_count(self, obj):
-        """Задачи в работе."""
-        return obj.task.filter(status=Task.STATUS_IN_PROGRESS).count()
 
-    def get_total_tasks_count(self, obj):
-        """Общие число задач."""
-        return obj.task.count()
+class TombstoneSerializer(serializers.ModelSerializer):
+    """Удаленный объект ленты изменений: модель, id и время удаления."""
+
+    type = serializers.CharField(source="model_name")
+    id = serializers.IntegerField(source="object_id")
 
-    def get_active_tasks_list(self, obj):
-        """Список задач в работе."""
-        data = obj.task.filter(status=Task.STATUS_IN_PROGRESS)
-        new_data = TaskShortListSerializer(data=data, many=True)
-        new_data.is_valid()
-        return new_data.data
+    class Meta:
+        model = Tombstone
+        fields = ("type", "id", "deleted_at")
+        list_serializer_class = FastListSerializer
@@ -0,0 +1,336 @@
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    Exists,
+    F,
+    IntegerField,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from rest_framework.serializers import ValidationError
+from tracker.cache import bump_generation
+from tracker.dependencies import (
+    check_dependency_chain,
+    get_ancestor_edges,
+    refresh_task_closure,
+)
+from tracker.models import Employee, Task
+from tracker.serializers import TaskBulkItemSerializer
+from tracker.validators import validate_employee_to_overdue
+
+
+def task_count_subquery(**filters):
+    """
+    Подзапрос с числом задач сотрудника.
+    В отличие от Count("task") не размножает строки при других join'ах.
+    """
+    tasks = Task.objects.filter(
+        employee=OuterRef("pk"), **filters
+    ).order_by().values("employee").annotate(
+        count=Count("pk")
+    ).values("count")
+    return Coalesce(Subquery(tasks), 0)
+
+
+def get_important_tasks():
+    """
+    Задачи не взяты в работу,
+    но от которых зависят другие задачи, взятые в работу.
+    """
+    return Task.objects.filter(
+        employee=None,
+        related_task__employee__isnull=False,
+        priority="high"
+    ).order_by("deadline", "id")
+
+
+def get_candidate_employees():
+    """
+    Сотрудники, которые могут взять важную задачу в работу:
+    1. Сотрудники с наименьшей загрузкой;
+    2. Или сотрудник с родительской задачей и с разницей задач не более 2.
+    Загрузка берется из счетчика total_tasks, минимальная загрузка
+    считается подзапросом в том же запросе.
+    """
+    min_tasks_count = Employee.objects.order_by(
+        "total_tasks"
+    ).values("total_tasks")[:1]
+    has_related_task = Exists(
+        Task.objects.filter(
+            employee=OuterRef("pk"),
+            related_task__isnull=False
+        )
+    )
+    return Employee.objects.annotate(
+        min_tasks_count=Subquery(min_tasks_count),
+    ).filter(
+        # Условие 1.:
+        Q(total_tasks=F("min_tasks_count"))
+        |
+        # Условие 2.:
+        Q(
+            has_related_task,
+            total_tasks__lte=F("min_tasks_count") + 2,
+        )
+    ).order_by("total_tasks", "id")
+
+
+def get_workload_state(task):
+    """(сотрудник, статус) задачи для счетчиков загрузки."""
+    return task.employee_id, task.status
+
+
+def apply_workload_deltas(changes, using=None):
+    """
+    Изменение счетчиков total_tasks/active_tasks на разницу состояний
+    задач одним UPDATE вида F("total_tasks") + delta.
+    changes - пары (состояние до, состояние после), состояние -
+    (сотрудник, статус) или None для новой или удаленной задачи.
+    В отличие от пересчета подзапросом, инкремент читает счетчик
+    из заблокированной строки, поэтому параллельные транзакции
+    не теряют изменения друг друга.
+    Возвращает число обновленных сотрудников.
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    for before, after in changes:
+        for state, sign in ((before, -1), (after, 1)):
+            if state is None or state[0] is None:
+                continue
+            employee_id, status = state
+            deltas[employee_id][0] += sign
+            if status == Task.STATUS_IN_PROGRESS:
+                deltas[employee_id][1] += sign
+    deltas = {pk: delta for pk, delta in sorted(deltas.items()) if any(delta)}
+    if not deltas:
+        return 0
+
+    def delta_case(index):
+        return Case(
+            *(When(pk=pk, then=Value(delta[index]))
+              for pk, delta in deltas.items()),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+
+    return Employee.objects.using(using).filter(pk__in=deltas).update(
+        total_tasks=F("total_tasks") + delta_case(0),
+        active_tasks=F("active_tasks") + delta_case(1),
+    )
+
+
+def refresh_workload_counters(employee_ids=None, using=None):
+    """
+    Пересчет счетчиков total_tasks/active_tasks одним UPDATE
+    для указанных сотрудников (или для всех, если не указаны):
+    исправление расхождений и загрузка данных пакетом.
+    Строки сотрудников сначала блокируются (SELECT ... FOR UPDATE):
+    подзапросы UPDATE тогда видят задачи транзакций, закоммиченных
+    до получения блокировки.
+    Возвращает число обновленных сотрудников.
+    """
+    employees = Employee.objects.using(using)
+    if employee_ids is not None:
+        employee_ids = {pk for pk in employee_ids if pk is not None}
+        if not employee_ids:
+            return 0
+        employees = employees.filter(pk__in=employee_ids)
+    with transaction.atomic(using=using):
+        list(employees.order_by("pk").select_for_update().values_list(
+            "pk", flat=True
+        ))
+        return employees.update(
+            total_tasks=task_count_subquery(),
+            active_tasks=task_count_subquery(status=Task.STATUS_IN_PROGRESS),
+        )
+
+
+def task_summaries_prefetch():
+    """Краткая сводка задач сотрудника в атрибут task_summaries."""
+    task_summaries = Task.objects.only(
+        "id", "title", "deadline", "status", "priority", "employee"
+    ).order_by("deadline", "id")
+    return Prefetch(
+        "task", queryset=task_summaries, to_attr="task_summaries"
+    )
+
+
+def save_task_batch(rows):
+    """
+    Пакетное создание и обновление задач.
+    Строки с id обновляют задачу (частично), без id - создают новую.
+    Связи всех строк проверяются двумя запросами, запись идет через
+    bulk_create/bulk_update в одной транзакции, там же меняются
+    счетчики сотрудников и пересчитывается таблица зависимостей.
+    Возвращает (задачи, ошибки по строкам); при ошибках ничего не пишется.
+    """
+    serializers = [
+        TaskBulkItemSerializer(
+            data=row,
+            partial=isinstance(row, dict) and "id" in row
+        )
+        for row in rows
+    ]
+    errors = [
+        {} if serializer.is_valid() else dict(serializer.errors)
+        for serializer in serializers
+    ]
+    valid_rows = [
+        (index, serializer.validated_data)
+        for index, serializer in enumerate(serializers)
+        if not errors[index]
+    ]
+    task_ids = set()
+    employee_ids = set()
+    for _, data in valid_rows:
+        task_ids.update(
+            data[field] for field in ("id", "related_task")
+            if data.get(field) is not None
+        )
+        if data.get("employee") is not None:
+            employee_ids.add(data["employee"])
+    tasks = Task.objects.in_bulk(task_ids)
+    employees = Employee.objects.in_bulk(employee_ids)
+
+    saved, created, updated, linked = [], [], [], []
+    update_fields, seen_ids = set(), set()
+    for index, data in valid_rows:
+        data = dict(data)
+        task_id = data.pop("id", None)
+        row_errors = errors[index]
+        if task_id is not None and task_id not in tasks:
+            row_errors["id"] = ["Задача не найдена."]
+        elif task_id in seen_ids:
+            row_errors["id"] = ["Задача повторяется в пакете."]
+        related_id = data.get("related_task")
+        if related_id is not None and related_id not in tasks:
+            row_errors["related_task"] = ["Связанная задача не найдена."]
+        elif related_id is not None and related_id == task_id:
+            row_errors["related_task"] = ["Задача не может зависеть от себя."]
+        employee_id = data.get("employee")
+        if employee_id is not None and employee_id not in employees:
+            row_errors["employee"] = ["Сотрудник не найден."]
+        if row_errors:
+            continue
+
+        task = tasks[task_id] if task_id is not None else Task()
+        if task_id is not None and employee_id:
+            try:
+                validate_employee_to_overdue(task)
+            except ValidationError as error:
+                row_errors["employee"] = error.detail
+                continue
+        for field, value in data.items():
+            if field == "employee":
+                task.employee = employees.get(value)
+            elif field == "related_task":
+                task.related_task = tasks.get(value)
+            else:
+                setattr(task, field, value)
+        task.apply_status_rules()
+        saved.append(task)
+        if task_id is not None or task.related_task_id is not None:
+            linked.append((index, task))
+        if task_id is None:
+            created.append(task)
+        else:
+            seen_ids.add(task_id)
+            updated.append(task)
+            update_fields.update(data)
+
+    check_batch_dependencies(linked, errors)
+    if any(errors):
+        return [], errors
+    with transaction.atomic():
+        Task.objects.bulk_create(created)
+        if updated:
+            now = timezone.now()
+            for task in updated:
+                task.updated_at = now
+            update_fields.update(("status", "updated_at"))
+            Task.objects.bulk_update(updated, sorted(update_fields))
+        apply_workload_deltas(
+            [(None, get_workload_state(task)) for task in created]
+            + [(task._loaded_workload, get_workload_state(task))
+               for task in updated]
+        )
+        moved = [
+            task.pk for task in updated
+            if task._loaded_related_task_id != task.related_task_id
+        ]
+        linked_ids = moved + [
+            task.pk for task in created if task.related_task_id is not None
+        ]
+        if linked_ids:
+            refresh_task_closure(linked_ids, include_descendants=bool(moved))
+    bump_generation("task")
+    return saved, errors
+
+
+def check_batch_dependencies(linked, errors):
+    """
+    Проверка цепочек зависимостей пакета одним рекурсивным запросом.
+    Новые связи пакета накладываются на связи из БД, поэтому циклы
+    между строками одного пакета тоже находятся.
+    linked - список (номер строки, задача): обновляемые задачи
+    и новые задачи с заданной related_task.
+    """
+    related_ids = {
+        task.related_task_id for _, task in linked
+        if task.related_task_id is not None
+    }
+    if not related_ids:
+        return
+    edges = get_ancestor_edges(related_ids)
+    edges.update(
+        (task.pk, task.related_task_id) for _, task in linked if task.pk
+    )
+    for index, task in linked:
+        if task.related_task_id is None:
+            continue
+        error = check_dependency_chain(edges, task.pk, task.related_task_id)
+        if error:
+            errors[index]["related_task"] = [error]
+
+
+def mark_overdue_tasks(chunk_size=1000, now=None):
+    """
+    Переводит в 'overdue' все просроченные незавершенные задачи.
+    Обновление идет пачками по chunk_size строк, каждая пачка - один
+    UPDATE по выбранным id и изменение счетчиков ее сотрудников
+    в своей транзакции, поэтому блокировки держатся недолго.
+    updated_at ставится на момент пачки: пачка, закоммиченная позже
+    начала обхода, не оказывается позади курсоров ленты changes/.
+    Возвращает число обновленных задач.
+    """
+    now = now or timezone.now()
+    expired = Task.objects.filter(deadline__lt=now).exclude(
+        status__in=(Task.STATUS_FINISHED, Task.STATUS_OVERDUE)
+    )
+    total = 0
+    while True:
+        with transaction.atomic():
+            chunk = list(
+                expired.order_by().select_for_update().values_list(
+                    "pk", "employee_id", "status"
+                )[:chunk_size]
+            )
+            updated = Task.objects.filter(
+                pk__in=[pk for pk, _, _ in chunk]
+            ).update(status=Task.STATUS_OVERDUE, updated_at=timezone.now())
+            apply_workload_deltas(
+                ((employee_id, status), (employee_id, Task.STATUS_OVERDUE))
+                for _, employee_id, status in chunk
+            )
+        total += updated
+        if len(chunk) < chunk_size:
+            if total:
+                bump_generation("task")
+            return total
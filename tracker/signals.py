@@ -0,0 +1,105 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from tracker.cache import bump_generation
+from tracker.dependencies import refresh_task_closure
+from tracker.models import Employee, Task, TaskClosure, Tombstone
+from tracker.services import apply_workload_deltas, get_workload_state
+
+
+# Обработчик подключается раньше update_workload_on_save:
+# тот запоминает новое состояние задачи (remember_workload_state).
+@receiver(post_save, sender=Task)
+def update_closure_on_save(sender, instance, created, **kwargs):
+    """
+    Пересчет зависимостей задачи при создании со связанной задачей
+    и при смене related_task (вместе с задачами, от которых она зависит).
+    """
+    if created:
+        if instance.related_task_id is not None:
+            refresh_task_closure(
+                [instance.pk], include_descendants=False,
+                using=kwargs["using"]
+            )
+    elif (getattr(instance, "_loaded_related_task_id", None)
+            != instance.related_task_id):
+        refresh_task_closure([instance.pk], using=kwargs["using"])
+
+
+@receiver(post_save, sender=Task)
+def update_workload_on_save(sender, instance, created, **kwargs):
+    """
+    Счетчики старого и нового сотрудника задачи меняются на разницу
+    состояний (сотрудник, статус) до и после сохранения
+    (состояние до - из Task.load_workload_state).
+    """
+    before = None if created else getattr(instance, "_loaded_workload", None)
+    apply_workload_deltas(
+        [(before, get_workload_state(instance))], using=kwargs["using"]
+    )
+    instance.remember_workload_state()
+
+
+@receiver(post_delete, sender=Task)
+def update_workload_on_delete(sender, instance, **kwargs):
+    apply_workload_deltas(
+        [(getattr(instance, "_loaded_workload", None), None)],
+        using=kwargs["using"]
+    )
+
+
+@receiver(pre_delete, sender=Task)
+def remember_closure_on_delete(sender, instance, **kwargs):
+    """
+    Задачи, от которых зависит удаляемая: после SET_NULL у них
+    пропадают зависимые задачи выше по цепочке. Там же запоминается
+    сотрудник и статус для счетчиков.
+    """
+    instance.load_workload_state(kwargs["using"])
+    instance._closure_descendant_ids = list(
+        TaskClosure.objects.using(kwargs["using"]).filter(
+            ancestor=instance
+        ).values_list("descendant_id", flat=True)
+    )
+
+
+@receiver(post_delete, sender=Task)
+def update_closure_on_delete(sender, instance, **kwargs):
+    refresh_task_closure(
+        getattr(instance, "_closure_descendant_ids", []),
+        include_descendants=False,
+        using=kwargs["using"]
+    )
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_task_cache(sender, **kwargs):
+    bump_generation("task")
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def invalidate_employee_cache(sender, **kwargs):
+    bump_generation("employee")
+
+
+@receiver(pre_delete, sender=Task)
+@receiver(pre_delete, sender=Employee)
+def touch_related_tasks_on_delete(sender, instance, **kwargs):
+    """
+    Задачи, у которых удаление обнулит связь (SET_NULL без save()),
+    получают новое updated_at и попадают в ленту изменений.
+    """
+    field = "related_task" if sender is Task else "employee"
+    Task.objects.using(kwargs["using"]).filter(
+        **{field: instance}
+    ).update(updated_at=timezone.now())
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Employee)
+def record_tombstone(sender, instance, **kwargs):
+    Tombstone.objects.using(kwargs["using"]).create(
+        model_name=sender._meta.model_name, object_id=instance.pk
+    )
@@ -1,9 +1,39 @@
+import csv
+import json
+import time
 from datetime import timedelta
-from django.urls import reverse
+from io import StringIO
+from unittest import mock, skipUnless
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
 from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import ListSerializer
 from rest_framework.test import APITestCase
-from rest_framework import status
-from tracker.models import Employee, Task
+from rest_framework import serializers, status
+from tracker import urls as tracker_urls
+from tracker.assignment import solve_assignment
+from tracker.benchmarks import (
+    compare_with_baseline,
+    measure_concurrency,
+    measure_serialization,
+    run_benchmark,
+)
+from tracker.dependencies import get_dependency_graph
+from tracker.imports import FixtureImporter, iter_json_objects
+from tracker.middleware import ReplicaRoutingMiddleware, get_route_metrics
+from tracker.models import Employee, Task, TaskClosure, Tombstone
+from tracker.renderers import FastJSONRenderer
+from tracker.routers import REPLICA_DB_ALIAS, ReplicaRouter, read_alias
+from tracker.serializers import FastListSerializer, TaskSerializer
+from tracker.services import mark_overdue_tasks
 
 
 class EmployeeTestCase(APITestCase):
@@ -249,3 +279,1755 @@ class TaskTestCase(APITestCase):
         self.assertEqual(
             response.status_code, status.HTTP_400_BAD_REQUEST
         )
+
+
+class EmployeeBusyTestCase(APITestCase):
+    """ Тест эндпоинта занятых сотрудников. """
+
+    def create_employees(self, count):
+        """ Создание сотрудников с задачами в работе и завершенными. """
+        deadline = timezone.now() + timedelta(days=1)
+        for number in range(count):
+            employee = Employee.objects.create(
+                name=f'Сотрудник {number}',
+                position='Разработчик',
+                department='IT'
+            )
+            for status_task in (Task.STATUS_IN_PROGRESS,
+                                Task.STATUS_IN_PROGRESS,
+                                Task.STATUS_FINISHED):
+                Task.objects.create(
+                    title=f'Task {number}',
+                    description='This is a test task',
+                    deadline=deadline,
+                    employee=employee,
+                    status=status_task,
+                )
+
+    def test_employee_busy_list(self):
+        """ Тест вывода счетчиков и списка активных задач. """
+        self.create_employees(2)
+        url = reverse('tracker:employees_task_busy')
+        response = self.client.get(url)
+        data = response.json()
+        self.assertEqual(
+            response.status_code, status.HTTP_200_OK
+        )
+        self.assertEqual(len(data), 2)
+        self.assertEqual(data[0]['total_tasks_count'], 3)
+        self.assertEqual(data[0]['active_tasks_count'], 2)
+        self.assertEqual(len(data[0]['active_tasks_list']), 2)
+        self.assertEqual(
+            data[0]['active_tasks_list'][0]['status'],
+            Task.STATUS_IN_PROGRESS
+        )
+
+    def test_employee_busy_num_queries(self):
+        """ Число запросов не зависит от количества сотрудников. """
+        url = reverse('tracker:employees_task_busy')
+        self.create_employees(2)
+        with self.assertNumQueries(4):
+            self.client.get(url)
+        self.create_employees(10)
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertEqual(len(response.json()), 12)
+
+
+class ImportantTaskTestCase(APITestCase):
+    """ Тест эндпоинта важных задач и сотрудников-кандидатов. """
+
+    def setUp(self):
+        self.deadline = timezone.now() + timedelta(days=1)
+        self.busy_employee = Employee.objects.create(
+            name='Иван Иванов',
+            position='Разработчик',
+            department='IT'
+        )
+        self.free_employee = Employee.objects.create(
+            name='Петр Петров',
+            position='Разработчик',
+            department='IT'
+        )
+        self.parent_task = Task.objects.create(
+            title='Parent task',
+            description='This is a parent task',
+            deadline=self.deadline,
+            employee=self.busy_employee,
+        )
+        self.url = reverse('tracker:employees_available_list')
+
+    def create_important_tasks(self, count):
+        """ Создание задач без сотрудника, от которых зависит задача. """
+        for number in range(count):
+            Task.objects.create(
+                title=f'Important task {number}',
+                description='This is an important task',
+                deadline=self.deadline,
+                related_task=self.parent_task,
+                priority='high',
+            )
+
+    def test_important_tasks(self):
+        """ Тест вывода важных задач с полным списком кандидатов. """
+        self.create_important_tasks(2)
+        response = self.client.get(self.url)
+        data = response.json()
+        self.assertEqual(
+            response.status_code, status.HTTP_200_OK
+        )
+        self.assertEqual(len(data), 2)
+        self.assertEqual(
+            [employee['id'] for employee in data[0]['Employees']],
+            [self.free_employee.pk]
+        )
+        self.assertEqual(data[0]['Employees'][0]['total_tasks_count'], 0)
+
+    def test_important_tasks_compact(self):
+        """ Тест компактного режима: кандидаты выводятся один раз. """
+        self.create_important_tasks(2)
+        response = self.client.get(self.url, {'mode': 'compact'})
+        data = response.json()
+        self.assertEqual(
+            response.status_code, status.HTTP_200_OK
+        )
+        self.assertEqual(
+            [employee['id'] for employee in data['employees']],
+            [self.free_employee.pk]
+        )
+        self.assertEqual(len(data['tasks']), 2)
+        self.assertEqual(
+            data['tasks'][0]['Employees'], [self.free_employee.pk]
+        )
+
+    def test_important_tasks_num_queries(self):
+        """ Число запросов и размер ответа ограничены. """
+        self.create_important_tasks(2)
+        with self.assertNumQueries(5):
+            self.client.get(self.url)
+        with self.assertNumQueries(5):
+            self.client.get(self.url, {'mode': 'compact'})
+        self.create_important_tasks(20)
+        for number in range(10):
+            Employee.objects.create(
+                name=f'Сотрудник {number}',
+                position='Аналитик',
+                department='IT'
+            )
+        with self.assertNumQueries(5):
+            full = self.client.get(self.url)
+        with self.assertNumQueries(5):
+            compact = self.client.get(self.url, {'mode': 'compact'})
+        self.assertEqual(len(compact.json()['employees']), 11)
+        self.assertLess(
+            len(compact.content) * 5, len(full.content)
+        )
+
+
+class TaskBulkTestCase(APITestCase):
+    """ Тест пакетного создания и обновления задач. """
+
+    def setUp(self):
+        self.deadline = timezone.now() + timedelta(days=1)
+        self.employee = Employee.objects.create(
+            name='Иван Иванов',
+            position='Разработчик',
+            department='IT'
+        )
+        self.task = Task.objects.create(
+            title='Task one',
+            description='This is a test task',
+            deadline=self.deadline,
+        )
+        self.url = reverse('tracker:task-bulk')
+
+    def make_rows(self, count):
+        """ Строки для создания задач. """
+        return [
+            {
+                'title': f'Task {number}',
+                'description': 'This is a bulk task',
+                'deadline': self.deadline.strftime('%d.%m.%Y %H:%M'),
+                'related_task': self.task.pk,
+                'employee': self.employee.pk if number % 2 else None,
+            }
+            for number in range(count)
+        ]
+
+    def test_bulk_create_and_assign(self):
+        """ Тест создания задач и назначения сотрудника одним пакетом. """
+        rows = self.make_rows(2) + [
+            {'id': self.task.pk, 'employee': self.employee.pk},
+        ]
+        response = self.client.post(self.url, data=rows, format='json')
+        data = response.json()
+        self.assertEqual(
+            response.status_code, status.HTTP_201_CREATED
+        )
+        self.assertEqual(len(data), 3)
+        self.assertEqual(Task.objects.all().count(), 3)
+        self.assertEqual(data[0]['status'], Task.STATUS_CREATED)
+        self.assertEqual(data[1]['status'], Task.STATUS_IN_PROGRESS)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.employee, self.employee)
+        self.assertEqual(self.task.status, Task.STATUS_IN_PROGRESS)
+
+    def test_bulk_errors_per_row(self):
+        """ Тест ошибок по строкам: при ошибке ничего не сохраняется. """
+        rows = self.make_rows(3)
+        rows[1]['status'] = Task.STATUS_OVERDUE
+        rows[2]['employee'] = self.employee.pk + 100
+        response = self.client.post(self.url, data=rows, format='json')
+        data = response.json()
+        self.assertEqual(
+            response.status_code, status.HTTP_400_BAD_REQUEST
+        )
+        self.assertEqual(data[0], {})
+        self.assertIn('non_field_errors', data[1])
+        self.assertIn('employee', data[2])
+        self.assertEqual(Task.objects.all().count(), 1)
+
+    def test_bulk_num_queries(self):
+        """ Число запросов не зависит от размера пакета. """
+        rows = self.make_rows(2) + [{'id': self.task.pk, 'title': 'New'}]
+        with self.assertNumQueries(10):
+            self.client.post(self.url, data=rows, format='json')
+        rows = self.make_rows(50) + [{'id': self.task.pk, 'title': 'New'}]
+        with self.assertNumQueries(10):
+            self.client.post(self.url, data=rows, format='json')
+        self.assertEqual(Task.objects.all().count(), 53)
+
+    def test_bulk_cycle(self):
+        """ Тест цикла зависимостей между строками одного пакета. """
+        other = Task.objects.create(
+            title='Task two',
+            description='This is a test task',
+            deadline=self.deadline,
+        )
+        rows = [
+            {'id': self.task.pk, 'related_task': other.pk},
+            {'id': other.pk, 'related_task': self.task.pk},
+        ]
+        response = self.client.post(self.url, data=rows, format='json')
+        self.assertEqual(
+            response.status_code, status.HTTP_400_BAD_REQUEST
+        )
+        self.assertIn('related_task', response.json()[0])
+        self.task.refresh_from_db()
+        self.assertIsNone(self.task.related_task)
+
+
+class DependencyGraphTestCase(APITestCase):
+    """ Тест графа зависимостей задач. """
+
+    def setUp(self):
+        """
+        Цепочка: root зависит от middle, middle - от leaf и done.
+        """
+        deadline = timezone.now() + timedelta(days=1)
+        self.root = self.create_task('Root', None, deadline)
+        self.middle = self.create_task('Middle', self.root, deadline)
+        self.leaf = self.create_task('Leaf', self.middle, deadline)
+        self.done = self.create_task(
+            'Done', self.middle, deadline, Task.STATUS_FINISHED
+        )
+
+    def create_task(self, title, related_task, deadline,
+                    status_task=Task.STATUS_CREATED):
+        return Task.objects.create(
+            title=title,
+            description='This is a test task',
+            deadline=deadline,
+            related_task=related_task,
+            status=status_task,
+        )
+
+    def test_graph(self):
+        """ Тест графа одним запросом и критического пути. """
+        url = reverse('tracker:task-graph', args=(self.middle.pk,))
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        data = response.json()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(data['task']['id'], self.middle.pk)
+        self.assertEqual(
+            [task['id'] for task in data['dependents']], [self.root.pk]
+        )
+        self.assertEqual(
+            [task['id'] for task in data['dependencies']],
+            [self.leaf.pk, self.done.pk]
+        )
+        self.assertEqual(data['critical_path'], [self.leaf.pk])
+        self.assertTrue(data['blocked'])
+        self.assertFalse(data['truncated'])
+
+    def test_graph_limits(self):
+        """ Тест ограничения глубины и числа узлов. """
+        url = reverse('tracker:task-graph', args=(self.root.pk,))
+        data = self.client.get(url, {'depth': 1}).json()
+        self.assertEqual(
+            [task['id'] for task in data['dependencies']], [self.middle.pk]
+        )
+        self.assertEqual(data['critical_path'], [self.middle.pk])
+        data = self.client.get(url, {'limit': 2}).json()
+        self.assertTrue(data['truncated'])
+        response = self.client.get(
+            reverse('tracker:task-graph', args=(self.root.pk + 100,))
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @skipUnless(connection.vendor == 'sqlite', 'счетчик шагов SQLite')
+    def test_graph_wide_tree(self):
+        """
+        Широкое дерево: работа запроса ограничена числом узлов,
+        а не размером дерева.
+        """
+        def create_children(parent, count):
+            return Task.objects.bulk_create(
+                Task(title=f'Child {number}', description='Test',
+                     deadline=self.leaf.deadline, related_task=parent)
+                for number in range(count)
+            )
+
+        def count_steps(task):
+            steps = [0]
+
+            def progress():
+                steps[0] += 1
+                return 0
+
+            connection.connection.set_progress_handler(progress, 100)
+            try:
+                data = get_dependency_graph(task.pk, max_nodes=5)
+            finally:
+                connection.connection.set_progress_handler(None, 100)
+            self.assertTrue(data['truncated'])
+            self.assertEqual(len(data['dependencies']), 4)
+            return steps[0]
+
+        narrow = self.create_task('Narrow', None, self.leaf.deadline)
+        create_children(narrow, 6)
+        wide = self.create_task('Wide', None, self.leaf.deadline)
+        for child in create_children(wide, 200)[:3]:
+            create_children(child, 200)
+        self.assertLess(count_steps(wide), count_steps(narrow) * 3)
+
+    def test_blocked(self):
+        """ Тест отчета по заблокированным задачам. """
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('tracker:task-blocked'))
+        data = response.json()
+        self.assertEqual(
+            [task['id'] for task in data], [self.root.pk, self.middle.pk]
+        )
+        self.assertEqual(data[0]['blockers_count'], 2)
+        self.assertEqual(data[0]['chain_depth'], 2)
+        self.assertEqual(data[1]['blockers_count'], 1)
+
+    def test_cycle_validation(self):
+        """ Тест запрета цикла зависимостей при обновлении задачи. """
+        url = reverse('tracker:task-detail', args=(self.root.pk,))
+        response = self.client.patch(
+            url, data={'related_task': self.leaf.pk}, format='json'
+        )
+        self.assertEqual(
+            response.status_code, status.HTTP_400_BAD_REQUEST
+        )
+        self.assertIn('related_task', response.json())
+        with self.settings(TASK_DEPENDENCY_MAX_DEPTH=2):
+            response = self.client.patch(
+                reverse('tracker:task-detail', args=(self.done.pk,)),
+                data={'related_task': self.leaf.pk}, format='json'
+            )
+        self.assertEqual(
+            response.status_code, status.HTTP_400_BAD_REQUEST
+        )
+
+
+class TaskClosureTestCase(APITestCase):
+    """ Тест таблицы транзитивных зависимостей задач. """
+
+    def setUp(self):
+        """ Цепочка: root зависит от middle, middle - от leaf. """
+        self.deadline = timezone.now() + timedelta(days=1)
+        self.root = self.create_task('Root')
+        self.middle = self.create_task('Middle', self.root)
+        self.leaf = self.create_task('Leaf', self.middle)
+        self.other = self.create_task('Other')
+
+    def create_task(self, title, related_task=None):
+        return Task.objects.create(
+            title=title,
+            description='This is a test task',
+            deadline=self.deadline,
+            related_task=related_task,
+        )
+
+    def closure(self):
+        return set(TaskClosure.objects.values_list(
+            'ancestor_id', 'descendant_id', 'depth'
+        ))
+
+    def expected_closure(self):
+        """ Замыкание, построенное заново по related_task. """
+        call_command('rebuild_task_closure', stdout=StringIO())
+        return self.closure()
+
+    def test_closure_maintenance(self):
+        """ Тест пересчета при создании, смене связи и удалении. """
+        self.assertEqual(self.closure(), {
+            (self.root.pk, self.middle.pk, 1),
+            (self.middle.pk, self.leaf.pk, 1),
+            (self.root.pk, self.leaf.pk, 2),
+        })
+        self.middle.related_task = self.other
+        self.middle.save()
+        closure = self.closure()
+        self.assertIn((self.other.pk, self.leaf.pk, 2), closure)
+        self.assertEqual(closure, self.expected_closure())
+        self.middle.delete()
+        self.assertEqual(self.closure(), set())
+
+    def test_closure_bulk(self):
+        """ Тест пересчета при пакетной записи задач. """
+        rows = [
+            {'id': self.middle.pk, 'related_task': self.other.pk},
+            {
+                'title': 'New',
+                'description': 'This is a bulk task',
+                'deadline': self.deadline.strftime('%d.%m.%Y %H:%M'),
+                'related_task': self.leaf.pk,
+            },
+        ]
+        response = self.client.post(
+            reverse('tracker:task-bulk'), data=rows, format='json'
+        )
+        self.assertEqual(
+            response.status_code, status.HTTP_201_CREATED
+        )
+        closure = self.closure()
+        self.assertIn((self.other.pk, response.json()[1]['id'], 3), closure)
+        self.assertEqual(closure, self.expected_closure())
+
+    def test_dependency_filters(self):
+        """ Тест фильтров ?depends_on= и ?blocked_by=. """
+        url = reverse('tracker:tasks_list')
+        response = self.client.get(url, {'depends_on': self.leaf.pk})
+        self.assertEqual(
+            [task['id'] for task in response.json()['results']],
+            [self.root.pk, self.middle.pk]
+        )
+        self.middle.status = Task.STATUS_FINISHED
+        self.middle.save()
+        response = self.client.get(url, {'blocked_by': self.leaf.pk})
+        self.assertEqual(
+            [task['id'] for task in response.json()['results']],
+            [self.root.pk]
+        )
+        response = self.client.get(url, {'blocked_by': 'x'})
+        self.assertEqual(
+            response.status_code, status.HTTP_400_BAD_REQUEST
+        )
+
+
+class TaskAssignmentTestCase(APITestCase):
+    """ Тест распределения важных задач по сотрудникам. """
+
+    def setUp(self):
+        """
+        busy ведет задачу, зависящую от важной задачи owned;
+        free свободен; important - вторая важная задача.
+        """
+        self.deadline = timezone.now() + timedelta(days=1)
+        self.busy = Employee.objects.create(
+            name='Занятой', position='Разработчик', department='IT'
+        )
+        self.free = Employee.objects.create(
+            name='Свободный', position='Разработчик', department='IT'
+        )
+        parent = self.create_task('Parent', employee=self.busy)
+        self.create_task('Second', employee=self.busy)
+        self.owned = self.create_task(
+            'Owned', related_task=parent, priority='high',
+            deadline=self.deadline + timedelta(hours=1)
+        )
+        self.important = self.create_task(
+            'Important', related_task=parent, priority='high'
+        )
+
+    def create_task(self, title, deadline=None, **kwargs):
+        return Task.objects.create(
+            title=title,
+            description='This is a test task',
+            deadline=deadline or self.deadline,
+            **kwargs
+        )
+
+    def test_assignment_preview(self):
+        """ Тест плана: срочная задача - свободному, затем владельцу. """
+        url = reverse('tracker:task-assignment')
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        data = response.json()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(row['task_id'], row['employee_id'], row['reason'])
+             for row in data],
+            [
+                (self.important.pk, self.busy.pk, 'owner'),
+                (self.owned.pk, self.free.pk, 'least_loaded'),
+            ]
+        )
+        self.important.refresh_from_db()
+        self.assertIsNone(self.important.employee)
+
+    def test_assignment_apply(self):
+        """ Тест назначения сотрудников по плану. """
+        response = self.client.post(reverse('tracker:task-assignment'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.important.refresh_from_db()
+        self.assertEqual(self.important.employee, self.busy)
+        self.assertEqual(self.important.status, Task.STATUS_IN_PROGRESS)
+        self.busy.refresh_from_db()
+        self.assertEqual(self.busy.active_tasks, 3)
+        self.assertEqual(self.client.get(
+            reverse('tracker:task-assignment')
+        ).json(), [])
+
+    def test_assignment_scale(self):
+        """ Тест распределения тысяч задач по сотням сотрудников. """
+        deadline = timezone.now()
+        employees = {
+            pk: {'id': pk, 'name': f'Сотрудник {pk}', 'active_tasks': pk % 7}
+            for pk in range(300)
+        }
+        tasks = [
+            {
+                'id': pk,
+                'title': f'Task {pk}',
+                'deadline': deadline + timedelta(minutes=pk % 97),
+                'related_task__employee_id': pk % 500,
+            }
+            for pk in range(5000)
+        ]
+        with self.assertNumQueries(0):
+            assignments = solve_assignment(tasks, employees)
+        self.assertEqual(
+            [row['task_id'] for row in assignments],
+            [task['id'] for task in sorted(
+                tasks, key=lambda task: (task['deadline'], task['id'])
+            )]
+        )
+        owners = {task['id']: task['related_task__employee_id']
+                  for task in tasks}
+        for row in assignments:
+            if row['reason'] == 'owner':
+                self.assertEqual(row['employee_id'], owners[row['task_id']])
+        loads = {pk: 0 for pk in employees}
+        for row in assignments:
+            loads[row['employee_id']] += 1
+        totals = [
+            loads[pk] + employee['active_tasks']
+            for pk, employee in employees.items()
+        ]
+        self.assertLessEqual(max(totals) - min(totals), 3)
+
+
+class AsyncViewTestCase(APITestCase):
+    """ Тест async-вариантов тяжелых списков. """
+
+    def setUp(self):
+        cache.clear()
+        deadline = timezone.now() + timedelta(days=1)
+        employee = Employee.objects.create(
+            name='Иван Иванов', position='Разработчик', department='IT'
+        )
+        for number in range(7):
+            Task.objects.create(
+                title=f'Task {number}',
+                description='This is a test task',
+                deadline=deadline + timedelta(hours=number),
+                employee=employee if number % 2 else None,
+            )
+        Task.objects.create(
+            title='Important',
+            description='This is a test task',
+            deadline=deadline,
+            related_task=Task.objects.filter(employee=employee).first(),
+            priority='high',
+        )
+
+    def assertSameResponse(self, name, params=None):
+        """ Ответ async-варианта совпадает с sync-версией. """
+        sync_response = self.client.get(reverse(f'tracker:{name}'), params)
+        async_response = self.client.get(
+            reverse(f'tracker:async_{name}'), params
+        )
+        self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            async_response.content.replace(b'/async/', b'/'),
+            sync_response.content
+        )
+        return async_response
+
+    def test_async_task_list(self):
+        """ Тест списка задач: фильтры, страницы и ссылки. """
+        self.assertSameResponse('tasks_list')
+        self.assertSameResponse('tasks_list', {'page': 2})
+        self.assertSameResponse(
+            'tasks_list', {'status': Task.STATUS_IN_PROGRESS}
+        )
+        response = self.client.get(
+            reverse('tracker:async_tasks_list'), {'page': 5}
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(
+            reverse('tracker:async_tasks_list'), {'status': 'unknown'}
+        )
+        self.assertEqual(
+            response.status_code, status.HTTP_400_BAD_REQUEST
+        )
+
+    def test_async_employees(self):
+        """ Тест занятых сотрудников и кандидатов на важные задачи. """
+        self.assertSameResponse('employees_task_busy')
+        response = self.assertSameResponse('employees_available_list')
+        self.assertEqual(len(response.json()), 1)
+        self.assertSameResponse(
+            'employees_available_list', {'mode': 'compact'}
+        )
+
+    def test_async_not_modified(self):
+        """ Тест 304 по ETag. """
+        url = reverse('tracker:async_employees_task_busy')
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(
+            response.status_code, status.HTTP_304_NOT_MODIFIED
+        )
+
+
+class CursorPaginationTestCase(APITestCase):
+    """ Тест курсорной пагинации списков задач и сотрудников. """
+
+    def setUp(self):
+        deadline = timezone.now() + timedelta(days=1)
+        for number in range(7):
+            Task.objects.create(
+                title=f'Task {number}',
+                description='This is a test task',
+                deadline=deadline + timedelta(hours=number // 3),
+            )
+        for department in ('IT', None, 'HR', 'IT', None):
+            Employee.objects.create(
+                name='Иван Иванов',
+                position='Разработчик',
+                department=department
+            )
+
+    def collect_pages(self, url, params):
+        """ Обход всех страниц по ссылке next. """
+        pages = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(
+                response.status_code, status.HTTP_200_OK
+            )
+            data = response.json()
+            self.assertNotIn('count', data)
+            pages.append([row['id'] for row in data['results']])
+            if not data['next']:
+                return pages
+            response = self.client.get(data['next'])
+
+    def test_task_cursor_pages(self):
+        """ Тест стабильного обхода задач с одинаковым дедлайном. """
+        pages = self.collect_pages(
+            reverse('tracker:task-list'),
+            {'pagination': 'cursor', 'page_size': 2}
+        )
+        ids = [pk for page in pages for pk in page]
+        expected = list(
+            Task.objects.order_by('deadline', 'id').values_list(
+                'id', flat=True
+            )
+        )
+        self.assertEqual(len(pages), 4)
+        self.assertEqual(ids, expected)
+
+    def test_employee_cursor_pages(self):
+        """ Тест обхода сотрудников с пустым отделом. """
+        pages = self.collect_pages(
+            reverse('tracker:employee-list'),
+            {'pagination': 'cursor', 'page_size': 2}
+        )
+        ids = [pk for page in pages for pk in page]
+        self.assertEqual(sorted(ids), sorted(
+            Employee.objects.values_list('id', flat=True)
+        ))
+        self.assertEqual(
+            list(Employee.objects.filter(
+                department__isnull=True
+            ).order_by('id').values_list('id', flat=True)),
+            ids[-2:]
+        )
+
+    def test_cursor_range_condition(self):
+        """ Тест условия курсора: начало диапазона индекса без IS NULL. """
+        url = reverse('tracker:task-list')
+        response = self.client.get(
+            url, {'pagination': 'cursor', 'page_size': 2}
+        )
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(response.json()['next'])
+        sql = queries.captured_queries[-1]['sql']
+        self.assertIn('"tracker_task"."deadline" >=', sql)
+        self.assertNotIn('IS NULL', sql)
+
+    def test_cursor_page_size(self):
+        """ Тест увеличенного максимального размера страницы. """
+        url = reverse('tracker:tasks_list')
+        response = self.client.get(url, {'page_size': 50})
+        self.assertEqual(len(response.json()['results']), 7)
+        with self.settings(CURSOR_PAGINATION_MAX_PAGE_SIZE=3):
+            response = self.client.get(
+                url, {'pagination': 'cursor', 'page_size': 50}
+            )
+        self.assertEqual(len(response.json()['results']), 3)
+
+    def test_invalid_cursor(self):
+        """ Тест неверного курсора. """
+        url = reverse('tracker:task_list_empty')
+        response = self.client.get(url, {'cursor': 'invalid'})
+        self.assertEqual(
+            response.status_code, status.HTTP_404_NOT_FOUND
+        )
+
+
+class OverdueSweepTestCase(APITestCase):
+    """ Тест пакетного перевода задач в статус 'overdue'. """
+
+    def setUp(self):
+        past = timezone.now() - timedelta(days=1)
+        future = timezone.now() + timedelta(days=1)
+        for status_task in (Task.STATUS_CREATED,
+                            Task.STATUS_IN_PROGRESS,
+                            Task.STATUS_IN_PROGRESS,
+                            Task.STATUS_FINISHED):
+            Task.objects.create(
+                title='Expired task',
+                description='This is an expired task',
+                deadline=past,
+                status=status_task,
+            )
+        Task.objects.create(
+            title='Future task',
+            description='This is a future task',
+            deadline=future,
+        )
+
+    def test_save_keeps_status(self):
+        """ Сохранение задачи не зависит от текущего времени. """
+        self.assertEqual(
+            Task.objects.filter(status=Task.STATUS_OVERDUE).count(), 0
+        )
+
+    def test_mark_overdue_command(self):
+        """ Тест команды: обновляются только просроченные незавершенные. """
+        out = StringIO()
+        call_command('mark_overdue', chunk_size=2, stdout=out)
+        self.assertIn('Просрочено задач: 3', out.getvalue())
+        self.assertEqual(
+            Task.objects.filter(status=Task.STATUS_OVERDUE).count(), 3
+        )
+        self.assertEqual(
+            Task.objects.filter(status=Task.STATUS_FINISHED).count(), 1
+        )
+        out = StringIO()
+        call_command('mark_overdue', stdout=out)
+        self.assertIn('Просрочено задач: 0', out.getvalue())
+
+
+class WorkloadCountersTestCase(APITestCase):
+    """ Тест счетчиков задач сотрудников. """
+
+    def setUp(self):
+        self.deadline = timezone.now() + timedelta(days=1)
+        self.employee = Employee.objects.create(
+            name='Иван Иванов',
+            position='Разработчик',
+            department='IT'
+        )
+        self.other_employee = Employee.objects.create(
+            name='Петр Петров',
+            position='Разработчик',
+            department='IT'
+        )
+        self.task = Task.objects.create(
+            title='Task one',
+            description='This is a test task',
+            deadline=self.deadline,
+            employee=self.employee,
+        )
+
+    def assertCounters(self, employee, total, active):
+        employee.refresh_from_db()
+        self.assertEqual(
+            (employee.total_tasks, employee.active_tasks), (total, active)
+        )
+
+    def test_counters_on_create_and_delete(self):
+        """ Тест счетчиков при создании и удалении задачи. """
+        self.assertCounters(self.employee, 1, 1)
+        url = reverse('tracker:task-detail', args=(self.task.pk,))
+        self.client.delete(url)
+        self.assertCounters(self.employee, 0, 0)
+
+    def test_counters_on_reassign(self):
+        """ Тест счетчиков при смене сотрудника и статуса. """
+        url = reverse('tracker:task-detail', args=(self.task.pk,))
+        self.client.patch(url, data={'employee': self.other_employee.pk})
+        self.assertCounters(self.employee, 0, 0)
+        self.assertCounters(self.other_employee, 1, 1)
+        self.client.patch(url, data={'status': Task.STATUS_FINISHED})
+        self.assertCounters(self.other_employee, 1, 0)
+
+    def test_counters_on_bulk(self):
+        """ Тест счетчиков при пакетных операциях. """
+        rows = [
+            {'id': self.task.pk, 'employee': self.other_employee.pk},
+            {
+                'title': 'Task two',
+                'description': 'This is a bulk task',
+                'deadline': self.deadline.strftime('%d.%m.%Y %H:%M'),
+                'employee': self.other_employee.pk,
+            },
+        ]
+        self.client.post(
+            reverse('tracker:task-bulk'), data=rows, format='json'
+        )
+        self.assertCounters(self.employee, 0, 0)
+        self.assertCounters(self.other_employee, 2, 2)
+
+    def test_counters_on_overdue_sweep(self):
+        """ Тест счетчиков после перевода задач в 'overdue'. """
+        Task.objects.filter(pk=self.task.pk).update(
+            deadline=timezone.now() - timedelta(days=1)
+        )
+        call_command('mark_overdue', stdout=StringIO())
+        self.assertCounters(self.employee, 1, 0)
+
+    def test_counters_incremented(self):
+        """
+        Счетчики меняются на разницу, а не пересчитываются: изменение
+        параллельной транзакции (здесь - значение в строке) сохраняется.
+        """
+        Employee.objects.filter(pk=self.other_employee.pk).update(
+            total_tasks=10, active_tasks=4
+        )
+        task = Task.objects.get(pk=self.task.pk)
+        task.employee = self.other_employee
+        task.save()
+        self.assertCounters(self.other_employee, 11, 5)
+        self.assertCounters(self.employee, 0, 0)
+        task.delete()
+        self.assertCounters(self.other_employee, 10, 4)
+
+    def test_counters_with_deferred_fields(self):
+        """ Состояние задачи неизвестно (only()): счетчики пересчитываются. """
+        task = Task.objects.only('id', 'title').get(pk=self.task.pk)
+        task.employee = self.other_employee
+        task.save()
+        self.assertCounters(self.employee, 0, 0)
+        self.assertCounters(self.other_employee, 1, 1)
+
+    def test_reconcile_workload(self):
+        """ Тест исправления расхождений счетчиков. """
+        Employee.objects.update(total_tasks=5, active_tasks=5)
+        out = StringIO()
+        call_command('reconcile_workload', stdout=out)
+        self.assertIn('Исправлено сотрудников: 2', out.getvalue())
+        self.assertCounters(self.employee, 1, 1)
+        self.assertCounters(self.other_employee, 0, 0)
+
+
+class ResponseCacheTestCase(APITestCase):
+    """ Тест кэша ответов списков трекера. """
+
+    def setUp(self):
+        cache.clear()
+        self.employee = Employee.objects.create(
+            name='Иван Иванов',
+            position='Разработчик',
+            department='IT'
+        )
+        self.task = Task.objects.create(
+            title='Task one',
+            description='This is a test task',
+            deadline=timezone.now() + timedelta(days=1),
+            employee=self.employee,
+        )
+
+    def test_cache_hit_and_invalidation(self):
+        """ Повторный запрос берется из кэша, запись задачи сбрасывает его. """
+        url = reverse('tracker:tasks_list')
+        response = self.client.get(url, {'page': 1})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'page': 1})
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.json()['count'], 1)
+        self.assertEqual(
+            self.client.get(url, {'page_size': 2})['X-Cache'], 'MISS'
+        )
+        self.task.title = 'Task one updated'
+        self.task.save()
+        response = self.client.get(url, {'page': 1})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(
+            response.json()['results'][0]['title'], 'Task one updated'
+        )
+
+    def test_employee_change_invalidates(self):
+        """ Изменение сотрудника сбрасывает кэш занятых сотрудников. """
+        url = reverse('tracker:employees_task_busy')
+        self.client.get(url)
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+        self.employee.name = 'Иван Петров'
+        self.employee.save()
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()[0]['name'], 'Иван Петров')
+
+    def test_cache_stats(self):
+        """ Тест счетчиков попаданий и промахов. """
+        url = reverse('tracker:employees_available_list')
+        self.client.get(url)
+        self.client.get(url)
+        self.client.get(url)
+        response = self.client.get(reverse('tracker:cache_stats'))
+        self.assertEqual(response.json(), {'hits': 2, 'misses': 1})
+
+    def test_replica_read_not_cached(self):
+        """ Ответ, прочитанный с реплики, не попадает в кэш. """
+        url = reverse('tracker:tasks_list')
+        with mock.patch('tracker.cache.read_alias') as alias:
+            alias.get.return_value = REPLICA_DB_ALIAS
+            self.client.get(url)
+            self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        self.client.get(url)
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+    def test_cache_disabled(self):
+        """ Нулевое время жизни выключает кэш. """
+        url = reverse('tracker:tasks_list')
+        with self.settings(TRACKER_CACHE_TIMEOUT=0):
+            self.client.get(url)
+            response = self.client.get(url)
+        self.assertFalse(response.has_header('X-Cache'))
+
+
+class ConditionalGetTestCase(APITestCase):
+    """ Тест условных запросов по ETag и Last-Modified. """
+
+    def setUp(self):
+        cache.clear()
+        self.task = Task.objects.create(
+            title='Task one',
+            description='This is a test task',
+            deadline=timezone.now() + timedelta(days=1),
+        )
+
+    def test_list_not_modified(self):
+        """ Тест 304 для неизмененного списка задач. """
+        url = reverse('tracker:task-list')
+        response = self.client.get(url)
+        etag = response['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(
+            response.status_code, status.HTTP_304_NOT_MODIFIED
+        )
+        self.assertEqual(response['ETag'], etag)
+        self.assertNotEqual(
+            self.client.get(url, {'page': 1})['ETag'], etag
+        )
+        self.task.title = 'Task one updated'
+        self.task.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(
+            response.status_code, status.HTTP_200_OK
+        )
+
+    def test_list_changed_after_delete(self):
+        """ Удаление задачи меняет ETag списка. """
+        Task.objects.create(
+            title='Task two',
+            description='This is a test task',
+            deadline=timezone.now() + timedelta(days=1),
+        )
+        url = reverse('tracker:tasks_list')
+        etag = self.client.get(url)['ETag']
+        self.task.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(
+            response.status_code, status.HTTP_200_OK
+        )
+
+    def test_retrieve_if_modified_since(self):
+        """ Тест 304 для задачи по If-Modified-Since. """
+        url = reverse('tracker:task-detail', args=(self.task.pk,))
+        response = self.client.get(url)
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(
+            response.status_code, status.HTTP_304_NOT_MODIFIED
+        )
+
+    def test_list_ignores_if_modified_since(self):
+        """ Строка выпала из фильтра: список без 304 по If-Modified-Since. """
+        task = Task.objects.create(
+            title='Task two',
+            description='This is a test task',
+            deadline=timezone.now() + timedelta(days=1),
+        )
+        for name in ('tracker:tasks_list', 'tracker:async_tasks_list'):
+            url = reverse(name)
+            params = {'status': Task.STATUS_CREATED}
+            last_modified = self.client.get(url, params)['Last-Modified']
+            task.status = Task.STATUS_IN_PROGRESS
+            task.save()
+            response = self.client.get(
+                url, params, HTTP_IF_MODIFIED_SINCE=last_modified
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.json()['results']), 1)
+            task.status = Task.STATUS_CREATED
+            task.save()
+
+    def test_important_tasks_not_modified(self):
+        """ Тест 304 для важных задач. """
+        url = reverse('tracker:employees_available_list')
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(
+            response.status_code, status.HTTP_304_NOT_MODIFIED
+        )
+
+
+class ExportTestCase(APITestCase):
+    """ Тест потоковой выгрузки задач и сотрудников. """
+
+    def setUp(self):
+        self.employee = Employee.objects.create(
+            name='Иван Иванов',
+            position='Разработчик',
+            department='IT'
+        )
+        self.parent_task = Task.objects.create(
+            title='Parent task',
+            description='This is a parent task',
+            deadline=timezone.now() + timedelta(days=1),
+            employee=self.employee,
+        )
+        self.task = Task.objects.create(
+            title='Task, "quoted"',
+            description='This is a test task',
+            deadline=timezone.now() + timedelta(days=1),
+            related_task=self.parent_task,
+        )
+
+    def test_task_export_ndjson(self):
+        """ Тест выгрузки задач в NDJSON с фильтром по статусу. """
+        url = reverse('tracker:task_export', args=('ndjson',))
+        response = self.client.get(url, {'status': Task.STATUS_CREATED})
+        self.assertEqual(
+            response.status_code, status.HTTP_200_OK
+        )
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        row = json.loads(lines[0])
+        self.assertEqual(row['id'], self.task.pk)
+        self.assertEqual(row['related_task_title'], 'Parent task')
+        self.assertIsNone(row['employee_name'])
+
+    def test_task_export_csv(self):
+        """ Тест выгрузки задач в CSV. """
+        url = reverse('tracker:task_export', args=('csv',))
+        response = self.client.get(url)
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.DictReader(StringIO(content)))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]['employee_name'], 'Иван Иванов')
+        self.assertEqual(rows[1]['title'], 'Task, "quoted"')
+
+    def test_export_unknown_format(self):
+        """ Тест неизвестного формата выгрузки. """
+        url = reverse('tracker:employee_export', args=('xml',))
+        response = self.client.get(url)
+        self.assertEqual(
+            response.status_code, status.HTTP_404_NOT_FOUND
+        )
+
+    def test_export_command(self):
+        """ Тест команды выгрузки с фильтром. """
+        out = StringIO()
+        call_command(
+            'export_data', 'tasks',
+            filter=[f'employee={self.employee.pk}'],
+            stdout=out
+        )
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])['id'], self.parent_task.pk)
+        out = StringIO()
+        call_command(
+            'export_data', 'employees', export_format='csv', stdout=out
+        )
+        self.assertEqual(len(out.getvalue().splitlines()), 2)
+
+
+class ImportTestCase(APITestCase):
+    """ Тест потокового импорта задач и сотрудников. """
+
+    def test_import_fixtures(self):
+        """ Тест импорта фикстур проекта. """
+        out = StringIO()
+        call_command(
+            'import_data', settings.BASE_DIR / 'employee.json',
+            settings.BASE_DIR / 'tasks.json', batch_size=5, stdout=out
+        )
+        self.assertEqual(Employee.objects.count(), 9)
+        self.assertEqual(Task.objects.count(), 12)
+        self.assertEqual(Task.objects.get(pk=14).related_task_id, 13)
+        self.assertEqual(Task.objects.get(pk=3).related_task_id, 2)
+        employee = Employee.objects.get(pk=7)
+        self.assertEqual(
+            employee.total_tasks, Task.objects.filter(employee=7).count()
+        )
+        self.assertFalse(Task.objects.filter(
+            deadline__lt=timezone.now(),
+            status__in=(Task.STATUS_CREATED, Task.STATUS_IN_PROGRESS)
+        ).exists())
+        self.assertIn('задач: 12', out.getvalue())
+        call_command(
+            'import_data', settings.BASE_DIR / 'tasks.json', stdout=out
+        )
+        self.assertEqual(Task.objects.count(), 12)
+
+    def test_iter_json_objects(self):
+        """ Тест разбора NDJSON и массива по частям. """
+        rows = [{'id': number, 'title': 'Задача ' * 50}
+                for number in range(50)]
+        ndjson = '\n'.join(json.dumps(row) for row in rows)
+        array = json.dumps(rows, ensure_ascii=False, indent=2)
+        with mock.patch('tracker.imports.READ_SIZE', 100):
+            self.assertEqual(
+                list(iter_json_objects(StringIO(ndjson))), rows
+            )
+            self.assertEqual(
+                list(iter_json_objects(StringIO(array))), rows
+            )
+
+
+class BenchmarkTestCase(APITestCase):
+    """ Тест генератора данных и нагрузочного замера. """
+
+    def test_generate_data(self):
+        """ Тест генерации сотрудников и задач с цепочками. """
+        out = StringIO()
+        call_command(
+            'generate_data', employees=5, tasks=200, seed=1,
+            batch_size=50, stdout=out
+        )
+        self.assertEqual(Employee.objects.count(), 5)
+        self.assertEqual(Task.objects.count(), 200)
+        self.assertTrue(
+            Task.objects.filter(related_task__related_task__isnull=False)
+        )
+        self.assertEqual(
+            sum(Employee.objects.values_list('total_tasks', flat=True)),
+            Task.objects.filter(employee__isnull=False).count()
+        )
+
+    def test_benchmark_api(self):
+        """ Тест замера и сравнения с baseline. """
+        results = run_benchmark([(3, 20)], repeat=2)
+        routes = results['3x20']
+        self.assertIn('employees_task_busy', routes)
+        self.assertGreater(routes['tasks_list']['bytes'], 0)
+        self.assertGreater(routes['task_export']['bytes'], 0)
+        self.assertIn('task-bulk', routes)
+        self.assertEqual(
+            {name.split('?')[0] for name in routes} - {'task-create'},
+            {pattern.name for pattern in tracker_urls.urlpatterns}
+            - {'api-root'}
+        )
+        self.assertEqual(Task.objects.count(), 0)
+        self.assertEqual(compare_with_baseline(results, results), [])
+        baseline = json.loads(json.dumps(results))
+        baseline['3x20']['tasks_list']['queries'] -= 1
+        self.assertEqual(len(compare_with_baseline(results, baseline)), 1)
+
+    def test_measure_concurrency(self):
+        """ Тест замера пропускной способности по HTTP. """
+        response = mock.MagicMock(status=200)
+        response.__enter__.return_value = response
+        with mock.patch('tracker.benchmarks.urlopen', return_value=response):
+            result = measure_concurrency('http://testserver/', 4, 20)
+        self.assertEqual(result['requests'], 20)
+        self.assertEqual(result['errors'], 0)
+        self.assertGreater(result['rps'], 0)
+
+
+@override_settings(TRACKER_CACHE_TIMEOUT=0)
+class FastSerializationTestCase(APITestCase):
+    """ Тест быстрого вывода списков: values(), FastJSONRenderer. """
+
+    def setUp(self):
+        employee = Employee.objects.create(
+            name="Сотрудник", position="Разработчик", department=None
+        )
+        task = Task.objects.create(
+            title="Задача \u2028 \"в кавычках\"",
+            description="Описание\nв две строки",
+            deadline=timezone.now() + timedelta(days=1),
+            employee=employee,
+        )
+        Task.objects.create(
+            title="Зависимая задача",
+            description="Test",
+            deadline=task.deadline,
+            related_task=task,
+        )
+
+    def test_task_list_bytes(self):
+        """ Тест совпадения ответа с обычным путем DRF. """
+        response = self.client.get(reverse("tracker:task-list"))
+        tasks = Task.objects.order_by("deadline", "id")
+        results = ListSerializer(tasks, child=TaskSerializer()).data
+        expected = JSONRenderer().render(
+            {"count": 2, "next": None, "previous": None, "results": results}
+        )
+        self.assertEqual(response.content, expected)
+        self.assertIn(b"\\u2028", response.content)
+
+    def test_renderer_fallback(self):
+        """ Тест отступов и типов без поддержки orjson. """
+        data = {"deadline": timezone.now(), 1: [1.5, None]}
+        self.assertEqual(
+            FastJSONRenderer().render(data), JSONRenderer().render(data)
+        )
+        self.assertEqual(
+            FastJSONRenderer().render(data, "application/json; indent=4"),
+            JSONRenderer().render(data, "application/json; indent=4"),
+        )
+
+    def test_unsupported_field(self):
+        """ Тест отказа от полей с преобразованием значения. """
+        class TitleSerializer(serializers.ModelSerializer):
+            title = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Task
+                fields = ("id", "title")
+                list_serializer_class = FastListSerializer
+
+            def get_title(self, task):
+                return task.title.upper()
+
+        class EmployeeNameSerializer(serializers.ModelSerializer):
+            employee = serializers.CharField(source="employee.name")
+
+            class Meta:
+                model = Task
+                fields = ("id", "employee")
+                list_serializer_class = FastListSerializer
+
+        for serializer_class in (TitleSerializer, EmployeeNameSerializer):
+            serializer = serializer_class(Task.objects.all(), many=True)
+            with self.assertRaises(ImproperlyConfigured):
+                serializer.data
+
+    def test_measure_serialization(self):
+        """ Тест микробенчмарка сериализации. """
+        results = measure_serialization(rows=200, repeat=1)
+        self.assertTrue(results["tasks"]["identical"])
+        self.assertTrue(results["employees"]["identical"])
+
+
+@override_settings(QUERY_INSTRUMENTATION=True)
+class InstrumentationTestCase(APITestCase):
+    """ Тест метрик запросов: Server-Timing, лог и гистограммы. """
+
+    def setUp(self):
+        cache.clear()
+        employee = Employee.objects.create(
+            name="Test", position="Test", department="Test"
+        )
+        Task.objects.create(
+            title="Test", employee=employee,
+            deadline=timezone.now() + timedelta(days=1)
+        )
+
+    def test_server_timing(self):
+        """ Тест заголовка Server-Timing и записи в лог. """
+        url = reverse("tracker:employees_task_busy")
+        with self.assertLogs("tracker.performance") as logs:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        metrics = json.loads(logs.records[0].getMessage())
+        self.assertEqual(metrics["route"], "tracker:employees_task_busy")
+        self.assertGreater(metrics["queries"], 0)
+        self.assertIn(
+            f'desc="{metrics["queries"]} queries"',
+            response["Server-Timing"]
+        )
+        self.assertIn("render;dur=", response["Server-Timing"])
+
+    def test_connection_metrics(self):
+        """ Тест метрик соединения с БД: новое и повторное. """
+        url = reverse("tracker:task-list")
+        with self.assertLogs("tracker.performance") as logs:
+            response = self.client.get(url)
+            self.client.get(url)
+        self.assertIn("conn;dur=", response["Server-Timing"])
+        # В тестах соединение открыто заранее и не закрывается.
+        metrics = json.loads(logs.records[0].getMessage())
+        self.assertEqual(metrics["db_connection"], "reused")
+        self.assertGreaterEqual(metrics["db_connect_ms"], 0)
+        report = get_route_metrics(reset=True)
+        self.assertEqual(
+            report["tracker:task-list"]["connections"],
+            {"new": 0, "reused": 2}
+        )
+
+    def test_dump_request_metrics(self):
+        """ Тест гистограмм по маршрутам и их очистки. """
+        url = reverse("tracker:task-list")
+        with self.assertLogs("tracker.performance"):
+            self.client.get(url)
+            self.client.get(url)
+        out = StringIO()
+        call_command("dump_request_metrics", reset=True, stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(report["tracker:task-list"]["count"], 2)
+        self.assertEqual(
+            sum(report["tracker:task-list"]["queries"].values()), 2
+        )
+        out = StringIO()
+        call_command("dump_request_metrics", stdout=out)
+        self.assertEqual(json.loads(out.getvalue()), {})
+
+    def test_evicted_metrics_keys(self):
+        """ Тест вытеснения ключа между add и incr: запрос не падает. """
+        url = reverse("tracker:task-list")
+        with self.assertLogs("tracker.performance"):
+            self.client.get(url)
+            with mock.patch.object(
+                cache, "incr", side_effect=ValueError("evicted")
+            ):
+                response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        report = get_route_metrics(reset=True)
+        self.assertEqual(list(report), ["tracker:task-list"])
+        self.assertEqual(report["tracker:task-list"]["count"], 1)
+        self.assertGreater(report["tracker:task-list"]["mean_ms"], 0)
+
+
+class ReplicaRoutingTestCase(APITestCase):
+    """ Тест маршрутизации чтения на реплику. """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        with mock.patch.dict(settings.DATABASES, {"replica": {}}):
+            self.middleware = ReplicaRoutingMiddleware(self.view)
+
+    def view(self, request):
+        """ Представление: алиас, с которого оно читает задачи. """
+        self.middleware.process_view(request, None, (), {})
+        return HttpResponse(ReplicaRouter().db_for_read(Task) or "default")
+
+    def route(self, request):
+        request.resolver_match = resolve(request.path)
+        return self.middleware(request)
+
+    def test_safe_requests(self):
+        """ Тест чтения с реплики для GET трекера и пользователей. """
+        for url in (reverse("tracker:task-list"), reverse("users:users-list")):
+            response = self.route(self.factory.get(url))
+            self.assertEqual(response.content, b"replica")
+            self.assertNotIn(settings.REPLICA_STICKY_COOKIE, response.cookies)
+        self.assertIsNone(read_alias.get())
+
+    def test_write_sticky(self):
+        """ Тест записи в основную БД и чтения с нее после записи. """
+        url = reverse("tracker:task-list")
+        response = self.route(self.factory.post(url))
+        self.assertEqual(response.content, b"default")
+        cookie = response.cookies[settings.REPLICA_STICKY_COOKIE]
+        self.assertEqual(cookie["max-age"], settings.REPLICA_STICKY_SECONDS)
+        request = self.factory.get(url)
+        request.COOKIES[settings.REPLICA_STICKY_COOKIE] = cookie.value
+        self.assertEqual(self.route(request).content, b"default")
+
+    def test_router(self):
+        """ Тест записи и миграций только в основную БД. """
+        router = ReplicaRouter()
+        token = read_alias.set("replica")
+        try:
+            self.assertEqual(router.db_for_read(Task), "replica")
+            self.assertEqual(router.db_for_write(Task), "default")
+        finally:
+            read_alias.reset(token)
+        self.assertIsNone(router.db_for_read(Task))
+        self.assertFalse(router.allow_migrate("replica", "tracker"))
+
+
+@override_settings(TRACKER_CACHE_TIMEOUT=0)
+class SparseFieldsTestCase(APITestCase):
+    """ Тест выбора полей ?fields= и ?exclude=. """
+
+    def setUp(self):
+        self.employee = Employee.objects.create(
+            name="Test", position="Test", department="Test"
+        )
+        self.deadline = timezone.now() + timedelta(days=1)
+        self.task = Task.objects.create(
+            title="Test", description="Длинное описание",
+            deadline=self.deadline, employee=self.employee,
+        )
+        Task.objects.create(
+            title="Важная", description="Test", deadline=self.deadline,
+            related_task=self.task, priority="high",
+        )
+
+    def test_task_list_fields(self):
+        """ Тест списка задач только с выбранными полями. """
+        url = reverse("tracker:task-list")
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url, {"fields": "id,title"})
+        self.assertEqual(
+            list(response.json()["results"][0]), ["id", "title"]
+        )
+        self.assertFalse(
+            any("description" in query["sql"] for query in captured)
+        )
+        response = self.client.get(
+            reverse("tracker:tasks_list"), {"exclude": "description"}
+        )
+        self.assertNotIn("description", response.json()["results"][0])
+        self.assertIn("deadline", response.json()["results"][0])
+
+    def test_task_cursor_fields(self):
+        """ Тест курсорной пагинации без поля сортировки в выводе. """
+        url = reverse("tracker:task-list")
+        response = self.client.get(
+            url, {"fields": "title", "pagination": "cursor", "page_size": 1}
+        )
+        self.assertEqual(response.json()["results"], [{"title": "Test"}])
+        response = self.client.get(response.json()["next"])
+        self.assertEqual(response.json()["results"], [{"title": "Важная"}])
+
+    def test_task_detail_fields(self):
+        """ Тест задачи с выбранными полями без описания в запросе. """
+        url = reverse("tracker:task-detail", args=(self.task.pk,))
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url, {"fields": "id,status"})
+        self.assertEqual(
+            response.json(), {"id": self.task.pk, "status": self.task.status}
+        )
+        self.assertNotIn("description", captured[0]["sql"])
+
+    def test_unknown_field(self):
+        """ Тест ошибки для неизвестного поля. """
+        response = self.client.get(
+            reverse("tracker:task-list"), {"fields": "id,secret"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json(), {"fields": ["Неизвестные поля: secret."]}
+        )
+
+    def test_employee_nested_skipped(self):
+        """ Тест сотрудников без вложенных задач и их предзагрузки. """
+        url = reverse("tracker:employees_task_busy")
+        with self.assertNumQueries(3):
+            response = self.client.get(url, {"exclude": "active_tasks_list"})
+        self.assertNotIn("active_tasks_list", response.json()[0])
+        url = reverse("tracker:employees_available_list")
+        with self.assertNumQueries(4):
+            response = self.client.get(url, {"fields": "id,name"})
+        self.assertEqual(
+            response.json()[0]["Employees"],
+            [{"id": self.employee.pk, "name": "Test"}]
+        )
+
+
+@override_settings(TRACKER_CACHE_TIMEOUT=0)
+class TaskSearchTestCase(APITestCase):
+    """ Тест полнотекстового поиска задач (в SQLite - icontains). """
+
+    def setUp(self):
+        deadline = timezone.now() + timedelta(days=1)
+        self.in_description = Task.objects.create(
+            title="Подготовить документы",
+            description="Квартальный отчет для бухгалтерии",
+            deadline=deadline,
+        )
+        self.in_title = Task.objects.create(
+            title="Квартальный отчет",
+            description="Сдать до конца месяца",
+            deadline=deadline + timedelta(days=1),
+            status=Task.STATUS_FINISHED,
+        )
+        Task.objects.create(
+            title="Release notes", description="Other",
+            deadline=deadline,
+        )
+        self.url = reverse("tracker:task_search")
+
+    def test_search_rank(self):
+        """ Тест поиска по названию и описанию с ранжированием. """
+        response = self.client.get(self.url, {"q": "Квартальный отчет"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [task["id"] for task in response.json()["results"]],
+            [self.in_title.pk, self.in_description.pk]
+        )
+
+    def test_search_filters(self):
+        """ Тест поиска вместе с фильтрами списка задач. """
+        response = self.client.get(
+            self.url,
+            {"q": "отчет", "status": Task.STATUS_CREATED, "fields": "id"}
+        )
+        self.assertEqual(
+            response.json()["results"], [{"id": self.in_description.pk}]
+        )
+
+    def test_search_required(self):
+        """ Тест ошибки без строки поиска. """
+        response = self.client.get(self.url, {"q": " "})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), {"q": ["Укажите строку поиска."]})
+
+    def test_search_vector_deferred(self):
+        """ Тест: поисковый вектор не читается вне поиска. """
+        task = Task.objects.get(pk=self.in_title.pk)
+        self.assertIn("search_vector", task.get_deferred_fields())
+
+
+@override_settings(TRACKER_CACHE_TIMEOUT=0)
+class TaskFilterSetTestCase(APITestCase):
+    """ Тест фильтров списка задач TaskFilterSet. """
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.employee = Employee.objects.create(
+            name="Test", position="Test", department="IT"
+        )
+        self.soon = Task.objects.create(
+            title="Скоро", description="Test",
+            deadline=self.now + timedelta(days=2),
+            employee=self.employee, priority="high",
+        )
+        self.later = Task.objects.create(
+            title="Позже", description="Test",
+            deadline=self.now + timedelta(days=20), priority="medium",
+        )
+        self.overdue = Task.objects.create(
+            title="Просрочена", description="Test",
+            deadline=self.now + timedelta(days=1),
+        )
+        Task.objects.filter(pk=self.overdue.pk).update(
+            status=Task.STATUS_OVERDUE
+        )
+        self.url = reverse("tracker:tasks_list")
+
+    def get_ids(self, params, url=None):
+        response = self.client.get(url or self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {task["id"] for task in response.json()["results"]}
+
+    def test_deadline_range(self):
+        """ Тест диапазона и окна дедлайна. """
+        week = (self.now + timedelta(days=7)).strftime("%d.%m.%Y %H:%M")
+        self.assertEqual(
+            self.get_ids({"deadline_before": week}),
+            {self.soon.pk, self.overdue.pk}
+        )
+        self.assertEqual(
+            self.get_ids({"deadline_after": week}), {self.later.pk}
+        )
+        self.assertEqual(
+            self.get_ids({"due_in_days": 7, "status__in": "in_progress"}),
+            {self.soon.pk}
+        )
+
+    def test_multiple_values(self):
+        """ Тест фильтров по нескольким статусам и приоритетам. """
+        self.assertEqual(
+            self.get_ids({"status__in": "created,overdue"}),
+            {self.later.pk, self.overdue.pk}
+        )
+        self.assertEqual(
+            self.get_ids({"priority__in": "high,medium"}),
+            {self.soon.pk, self.later.pk}
+        )
+        response = self.client.get(self.url, {"status__in": "created,done"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_employee_filters(self):
+        """ Тест фильтров по сотруднику и его отделу. """
+        self.assertEqual(
+            self.get_ids({"employee__isnull": "true"}),
+            {self.later.pk, self.overdue.pk}
+        )
+        self.assertEqual(self.get_ids({"department": "IT"}), {self.soon.pk})
+
+    def test_updated_range(self):
+        """ Тест фильтра по времени изменения. """
+        Task.objects.filter(pk=self.soon.pk).update(
+            updated_at=self.now - timedelta(days=3)
+        )
+        after = (self.now - timedelta(days=1)).isoformat()
+        self.assertEqual(
+            self.get_ids({"updated_after": after}),
+            {self.later.pk, self.overdue.pk}
+        )
+        self.assertEqual(
+            self.get_ids({"updated_before": after, "created_after": after}),
+            {self.soon.pk}
+        )
+
+    def test_empty_route_preset(self):
+        """ Тест: task/list/empty/ - фильтр без сотрудника на том же view. """
+        url = reverse("tracker:task_list_empty")
+        self.assertEqual(
+            self.get_ids({}, url), {self.later.pk, self.overdue.pk}
+        )
+        self.assertEqual(
+            self.get_ids({"employee__isnull": "false"}, url),
+            {self.later.pk, self.overdue.pk}
+        )
+        self.assertEqual(
+            self.get_ids({"priority": "medium"}, url), {self.later.pk}
+        )
+
+
+@override_settings(CHANGES_SAFETY_LAG=0)
+class ChangesFeedTestCase(APITestCase):
+    """ Тест ленты изменений changes/. """
+
+    def setUp(self):
+        self.url = reverse("tracker:changes")
+        self.employee = Employee.objects.create(
+            name="Test", position="Test", department="IT"
+        )
+        deadline = timezone.now() + timedelta(days=1)
+        self.tasks = [
+            Task.objects.create(
+                title=f"Задача {number}", description="Test",
+                deadline=deadline, employee=self.employee,
+            )
+            for number in range(3)
+        ]
+
+    def get_changes(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_initial_sync(self):
+        """ Тест полной выгрузки страницами и курсора без изменений. """
+        page = self.get_changes(limit=2)
+        self.assertEqual(
+            [task["id"] for task in page["tasks"]],
+            [task.pk for task in self.tasks[:2]]
+        )
+        self.assertEqual(page["employees"][0]["id"], self.employee.pk)
+        self.assertTrue(page["has_more"])
+        page = self.get_changes(since=page["next"], limit=2)
+        self.assertEqual(
+            [task["id"] for task in page["tasks"]], [self.tasks[2].pk]
+        )
+        self.assertFalse(page["has_more"])
+        page = self.get_changes(since=page["next"])
+        self.assertEqual(
+            (page["tasks"], page["employees"], page["deleted"]), ([], [], [])
+        )
+
+    def test_updates_and_deletes(self):
+        """ Тест изменений и удалений после курсора. """
+        cursor = self.get_changes()["next"]
+        time.sleep(0.01)
+        task = self.tasks[0]
+        task.title = "Новое название"
+        task.save()
+        employee_id = self.employee.pk
+        self.employee.delete()
+        page = self.get_changes(since=cursor)
+        self.assertEqual(
+            {task["id"] for task in page["tasks"]},
+            {task.pk for task in self.tasks}
+        )
+        self.assertTrue(
+            all(task["employee"] is None for task in page["tasks"])
+        )
+        self.assertEqual(
+            [(item["type"], item["id"]) for item in page["deleted"]],
+            [("employee", employee_id)]
+        )
+
+    def test_bulk_writes(self):
+        """ Тест пакетных изменений: просрочка и импорт видны в ленте. """
+        started = timezone.now()
+        Task.objects.filter(pk=self.tasks[0].pk).update(
+            deadline=started - timedelta(hours=1)
+        )
+        importer = FixtureImporter(batch_size=1)
+        importer.add("tracker.task", {
+            "id": 1000, "title": "Импорт", "deadline": "2099-01-01T00:00",
+            "related_task": 1001, "updated_at": "2020-01-01T00:00:00+00:00",
+        })
+        importer.flush(Task)
+        cursor = self.get_changes()["next"]
+        time.sleep(0.01)
+        # Пачка помечается позже момента, от которого считается просрочка.
+        self.assertEqual(mark_overdue_tasks(chunk_size=1, now=started), 1)
+        importer.add("tracker.task", {
+            "id": 1001, "title": "Импорт", "deadline": "2099-01-01T00:00",
+            "updated_at": "2020-01-01T00:00:00+00:00",
+        })
+        importer.flush(Task)
+        importer.resolve_deferred_related()
+        page = self.get_changes(since=cursor)
+        self.assertEqual(
+            {task["id"] for task in page["tasks"]},
+            {self.tasks[0].pk, 1000, 1001}
+        )
+
+    def test_invalid_and_expired_cursor(self):
+        """ Тест неверного и устаревшего курсора. """
+        response = self.client.get(self.url, {"since": "не курсор"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        cursor = self.get_changes()["next"]
+        with override_settings(CHANGES_TOMBSTONE_RETENTION_DAYS=-1):
+            response = self.client.get(self.url, {"since": cursor})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    def test_prune_tombstones(self):
+        """ Тест удаления старых записей об удалении. """
+        self.tasks[0].delete()
+        Tombstone.objects.update(
+            deleted_at=timezone.now() - timedelta(days=40)
+        )
+        task_id = self.tasks[1].pk
+        self.tasks[1].delete()
+        call_command("prune_tombstones", days=30, stdout=StringIO())
+        self.assertEqual(
+            list(Tombstone.objects.values_list("object_id", flat=True)),
+            [task_id]
+        )
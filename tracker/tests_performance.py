@@ -0,0 +1,297 @@
+from datetime import timedelta
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+from tracker.models import Employee, Task
+from users.models import User
+
+
+class QueryBudgetMixin:
+    """
+    Бюджет запросов к БД для маршрута.
+    assertStableBudget проверяет бюджет дважды: до и после добавления
+    данных, поэтому рост числа запросов вместе с данными (N+1) роняет тест.
+    """
+
+    def assertQueryBudget(self, budget, url, method="get", data=None,
+                          expected_status=status.HTTP_200_OK):
+        with self.assertNumQueries(budget):
+            response = getattr(self.client, method)(
+                url, data=data, format="json"
+            )
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertEqual(response.status_code, expected_status)
+        return response
+
+    def assertStableBudget(self, budget, url, reset=None, **kwargs):
+        self.assertQueryBudget(budget, url, **kwargs)
+        self.seed()
+        cache.clear()
+        if reset is not None:
+            reset()
+        return self.assertQueryBudget(budget, url, **kwargs)
+
+
+@override_settings(TRACKER_CACHE_TIMEOUT=0)
+class TrackerQueryBudgetTestCase(QueryBudgetMixin, APITestCase):
+    """ Бюджеты запросов для маршрутов трекера. """
+
+    def setUp(self):
+        cache.clear()
+        self.deadline = timezone.now() + timedelta(days=1)
+        self.seed()
+        self.employee = Employee.objects.first()
+        self.task = Task.objects.filter(employee=self.employee).first()
+        self.important_task = Task.objects.filter(employee=None).first()
+
+    def seed(self, employees=3, tasks_per_employee=3):
+        """
+        Сотрудники с задачами в работе и завершенными,
+        важные задачи без исполнителя и зависимые от них задачи.
+        """
+        for number in range(employees):
+            employee = Employee.objects.create(
+                name=f"Сотрудник {number}",
+                position="Разработчик",
+                department=f"Отдел {number % 2}",
+            )
+            for task_number in range(tasks_per_employee):
+                task = Task.objects.create(
+                    title=f"Задача {number}.{task_number}",
+                    description="Задача сотрудника",
+                    deadline=self.deadline,
+                    employee=employee,
+                    status=(
+                        Task.STATUS_FINISHED if task_number % 3 == 2
+                        else Task.STATUS_IN_PROGRESS
+                    ),
+                )
+            Task.objects.create(
+                title=f"Важная {number}",
+                description="От задачи зависит задача в работе",
+                deadline=self.deadline,
+                related_task=task,
+                priority="high",
+            )
+
+    def task_data(self):
+        """ Данные новой задачи для создания и обновления. """
+        return {
+            "title": "Новая задача",
+            "description": "Задача из теста",
+            "deadline": self.deadline.strftime("%d.%m.%Y %H:%M"),
+            "employee": self.employee.pk,
+            "related_task": self.important_task.pk,
+            "priority": "high",
+        }
+
+    def test_task_list(self):
+        """ Бюджет запросов: список задач. """
+        self.assertStableBudget(3, reverse("tracker:task-list"))
+
+    def test_task_list_cursor(self):
+        """ Бюджет запросов: список задач с курсорной пагинацией. """
+        url = reverse("tracker:task-list")
+        self.assertStableBudget(2, f"{url}?pagination=cursor")
+
+    def test_task_detail(self):
+        """ Бюджет запросов: получение задачи. """
+        url = reverse("tracker:task-detail", args=(self.task.pk,))
+        self.assertStableBudget(1, url)
+
+    def test_task_create(self):
+        """ Бюджет запросов: создание задачи. """
+        self.assertStableBudget(
+            9, reverse("tracker:task-list"), method="post",
+            data=self.task_data(), expected_status=status.HTTP_201_CREATED
+        )
+
+    def test_task_update(self):
+        """ Бюджет запросов: обновление задачи. """
+        url = reverse("tracker:task-detail", args=(self.task.pk,))
+        task = Task.objects.get(pk=self.task.pk)
+        self.assertStableBudget(
+            10, url, method="put", data=self.task_data(), reset=task.save
+        )
+
+    def test_task_partial_update(self):
+        """ Бюджет запросов: частичное обновление задачи. """
+        url = reverse("tracker:task-detail", args=(self.task.pk,))
+        self.assertStableBudget(
+            4, url, method="patch", data={"title": "Новое название"}
+        )
+
+    def test_task_delete(self):
+        """ Бюджет запросов: удаление задачи. """
+        url = reverse("tracker:task-detail", args=(self.task.pk,))
+        self.assertQueryBudget(
+            8, url, method="delete",
+            expected_status=status.HTTP_204_NO_CONTENT
+        )
+
+    def test_task_bulk(self):
+        """ Бюджет запросов: пакетное создание и обновление задач. """
+        data = [self.task_data() for _ in range(3)] + [
+            {"id": self.task.pk, "title": "Новое название"}
+        ]
+        self.assertQueryBudget(
+            10, reverse("tracker:task-bulk"), method="post", data=data,
+            expected_status=status.HTTP_201_CREATED
+        )
+
+    def test_task_graph(self):
+        """ Бюджет запросов: граф зависимостей задачи. """
+        url = reverse("tracker:task-graph", args=(self.important_task.pk,))
+        self.assertStableBudget(1, url)
+
+    def test_task_blocked(self):
+        """ Бюджет запросов: заблокированные задачи. """
+        self.assertStableBudget(1, reverse("tracker:task-blocked"))
+
+    def test_task_assignment(self):
+        """ Бюджет запросов: план распределения важных задач. """
+        self.assertStableBudget(2, reverse("tracker:task-assignment"))
+
+    def test_tasks_list(self):
+        """ Бюджет запросов: список задач по дедлайну. """
+        self.assertStableBudget(3, reverse("tracker:tasks_list"))
+
+    def test_task_search(self):
+        """ Бюджет запросов: поиск задач. """
+        url = reverse("tracker:task_search")
+        self.assertStableBudget(3, f"{url}?q=Задача")
+
+    def test_task_list_empty(self):
+        """ Бюджет запросов: список задач без сотрудника. """
+        self.assertStableBudget(3, reverse("tracker:task_list_empty"))
+
+    def test_task_export(self):
+        """ Бюджет запросов: выгрузка задач. """
+        url = reverse("tracker:task_export", args=("ndjson",))
+        self.assertStableBudget(1, url)
+
+    def test_employee_list(self):
+        """ Бюджет запросов: список сотрудников. """
+        self.assertStableBudget(3, reverse("tracker:employee-list"))
+
+    def test_employee_detail(self):
+        """ Бюджет запросов: получение сотрудника. """
+        url = reverse("tracker:employee-detail", args=(self.employee.pk,))
+        self.assertStableBudget(1, url)
+
+    def test_employee_create(self):
+        """ Бюджет запросов: создание сотрудника. """
+        data = {"name": "Новый", "position": "Аналитик", "department": "IT"}
+        self.assertStableBudget(
+            2, reverse("tracker:employee-list"), method="post", data=data,
+            expected_status=status.HTTP_201_CREATED
+        )
+
+    def test_employee_update(self):
+        """ Бюджет запросов: обновление сотрудника. """
+        url = reverse("tracker:employee-detail", args=(self.employee.pk,))
+        data = {"name": "Новое имя", "position": "Аналитик",
+                "department": "IT"}
+        self.assertStableBudget(2, url, method="put", data=data)
+
+    def test_employee_delete(self):
+        """ Бюджет запросов: удаление сотрудника. """
+        url = reverse("tracker:employee-detail", args=(self.employee.pk,))
+        self.assertQueryBudget(
+            5, url, method="delete",
+            expected_status=status.HTTP_204_NO_CONTENT
+        )
+
+    def test_employee_export(self):
+        """ Бюджет запросов: выгрузка сотрудников. """
+        url = reverse("tracker:employee_export", args=("csv",))
+        self.assertStableBudget(1, url)
+
+    def test_employees_busy(self):
+        """ Бюджет запросов: занятые сотрудники. """
+        self.assertStableBudget(4, reverse("tracker:employees_task_busy"))
+
+    def test_employees_available(self):
+        """ Бюджет запросов: сотрудники для важных задач. """
+        url = reverse("tracker:employees_available_list")
+        self.assertStableBudget(5, url)
+        self.assertStableBudget(5, f"{url}?mode=compact")
+
+    def test_sparse_fields(self):
+        """ Бюджет запросов: списки без вложенных задач. """
+        url = reverse("tracker:employees_task_busy")
+        self.assertStableBudget(3, f"{url}?exclude=active_tasks_list")
+        url = reverse("tracker:employees_available_list")
+        self.assertStableBudget(4, f"{url}?fields=id,name")
+        url = reverse("tracker:task-list")
+        self.assertStableBudget(3, f"{url}?fields=id,title")
+
+    def test_async_routes(self):
+        """ Бюджет запросов: async-варианты тяжелых списков. """
+        self.assertStableBudget(3, reverse("tracker:async_tasks_list"))
+        self.assertStableBudget(
+            4, reverse("tracker:async_employees_task_busy")
+        )
+        url = reverse("tracker:async_employees_available_list")
+        self.assertStableBudget(5, url)
+        self.assertStableBudget(5, f"{url}?mode=compact")
+
+    def test_changes(self):
+        """ Бюджет запросов: лента изменений. """
+        self.assertStableBudget(3, reverse("tracker:changes"))
+
+    def test_cache_stats(self):
+        """ Бюджет запросов: статистика кэша. """
+        self.assertQueryBudget(0, reverse("tracker:cache_stats"))
+
+
+class UserQueryBudgetTestCase(QueryBudgetMixin, APITestCase):
+    """ Бюджеты запросов для маршрутов пользователей. """
+
+    def setUp(self):
+        self.seed()
+        self.user = User.objects.first()
+
+    def seed(self, users=3):
+        """ Создание пользователей. """
+        start = User.objects.count()
+        User.objects.bulk_create(
+            User(email=f"user{number}@example.com")
+            for number in range(start, start + users)
+        )
+
+    def test_user_list(self):
+        """ Бюджет запросов: список пользователей. """
+        self.assertStableBudget(1, reverse("users:users-list"))
+
+    def test_user_detail(self):
+        """ Бюджет запросов: получение пользователя. """
+        url = reverse("users:user-detail", args=(self.user.pk,))
+        self.assertStableBudget(1, url)
+
+    def test_user_register(self):
+        """ Бюджет запросов: регистрация пользователя. """
+        data = {"email": "new@example.com", "first_name": "Новый"}
+        self.assertQueryBudget(
+            3, reverse("users:register"), method="post", data=data,
+            expected_status=status.HTTP_201_CREATED
+        )
+
+    def test_user_update(self):
+        """ Бюджет запросов: обновление пользователя. """
+        url = reverse("users:user-update", args=(self.user.pk,))
+        self.assertStableBudget(
+            2, url, method="patch", data={"first_name": "Новое имя"}
+        )
+
+    def test_user_delete(self):
+        """ Бюджет запросов: удаление пользователя. """
+        url = reverse("users:user-delete", args=(self.user.pk,))
+        self.assertQueryBudget(
+            5, url, method="delete",
+            expected_status=status.HTTP_204_NO_CONTENT
+        )
@@ -4,11 +4,20 @@ from tracker.views import (
     TaskViewSet,
     EmployeeViewSet,
     TaskListAPIView,
+    TaskSearchAPIView,
     ImportantTaskList,
     EmployeeTaskListAPIView,
+    CacheStatsAPIView,
+    ChangesAPIView,
+    TaskExportAPIView,
+    EmployeeExportAPIView,
 )
 from rest_framework.routers import DefaultRouter
-from tracker.models import Task
+from tracker.async_views import (
+    AsyncEmployeeTaskListView,
+    AsyncImportantTaskList,
+    AsyncTaskListView,
+)
 
 app_name = TrackerConfig.name
 
@@ -23,9 +32,13 @@ urlpatterns = [
     # Запрашивает из БД список задач без сотрудника.
     path(
         "task/list/empty/",
-        TaskListAPIView.as_view(queryset=Task.objects.filter(employee=None)),
+        TaskListAPIView.as_view(
+            preset_filters={"employee__isnull": "true"}
+        ),
         name="task_list_empty",
     ),
+    # Полнотекстовый поиск задач по названию и описанию.
+    path("task/search/", TaskSearchAPIView.as_view(), name="task_search"),
     # Запрашивает из БД список всех занятых сотрудников.
     path(
         "employee/busy/",
@@ -38,4 +51,35 @@ urlpatterns = [
         ImportantTaskList.as_view(),
         name="employees_available_list",
     ),
+    # Потоковая выгрузка задач и сотрудников (ndjson/csv).
+    path(
+        "task/export/<str:export_format>/",
+        TaskExportAPIView.as_view(),
+        name="task_export",
+    ),
+    path(
+        "employee/export/<str:export_format>/",
+        EmployeeExportAPIView.as_view(),
+        name="employee_export",
+    ),
+    # Async-варианты тяжелых списков (для запуска под ASGI).
+    path(
+        "async/task/list/",
+        AsyncTaskListView.as_view(),
+        name="async_tasks_list",
+    ),
+    path(
+        "async/employee/busy/",
+        AsyncEmployeeTaskListView.as_view(),
+        name="async_employees_task_busy",
+    ),
+    path(
+        "async/employee/available/",
+        AsyncImportantTaskList.as_view(),
+        name="async_employees_available_list",
+    ),
+    # Лента изменений задач и сотрудников для зеркалирования.
+    path("changes/", ChangesAPIView.as_view(), name="changes"),
+    # Статистика кэша ответов.
+    path("cache/stats/", CacheStatsAPIView.as_view(), name="cache_stats"),
 ] + router.urls
@@ -1,48 +1,245 @@
-from django.db.models import Count, Q, Min
+from django.conf import settings
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework import generics, viewsets
+from rest_framework import generics, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.filters import OrderingFilter
+from tracker.assignment import apply_assignment_plan, get_assignment_plan
+from tracker.cache import CachedResponseMixin, get_cache_stats
+from tracker.changes import (
+    CursorExpired,
+    decode_cursor,
+    encode_cursor,
+    get_changes,
+)
+from tracker.conditional import ConditionalGetMixin, get_queryset_validators
+from tracker.dependencies import (
+    get_blocked_tasks,
+    get_dependency_graph,
+    get_limit,
+)
+from tracker.exports import (
+    EMPLOYEE_EXPORT_COLUMNS,
+    EXPORT_FORMATS,
+    TASK_EXPORT_COLUMNS,
+    iter_export,
+)
+from tracker.filters import (
+    PresetFilterBackend,
+    TaskDependencyFilterBackend,
+    TaskFilterSet,
+)
 from tracker.models import Task, Employee
 from tracker.serializers import (
+    BlockedTaskSerializer,
+    TaskAssignmentSerializer,
+    TaskDependencySerializer,
     EmployeeShortSerializer,
     EmployeeSerializer,
     TaskSerializer,
     EmployeeActiveTaskSerializer,
+    EmployeeCandidateSerializer,
+)
+from tracker.services import (
+    get_candidate_employees,
+    get_important_tasks,
+    save_task_batch,
+    task_summaries_prefetch,
+)
+from tracker.paginators import (
+    EmployeePaginator,
+    TaskPaginator,
+    TaskSearchPaginator,
 )
-from tracker.paginators import EmployeePaginator, TaskPaginator
+from tracker.search import search_tasks
 
 
-class TaskViewSet(viewsets.ModelViewSet):
-    queryset = Task.objects.all().order_by("deadline")
+class ValuesListMixin:
+    """
+    Список через values(): строки читаются словарями без создания
+    экземпляров модели и выводятся FastListSerializer
+    (list_serializer_class сериализатора).
+    """
+
+    def get_values_fields(self):
+        """
+        Поля выбранных столбцов сериализатора (?fields=, ?exclude=),
+        id и поле курсорной пагинации.
+        """
+        fields = self.get_serializer(many=True).get_value_fields()
+        cursor_class = getattr(self.paginator, "cursor_class", None)
+        required = ["id"]
+        if cursor_class is not None:
+            required.append(cursor_class.ordering_field)
+        return fields + [name for name in required if name not in fields]
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            *self.get_values_fields()
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+
+class TaskViewSet(ConditionalGetMixin, ValuesListMixin,
+                  viewsets.ModelViewSet):
+    queryset = Task.objects.all().order_by("deadline", "id")
     serializer_class = TaskSerializer
     pagination_class = TaskPaginator
+    bulk_max_size = 1000
+
+    def get_queryset(self):
+        """Задача на чтение - только выбранные столбцы и updated_at (ETag)."""
+        queryset = super().get_queryset()
+        if self.action == "retrieve":
+            queryset = queryset.only(
+                *self.get_serializer().get_model_fields(), "updated_at"
+            )
+        return queryset
 
     def perform_create(self, serializer):
-        task = serializer.save()
-        task.save()
-        return task
+        return serializer.save()
 
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request, *args, **kwargs):
+        """
+        Пакетное создание, обновление и назначение задач.
+        Принимает список задач: строки с id обновляются, без id - создаются.
+        Ошибки возвращаются списком по строкам, при ошибках ничего не пишется.
+        """
+        rows = request.data
+        if not isinstance(rows, list) or not rows:
+            return Response(
+                {"non_field_errors": ["Ожидается непустой список задач."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(rows) > self.bulk_max_size:
+            return Response(
+                {"non_field_errors": [
+                    f"Не более {self.bulk_max_size} задач за один запрос."
+                ]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        tasks, errors = save_task_batch(rows)
+        if any(errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        serializer = self.get_serializer(tasks, many=True)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=["get"])
+    def graph(self, request, pk=None):
+        """
+        Граф зависимостей задачи: зависимые задачи, задачи, от которых
+        она зависит, и критический путь из незавершенных задач.
+        Глубина (?depth=) и число узлов (?limit=) ограничены настройками.
+        """
+        graph = get_dependency_graph(
+            pk,
+            max_depth=get_limit(
+                request.query_params.get("depth"),
+                settings.TASK_DEPENDENCY_MAX_DEPTH,
+            ),
+            max_nodes=get_limit(
+                request.query_params.get("limit"),
+                settings.TASK_DEPENDENCY_MAX_NODES,
+            ),
+        )
+        if graph is None:
+            raise NotFound("Задача не найдена.")
+        return Response({
+            "task": TaskDependencySerializer(graph["task"]).data,
+            "dependents": TaskDependencySerializer(
+                graph["dependents"], many=True
+            ).data,
+            "dependencies": TaskDependencySerializer(
+                graph["dependencies"], many=True
+            ).data,
+            "critical_path": [task.id for task in graph["critical_path"]],
+            "blocked": graph["blocked"],
+            "truncated": graph["truncated"],
+        })
+
+    @action(detail=False, methods=["get"])
+    def blocked(self, request):
+        """
+        Заблокированные задачи: сначала самые длинные цепочки
+        незавершенных задач, которые они ждут.
+        """
+        tasks = get_blocked_tasks(
+            limit=get_limit(
+                request.query_params.get("limit"),
+                settings.TASK_DEPENDENCY_MAX_NODES,
+            )
+        )
+        return Response(BlockedTaskSerializer(tasks, many=True).data)
 
-class TaskListAPIView(generics.ListAPIView):
+    @action(detail=False, methods=["get", "post"])
+    def assignment(self, request):
+        """
+        Распределение важных задач без исполнителя по сотрудникам
+        с учетом загрузки, срочности и владельцев зависящих задач.
+        GET - план без записи, POST - план и назначение сотрудников.
+        """
+        assignments = get_assignment_plan()
+        data = TaskAssignmentSerializer(assignments, many=True).data
+        if request.method == "GET":
+            return Response(data)
+        tasks, errors = apply_assignment_plan(assignments)
+        if any(errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data)
+
+
+class TaskListAPIView(ConditionalGetMixin, CachedResponseMixin,
+                      ValuesListMixin, generics.ListAPIView):
     """
     Запрашивает из БД список всех задач, отсортированные по дедлайну.
     """
 
     serializer_class = TaskSerializer
-    queryset = Task.objects.all().order_by("deadline")
+    queryset = Task.objects.all().order_by("deadline", "id")
     pagination_class = TaskPaginator
-    filter_backends = [DjangoFilterBackend, OrderingFilter]
-    filterset_fields = ("status", "deadline", "employee")
+    filter_backends = [
+        PresetFilterBackend,
+        TaskDependencyFilterBackend,
+        OrderingFilter,
+    ]
+    filterset_class = TaskFilterSet
+    # Фильтры маршрута (as_view), например task/list/empty/.
+    preset_filters = {}
 
 
-class EmployeeViewSet(viewsets.ModelViewSet):
+class TaskSearchAPIView(TaskListAPIView):
+    """
+    Полнотекстовый поиск задач ?q= по названию и описанию
+    (русский и английский), сначала наиболее релевантные.
+    Сочетается с фильтрами списка задач.
+    """
+
+    pagination_class = TaskSearchPaginator
+
+    def get_queryset(self):
+        text = self.request.query_params.get("q", "").strip()
+        if not text:
+            raise ValidationError({"q": ["Укажите строку поиска."]})
+        return search_tasks(super().get_queryset(), text)
+
+
+class EmployeeViewSet(ConditionalGetMixin, ValuesListMixin,
+                      viewsets.ModelViewSet):
     """
     Запрашивает из БД список всех сотрудников, отсортированных по отделу.
     """
 
-    queryset = Employee.objects.all().order_by("department")
+    queryset = Employee.objects.all().order_by("department", "id")
     serializer_class = EmployeeShortSerializer
     pagination_class = EmployeePaginator
 
@@ -52,7 +249,8 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         return employee
 
 
-class EmployeeTaskListAPIView(generics.ListAPIView):
+class EmployeeTaskListAPIView(ConditionalGetMixin, CachedResponseMixin,
+                              generics.ListAPIView):
     """
     1. Запрашивает из БД список сотрудников и их задачи,
     отсортированные по количеству активных задач.
@@ -63,57 +261,104 @@ class EmployeeTaskListAPIView(generics.ListAPIView):
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ("position", "department")
 
+    def get_validator_querysets(self):
+        """Счетчики и задачи в работе зависят от всей таблицы задач."""
+        return super().get_validator_querysets() + [Task.objects.all()]
+
     def get_queryset(self):
-        return Employee.objects.annotate(
-            active_tasks_count=Count(
+        """
+        Фильтр и сортировка идут по счетчику active_tasks,
+        задачи в работе подгружаются одним запросом через Prefetch.
+        Читаются только выбранные поля (?fields=, ?exclude=), без
+        active_tasks_list задачи не подгружаются.
+        """
+        serializer = self.get_serializer_class()(
+            context={"request": getattr(self, "request", None)}
+        )
+        queryset = Employee.objects.filter(
+            active_tasks__gt=0
+        ).order_by("-active_tasks", "id").only(
+            *serializer.get_model_fields()
+        )
+        if "active_tasks_list" not in serializer.fields:
+            return queryset
+        active_tasks = Task.objects.filter(
+            status=Task.STATUS_IN_PROGRESS
+        ).order_by("deadline", "id")
+        return queryset.prefetch_related(
+            Prefetch(
                 "task",
-                filter=Q(task__status="in_progress")
-            )).filter(
-            active_tasks_count__gt=0
-        ).order_by("-active_tasks_count")
+                queryset=active_tasks,
+                to_attr="active_tasks_prefetched"
+            )
+        )
 
 
-class ImportantTaskList(APIView):
+class ImportantTaskList(ConditionalGetMixin, CachedResponseMixin, APIView):
     """ Предоставляет из БД:
     1. Задачи не взяты в работу,
     но от которых зависят другие задачи, взятые в работу.
     2. Поиск сотрудников, которые могут взять найденную задачу в работу:
     2.1. Это могут быть сотрудники с наименьшей загрузкой
     2.2. Или сотрудник с родительской задачей и с разницей задач не более 2.
+    С параметром ?mode=compact кандидаты выводятся один раз,
+    а задачи ссылаются на них по id. Поля кандидатов выбираются
+    ?fields= и ?exclude= (без compact).
     """
 
     def get(self, request, *args, **kwargs):
-        # Условие 1.
-        task_queryset = Task.objects.filter(
-            employee=None,
-            related_task__employee__isnull=False,
-            priority__iexact="high"
+        last_modified, parts = get_queryset_validators(
+            [Task.objects.all(), Employee.objects.all()]
         )
-        # Условие 2. Поиск по сотрудникам, которые могут взять такие задачи
-        employee_queryset = Employee.objects.annotate(
-            tasks_count=Count("task")
-        )
-        min_task_count = employee_queryset.aggregate(
-            Min("tasks_count")
-        )["tasks_count__min"]
-        available_employees = Employee.objects.annotate(
-            tasks_count=Count("task")
-        ).filter(
-            # Условие 2.1.:
-            Q(tasks_count=min_task_count)
-            |
-            # Условие 2.2.:
-            Q(
-                tasks_count__lte=min_task_count + 2,
-                task__related_task__isnull=False
+        return self.conditional_response(
+            request, last_modified, parts,
+            lambda: self.cached_response(
+                request, lambda: self.build_response(request)
             )
-        ).distinct()
+        )
+
+    def build_response(self, request):
+        # Условие 1.
+        task_queryset = get_important_tasks()
+        # Условие 2. Поиск по сотрудникам, которые могут взять такие задачи
+        available_employees = self.get_employees(request)
+        if request.query_params.get("mode") == "compact":
+            return Response(self.get_compact_data(
+                task_queryset, available_employees
+            ))
+        return Response(self.get_data(
+            task_queryset, available_employees, request
+        ))
+
+    @staticmethod
+    def get_employees(request):
+        """
+        Кандидаты с задачами для выбранного режима:
+        compact - сводки задач, иначе выбранные поля и задачи,
+        только если запрошен list_tasks.
+        """
+        employees = get_candidate_employees()
+        if request.query_params.get("mode") == "compact":
+            return employees.prefetch_related(task_summaries_prefetch())
+        serializer = EmployeeSerializer(context={"request": request})
+        employees = employees.only(*serializer.get_model_fields())
+        if "list_tasks" in serializer.fields:
+            employees = employees.prefetch_related("task")
+        return employees
+
+    @staticmethod
+    def get_data(tasks, available_employees, request=None):
+        """
+        Каждая задача со списком кандидатов.
+        Принимает queryset'ы или уже загруженные списки (async-версия).
+        """
         employee_serializer = EmployeeSerializer(
             available_employees,
-            many=True
+            many=True,
+            context={"request": request},
         )
         list_of_task = []
-        for one_task in task_queryset:
+        for one_task in tasks:
             list_of_task.append(
                 {
                     "task_id": one_task.id,
@@ -122,4 +367,111 @@ class ImportantTaskList(APIView):
                     "Employees": employee_serializer.data,
                 }
             )
-        return Response(list_of_task)
+        return list_of_task
+
+    @staticmethod
+    def get_compact_data(tasks, available_employees):
+        """Кандидаты выводятся один раз, задачи ссылаются на них по id."""
+        employees = EmployeeCandidateSerializer(
+            available_employees,
+            many=True
+        ).data
+        employee_ids = [employee["id"] for employee in employees]
+        list_of_task = []
+        for one_task in tasks:
+            list_of_task.append(
+                {
+                    "task_id": one_task.id,
+                    "Important task": one_task.title,
+                    "Deadline": one_task.deadline.strftime("%d.%m.%Y %H:%M"),
+                    "Employees": employee_ids,
+                }
+            )
+        return {"employees": employees, "tasks": list_of_task}
+
+
+class ExportMixin:
+    """
+    Потоковая выгрузка отфильтрованного queryset'а в NDJSON или CSV.
+    Формат задается в пути: export/ndjson/ или export/csv/.
+    """
+
+    export_columns = None
+    export_chunk_size = 2000
+
+    def get(self, request, export_format, *args, **kwargs):
+        if export_format not in EXPORT_FORMATS:
+            raise NotFound(
+                f"Формат выгрузки {export_format} не поддерживается."
+            )
+        queryset = self.filter_queryset(self.get_queryset())
+        content_type, _ = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(
+            iter_export(
+                queryset,
+                self.export_columns,
+                export_format,
+                self.export_chunk_size
+            ),
+            content_type=content_type,
+        )
+        filename = f"{queryset.model._meta.model_name}s.{export_format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class TaskExportAPIView(ExportMixin, TaskListAPIView):
+    """
+    Выгрузка задач с сотрудником и связанной задачей.
+    Поддерживает те же фильтры, что и список задач.
+    """
+
+    queryset = Task.objects.order_by("id")
+    export_columns = TASK_EXPORT_COLUMNS
+
+
+class EmployeeExportAPIView(ExportMixin, generics.GenericAPIView):
+    """ Выгрузка сотрудников с фильтрами по должности и отделу. """
+
+    queryset = Employee.objects.order_by("id")
+    serializer_class = EmployeeShortSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ("position", "department")
+    export_columns = EMPLOYEE_EXPORT_COLUMNS
+
+
+class CacheStatsAPIView(APIView):
+    """ Счетчики попаданий и промахов кэша ответов трекера. """
+
+    def get(self, request, *args, **kwargs):
+        return Response(get_cache_stats())
+
+
+class ChangesAPIView(APIView):
+    """
+    Лента изменений для зеркалирования: задачи и сотрудники, созданные
+    или измененные после курсора ?since=, и удаленные объекты.
+    До ?limit= строк каждого вида за запрос; next - курсор следующего
+    запроса, has_more - остались ли изменения. Без since - с начала.
+    Клиент применяет tasks и employees, затем deleted.
+    Курсор старше срока хранения записей об удалении - 410,
+    нужна полная синхронизация.
+    """
+
+    def get(self, request, *args, **kwargs):
+        positions = decode_cursor(request.query_params.get("since"))
+        limit = get_limit(
+            request.query_params.get("limit"), settings.CHANGES_MAX_LIMIT
+        )
+        try:
+            data, positions, has_more = get_changes(positions, limit)
+        except CursorExpired:
+            return Response(
+                {"detail": "Курсор устарел, нужна полная синхронизация."},
+                status=status.HTTP_410_GONE,
+            )
+        return Response({
+            **data,
+            "next": encode_cursor(positions),
+            "has_more": has_more,
+        })